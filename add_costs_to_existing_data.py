@@ -4,25 +4,128 @@ Script to add comprehensive cost analysis to existing ocean cleanup data
 This can be used to add costs to any existing CSV file with ocean cleanup data
 """
 
+import argparse
 import pandas as pd
 import sys
 import os
-from cost_calculator import add_cost_columns_to_dataframe, OceanCleanupCostCalculator
+import cleanup_schema
+import cost_aggregation
+import cost_calculator as cost_calculator_module
+import data_storage
+from artifact_cache import default_cache, source_fingerprint
+from cleanup_schema import DATE_FORMAT, apply_cleanup_schema
+from cost_aggregation import CostAggregator, print_cost_summary
+from cost_calculator import add_cost_columns_to_dataframe, has_cost_columns, OceanCleanupCostCalculator
+from data_storage import dataset_format, load_dataset, output_dataset_path, resolve_dataset_path, save_dataset
+from instrumentation import instrumented, note_frame
 
-def add_costs_to_existing_data(input_file, output_file=None):
+REQUIRED_COLUMN_DEFAULTS = {
+    'People': 1,
+    'Pounds': 0.1,
+    'Miles': 0.1,
+    '# of bags': 1
+}
+
+def fill_missing_required_columns(df, warn=True):
+    """
+    Add default values for any required cost input columns missing from df
+    """
+    missing_columns = [col for col in REQUIRED_COLUMN_DEFAULTS if col not in df.columns]
+    
+    if missing_columns:
+        if warn:
+            print(f"Warning: Missing required columns: {missing_columns}")
+            print("Adding default values for missing columns...")
+        
+        # Add default values for missing columns
+        for col in missing_columns:
+            df[col] = REQUIRED_COLUMN_DEFAULTS[col]
+    
+    return df
+
+def default_output_file(input_file):
+    """Build the default output path for a costed copy of input_file (same format)"""
+    base_name, extension = os.path.splitext(input_file)
+    return f"{base_name}_with_costs{extension or '.csv'}"
+
+def add_costs_to_existing_data(input_file, output_file=None, cost_calculator=None, use_cache=True):
     """
     Add cost analysis to existing ocean cleanup data
     
     Args:
-        input_file (str): Path to input CSV file
-        output_file (str): Path to output CSV file (optional)
+        input_file (str): Path to input CSV/Parquet/Feather file
+        output_file (str): Path to output file, format taken from its extension (optional)
+        cost_calculator (OceanCleanupCostCalculator): Calculator with the rates to apply (optional)
+        use_cache (bool): Restore the output from the artifact cache when the
+            input content, rates and code are unchanged (default True)
+    
+    An input that already has cost columns is re-priced with
+    recompute_costs, so only the columns whose rates changed are rewritten.
+    Returns the costed DataFrame.
+    """
+    
+    if cost_calculator is None:
+        cost_calculator = OceanCleanupCostCalculator()
+    if output_file is None:
+        output_file = default_output_file(input_file)
+    
+    hit, result = run_cached_stage(lambda: add_costs_in_memory(input_file, output_file, cost_calculator),
+                                   input_file, output_file, cost_calculator, use_cache, streaming=False)
+    if hit:
+        result = load_dataset(output_dataset_path(output_file))
+    return result
+
+def stream_costs_to_existing_data(input_file, output_file=None, chunksize=100000, cost_calculator=None,
+                                  use_cache=True):
     """
+    Add cost analysis to a CSV too large to load whole, chunksize rows at a time
     
+    Takes the same arguments as add_costs_to_existing_data. Returns the
+    CostAggregator of the run instead of the costed data.
+    """
+    
+    if cost_calculator is None:
+        cost_calculator = OceanCleanupCostCalculator()
+    if output_file is None:
+        output_file = default_output_file(input_file)
+    
+    _, result = run_cached_stage(lambda: add_costs_streaming(input_file, output_file, chunksize, cost_calculator),
+                                 input_file, output_file, cost_calculator, use_cache, streaming=True)
+    return result
+
+def run_cached_stage(build, input_file, output_file, cost_calculator, use_cache, streaming):
+    """
+    Run build through the artifact cache keyed by the input, rates and code
+    
+    Returns (cache hit, result). A hit keeps the result of build only when
+    streaming (the CostAggregator); an in-memory run is reloaded from the
+    restored output by the caller.
+    """
+    resolved_input = resolve_dataset_path(input_file)
+    if not use_cache or resolved_input is None:
+        return False, build()
+    
+    output_path = output_dataset_path(output_file)
+    return default_cache().run_stage(
+        'add_costs', build, [output_path],
+        inputs=[resolved_input],
+        params={'rates': cost_calculator.rates, 'format': dataset_format(output_path), 'streaming': streaming},
+        code_version=source_fingerprint(sys.modules[__name__], cost_calculator_module, cost_aggregation,
+                                        cleanup_schema, data_storage),
+        capture_output=True,
+        keep_result=streaming
+    )
+
+@instrumented('add_costs_file')
+def add_costs_in_memory(input_file, output_file, cost_calculator):
+    """
+    Load input_file whole, cost (or re-price) it and save it to output_file
+    """
     print(f"Loading data from: {input_file}")
     
     # Load the data
     try:
-        df = pd.read_csv(input_file)
+        df = load_dataset(input_file)
         print(f"Loaded {len(df)} records")
     except FileNotFoundError:
         print(f"Error: File {input_file} not found")
@@ -32,112 +135,163 @@ def add_costs_to_existing_data(input_file, output_file=None):
         return None
     
     # Check if required columns exist
-    required_columns = ['People', 'Pounds', 'Miles', '# of bags']
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    df = fill_missing_required_columns(df)
     
-    if missing_columns:
-        print(f"Warning: Missing required columns: {missing_columns}")
-        print("Adding default values for missing columns...")
-        
-        # Add default values for missing columns
-        if 'People' not in df.columns:
-            df['People'] = 1
-        if 'Pounds' not in df.columns:
-            df['Pounds'] = 0.1
-        if 'Miles' not in df.columns:
-            df['Miles'] = 0.1
-        if '# of bags' not in df.columns:
-            df['# of bags'] = 1
-    
-    # Add cost columns
-    print("Calculating costs for each cleanup point...")
-    df_with_costs = add_cost_columns_to_dataframe(df)
-    
-    # Determine output file name
-    if output_file is None:
-        base_name = os.path.splitext(input_file)[0]
-        output_file = f"{base_name}_with_costs.csv"
+    if has_cost_columns(df):
+        # Re-price only what the rate change touches
+        print("Input already has cost columns; recomputing columns affected by rate changes...")
+        changed_columns = cost_calculator.recompute_costs(df)
+        if changed_columns:
+            print(f"Recomputed columns: {', '.join(changed_columns)}")
+        else:
+            print("Rates unchanged; no columns recomputed")
+        df_with_costs = df
+    else:
+        # Add cost columns
+        print("Calculating costs for each cleanup point...")
+        df_with_costs = add_cost_columns_to_dataframe(df, cost_calculator)
     
     # Save the enhanced data
-    df_with_costs.to_csv(output_file, index=False)
+    output_file = save_dataset(df_with_costs, output_file)
     print(f"Enhanced data saved to: {output_file}")
     
     # Print summary
-    print_cost_summary(df_with_costs)
+    print_cost_summary(CostAggregator.from_dataframe(df_with_costs))
     
     return df_with_costs
 
-def print_cost_summary(df):
-    """Print a summary of the cost analysis"""
-    print("\n" + "="*60)
-    print("COST ANALYSIS SUMMARY")
-    print("="*60)
-    
-    # Basic statistics
-    total_events = len(df)
-    total_people = df['People'].sum()
-    total_pounds = df['Pounds'].sum()
-    total_miles = df['Miles'].sum()
-    
-    # Cost statistics
-    total_volunteer_cost = df['volunteer_cost'].sum()
-    total_direct_costs = df['total_direct_costs'].sum()
-    total_carbon_cost = df['carbon_cost'].sum()
-    total_cost = df['total_cost'].sum()
-    
-    print(f"Total Cleanup Events: {total_events:,}")
-    print(f"Total People Involved: {total_people:,}")
-    print(f"Total Pounds Collected: {total_pounds:,.2f}")
-    print(f"Total Miles Covered: {total_miles:,.2f}")
-    
-    if 'Country' in df.columns:
-        print(f"Total Countries: {df['Country'].nunique()}")
-    
-    print(f"\nCOST BREAKDOWN:")
-    print(f"Volunteer Time Value: ${total_volunteer_cost:,.2f}")
-    print(f"Direct Costs (Equipment, Transport, etc.): ${total_direct_costs:,.2f}")
-    print(f"Carbon Footprint Cost: ${total_carbon_cost:,.2f}")
-    print(f"TOTAL COST: ${total_cost:,.2f}")
-    
-    print(f"\nEFFICIENCY METRICS:")
-    print(f"Average Cost per Event: ${total_cost/total_events:,.2f}")
-    print(f"Average Cost per Person: ${total_cost/total_people:,.2f}")
-    print(f"Average Cost per Pound: ${total_cost/total_pounds:,.2f}")
-    print(f"Average Pounds per Person: {total_pounds/total_people:.2f}")
-    
-    # Top countries by cost (if Country column exists)
-    if 'Country' in df.columns:
-        country_costs = df.groupby('Country')['total_cost'].sum().sort_values(ascending=False).head(10)
-        print(f"\nTOP 10 COUNTRIES BY TOTAL COST:")
-        for i, (country, cost) in enumerate(country_costs.items(), 1):
-            print(f"{i:2d}. {country}: ${cost:,.2f}")
-    
-    print("="*60)
+@instrumented('add_costs_streaming')
+def add_costs_streaming(input_file, output_file=None, chunksize=100000, cost_calculator=None):
+    """
+    Add cost analysis to a CSV that may not fit in memory
+    
+    The input is read chunksize rows at a time; each costed chunk is appended
+    to the output before the next one is read, and the summary is built from
+    running aggregates so peak memory is bounded by the chunk size. Chunks
+    that already have cost columns are re-priced with recompute_costs, as
+    in add_costs_in_memory. The output is written to a temporary file that
+    replaces output_file only once every chunk is done.
+    """
+    print(f"Streaming data from: {input_file} ({chunksize:,} rows per chunk)")
+    
+    if output_file is None:
+        output_file = default_output_file(input_file)
+    if dataset_format(input_file) != 'csv' or dataset_format(output_file) != 'csv':
+        print("Error: Streaming mode reads and writes CSV files only")
+        return None
+    
+    if cost_calculator is None:
+        cost_calculator = OceanCleanupCostCalculator()
+    summary = CostAggregator()
+    
+    # Chunks go to a temporary file next to the output, so a failure never leaves a truncated output
+    partial_file = f"{output_file}.partial-{os.getpid()}"
+    try:
+        reader = pd.read_csv(input_file, chunksize=chunksize)
+        for chunk_number, chunk in enumerate(reader):
+            first_chunk = chunk_number == 0
+            chunk = apply_cleanup_schema(fill_missing_required_columns(chunk, warn=first_chunk))
+            if has_cost_columns(chunk):
+                # A CSV keeps no record of its rates, so recompute_costs recalculates every cost column
+                if first_chunk:
+                    print("Input already has cost columns; recomputing them with the current rates...")
+                cost_calculator.recompute_costs(chunk)
+                chunk_with_costs = chunk
+            else:
+                chunk_with_costs = add_cost_columns_to_dataframe(chunk, cost_calculator)
+            
+            chunk_with_costs.to_csv(
+                partial_file,
+                mode='w' if first_chunk else 'a',
+                header=first_chunk,
+                index=False,
+                date_format=DATE_FORMAT
+            )
+            summary.update(chunk_with_costs)
+            print(f"Processed {summary.total_events:,} records...")
+        
+        if summary.total_events == 0:
+            print(f"Error: File {input_file} contains no records")
+            return None
+        os.replace(partial_file, output_file)
+    except FileNotFoundError:
+        print(f"Error: File {input_file} not found")
+        return None
+    except Exception as e:
+        print(f"Error processing file: {e}")
+        return None
+    finally:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+    
+    print(f"Enhanced data saved to: {output_file}")
+    note_frame(rows=summary.total_events)
+    
+    # Print summary
+    print_cost_summary(summary)
+    
+    return summary
 
 def main():
     """Main function to handle command line arguments"""
     if len(sys.argv) < 2:
-        print("Usage: python add_costs_to_existing_data.py <input_file> [output_file]")
+        print("Usage: python add_costs_to_existing_data.py <input_file> [output_file] [--chunksize N]")
         print("Example: python add_costs_to_existing_data.py data/ocean_cleanup.csv")
         print("Example: python add_costs_to_existing_data.py data/ocean_cleanup.csv data/ocean_cleanup_with_costs.csv")
+        print("Example: python add_costs_to_existing_data.py data/huge_export.csv --chunksize 500000")
+        print("Example: python add_costs_to_existing_data.py data/global_ocean_cleanup_data_with_costs.parquet data/high_wage.parquet --rates config/cost_scenarios.json --scenario high_volunteer_value")
         return
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(description="Add cost analysis to existing ocean cleanup data")
+    parser.add_argument('input_file', help="CSV/Parquet/Feather file with ocean cleanup data")
+    parser.add_argument('output_file', nargs='?', default=None,
+                        help="Output file; .parquet/.feather/.csv extension picks the format (optional)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Stream the input in chunks of this many rows instead of loading it whole")
+    parser.add_argument('--rates', default=None,
+                        help="JSON file with calculator rates and optional named scenarios")
+    parser.add_argument('--scenario', default=None,
+                        help="Scenario from the --rates file to apply on top of its base rates")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always recompute instead of restoring an unchanged result from the artifact cache")
+    args = parser.parse_args()
+    
+    input_file = args.input_file
+    output_file = args.output_file
     
     # Check if input file exists
     if not os.path.exists(input_file):
         print(f"Error: Input file '{input_file}' does not exist")
         return
     
+    cost_calculator = None
+    if args.rates:
+        try:
+            cost_calculator = OceanCleanupCostCalculator.from_config(args.rates, args.scenario)
+        except (OSError, ValueError) as e:
+            print(f"Error loading rates: {e}")
+            return
+        print(f"Using rates from {args.rates}" + (f" (scenario: {args.scenario})" if args.scenario else ""))
+    
     # Process the file
-    result = add_costs_to_existing_data(input_file, output_file)
+    if args.chunksize:
+        summary = stream_costs_to_existing_data(input_file, output_file, args.chunksize,
+                                                cost_calculator=cost_calculator, use_cache=not args.no_cache)
+        if summary is None:
+            print("Failed to process the data file")
+        else:
+            print("\nCost analysis completed successfully!")
+            print(f"Enhanced data contains {summary.total_events} records")
+        return
     
-    if result is not None:
+    result = add_costs_to_existing_data(input_file, output_file, cost_calculator=cost_calculator,
+                                        use_cache=not args.no_cache)
+    
+    if result is None:
+        print("Failed to process the data file")
+    else:
         print("\nCost analysis completed successfully!")
         print(f"Enhanced data contains {len(result)} records with {len(result.columns)} columns")
-    else:
-        print("Failed to process the data file")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+On-disk artifact cache for the pipeline scripts
+
+A stage's outputs are stored under a key built from the content hash of
+its input files, the stage name, its parameters (e.g. calculator rates) and
+a fingerprint of the source of the modules that implement it. Re-running a
+stage whose inputs and code are unchanged copies the cached files back into
+place (and replays the console output it printed) instead of rebuilding
+them. The cache directory is kept under a size limit by evicting the least
+recently used entries.
+
+Environment:
+    CLEANUP_CACHE_DIR     cache location (default .cache/artifacts)
+    CLEANUP_CACHE_MAX_MB  size limit in megabytes (default 1024)
+    CLEANUP_CACHE         set to 0/off/false to disable caching
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from functools import lru_cache
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'artifacts')
+DEFAULT_MAX_MB = 1024
+
+META_FILE = 'meta.json'
+STDOUT_FILE = 'stdout.txt'
+RESULT_FILE = 'result.pkl'
+
+@lru_cache(maxsize=256)
+def _file_hash(path, size, mtime_ns):
+    """sha256 of a file; size and mtime only key the memo so edited files are rehashed"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_content_hash(path):
+    """Content hash of a file, computed once per process for an unchanged file"""
+    stat = os.stat(path)
+    return _file_hash(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+def source_fingerprint(*modules):
+    """Hash of the source files of modules, used as the stage's code version"""
+    digest = hashlib.sha256()
+    for module in modules:
+        source_file = getattr(module, '__file__', None)
+        if source_file and os.path.isfile(source_file):
+            digest.update(os.path.basename(source_file).encode('utf-8'))
+            digest.update(file_content_hash(source_file).encode('utf-8'))
+    return digest.hexdigest()
+
+class _Tee(io.TextIOBase):
+    """Write to the real stdout while keeping a copy for the cache entry"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+class ArtifactCache:
+    """
+    Content-addressed store of stage outputs with size-based LRU eviction
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, enabled=None):
+        if cache_dir is None:
+            cache_dir = os.environ.get('CLEANUP_CACHE_DIR', DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('CLEANUP_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        if enabled is None:
+            enabled = os.environ.get('CLEANUP_CACHE', '1').lower() not in ('0', 'off', 'false', 'no')
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    def key(self, stage, inputs=(), params=None, code_version=''):
+        """Cache key for a stage run over input files with the given parameters"""
+        description = {
+            'stage': stage,
+            'inputs': [file_content_hash(path) for path in inputs],
+            'params': params or {},
+            'code': code_version
+        }
+        encoded = json.dumps(description, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _read_meta(self, entry_dir):
+        try:
+            with open(os.path.join(entry_dir, META_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, entry_dir, meta):
+        with open(os.path.join(entry_dir, META_FILE), 'w') as f:
+            json.dump(meta, f)
+
+    def restore(self, key, outputs):
+        """
+        Copy a cached entry's files to outputs
+
+        Returns the entry metadata on a hit, None on a miss.
+        """
+        entry_dir = self._entry_dir(key)
+        meta = self._read_meta(entry_dir)
+        if meta is None or len(meta['files']) != len(outputs):
+            return None
+
+        stored_files = [os.path.join(entry_dir, name) for name in meta['files']]
+        if not all(os.path.isfile(path) for path in stored_files):
+            return None
+
+        for stored, output in zip(stored_files, outputs):
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+            shutil.copyfile(stored, output)
+
+        meta['last_used'] = time.time()
+        self._write_meta(entry_dir, meta)
+        return meta
+
+    def store(self, key, stage, outputs, stdout=None, result=None):
+        """Copy outputs (plus captured stdout and a picklable result) into a new entry"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.cache_dir)
+
+        files = []
+        for i, output in enumerate(outputs):
+            name = f"{i}_{os.path.basename(output)}"
+            shutil.copyfile(output, os.path.join(staging_dir, name))
+            files.append(name)
+
+        if stdout is not None:
+            with open(os.path.join(staging_dir, STDOUT_FILE), 'w') as f:
+                f.write(stdout)
+        if result is not None:
+            with open(os.path.join(staging_dir, RESULT_FILE), 'wb') as f:
+                pickle.dump(result, f)
+
+        size = sum(os.path.getsize(os.path.join(staging_dir, name)) for name in os.listdir(staging_dir))
+        now = time.time()
+        self._write_meta(staging_dir, {
+            'stage': stage,
+            'files': files,
+            'size': size,
+            'created': now,
+            'last_used': now
+        })
+
+        entry_dir = self._entry_dir(key)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(staging_dir, entry_dir)
+        self.evict()
+
+    def entries(self):
+        """(key, metadata) of every complete entry in the cache directory"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        found = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(name)
+            if name.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            meta = self._read_meta(entry_dir)
+            if meta is not None:
+                found.append((name, meta))
+        return found
+
+    def size(self):
+        """Total bytes held by cache entries"""
+        return sum(meta['size'] for _, meta in self.entries())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        entries = sorted(self.entries(), key=lambda entry: entry[1]['last_used'])
+        total = sum(meta['size'] for _, meta in entries)
+        removed = []
+        for key, meta in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= meta['size']
+            removed.append(key)
+        return removed
+
+    def clear(self):
+        """Remove every entry"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def run_stage(self, stage, build, outputs, inputs=(), params=None, code_version='',
+                  capture_output=False, keep_result=False):
+        """
+        Run build() unless a cached run of the same stage can be restored
+
+        build must write every path in outputs. On a hit the cached files
+        are copied back, the console output of the original run is printed
+        again (capture_output=True) and the stored build() result is
+        returned (keep_result=True, for small picklable results). Returns
+        (hit, result); result is None on a hit without keep_result.
+        """
+        if not self.enabled:
+            return False, build()
+
+        key = self.key(stage, inputs, params, code_version)
+        meta = self.restore(key, outputs)
+        if meta is not None:
+            entry_dir = self._entry_dir(key)
+            print(f"♻️  {stage}: inputs unchanged, restored cached outputs ({', '.join(outputs)})")
+            stdout_file = os.path.join(entry_dir, STDOUT_FILE)
+            if capture_output and os.path.isfile(stdout_file):
+                with open(stdout_file) as f:
+                    sys.stdout.write(f.read())
+            result = None
+            result_file = os.path.join(entry_dir, RESULT_FILE)
+            if keep_result and os.path.isfile(result_file):
+                with open(result_file, 'rb') as f:
+                    result = pickle.load(f)
+            return True, result
+
+        if capture_output:
+            tee = _Tee(sys.stdout)
+            with contextlib.redirect_stdout(tee):
+                result = build()
+            stdout = tee.buffer.getvalue()
+        else:
+            result = build()
+            stdout = None
+
+        if result is not None and all(os.path.isfile(output) for output in outputs):
+            self.store(key, stage, outputs, stdout, result if keep_result else None)
+        return False, result
+
+def default_cache():
+    """ArtifactCache configured from the environment"""
+    return ArtifactCache()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark Cleanup Type KNN prediction against the brute-force baseline
+
+Loads the cached 'cleanup_type' feature set (ml_features.py), fits the
+notebooks' KNeighborsClassifier(weights='distance', n_neighbors=4) and
+FastKNNClassifier with each requested index, and predicts the first
+--queries test rows with each. Reports fit time, prediction latency,
+accuracy, agreement with the baseline's predictions and the fraction of
+the baseline's neighbours found (recall).
+
+Usage: python benchmarks/knn_prediction.py [--data FILE] [--queries 2000] [--indexes ivf ball_tree] [--n-probe 16 64]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knn_classifier import INDEX_TYPES, FastKNNClassifier
+from ml_features import load_features
+
+def neighbour_recall(found, expected):
+    """Mean fraction of each row's expected neighbours that were found"""
+    k = expected.shape[1]
+    return float(np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(found, expected)]))
+
+def time_model(model, X_train, y_train, X_query):
+    """Fit and predict once, returning (fit seconds, predict seconds, predictions)"""
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    predictions = model.predict(X_query)
+    return fit_seconds, time.perf_counter() - start, predictions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fast KNN prediction against brute force")
+    parser.add_argument('--data', default=None, help='Dataset for the cleanup_type features (default: ml_features default)')
+    parser.add_argument('--queries', type=int, default=2000, help='Test rows to predict')
+    parser.add_argument('--indexes', nargs='+', default=['ivf'], choices=INDEX_TYPES,
+                        help='FastKNNClassifier indexes to compare (trees are slow on ~50 columns)')
+    parser.add_argument('--n-lists', type=int, default=None, help='IVF cells (default: sqrt(training rows))')
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[None], help='IVF cells probed per query')
+    parser.add_argument('--jobs', type=int, default=1, help='Prediction threads')
+    parser.add_argument('--output', default=None, help='Also write the results as JSON')
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        features = load_features('cleanup_type', args.data)
+    X_train, y_train = features.X_train_prepared, features.y_train_prepared
+    X_query, y_query = features.X_test_prepared[:args.queries], features.y_test_prepared[:args.queries]
+
+    print("KNN prediction benchmark")
+    print("=" * 96)
+    print(f"{len(X_train):,} training rows, {len(X_query):,} queries, {X_train.shape[1]} features")
+    print(f"{'model':<28} {'fit s':>8} {'predict s':>10} {'ms/row':>8} {'rows/s':>10} {'accuracy':>9} "
+          f"{'agree':>7} {'recall':>7}")
+
+    baseline = KNeighborsClassifier(weights='distance', n_neighbors=4, algorithm='brute', n_jobs=args.jobs)
+    fit_seconds, predict_seconds, expected = time_model(baseline, X_train, y_train, X_query)
+    expected_neighbours = baseline.kneighbors(X_query, return_distance=False)
+
+    results = []
+    def report(name, fit_seconds, predict_seconds, predictions, neighbours):
+        result = {
+            'model': name,
+            'fit_seconds': fit_seconds,
+            'predict_seconds': predict_seconds,
+            'ms_per_row': 1000 * predict_seconds / max(len(X_query), 1),
+            'rows_per_second': len(X_query) / predict_seconds if predict_seconds > 0 else None,
+            'accuracy': float(np.mean(predictions == y_query)),
+            'agreement': float(np.mean(predictions == expected)),
+            'recall': neighbour_recall(neighbours, expected_neighbours)
+        }
+        results.append(result)
+        print(f"{name:<28} {fit_seconds:>8.2f} {predict_seconds:>10.2f} {result['ms_per_row']:>8.3f} "
+              f"{result['rows_per_second'] or 0:>10,.0f} {result['accuracy']:>9.4f} {result['agreement']:>7.3f} "
+              f"{result['recall']:>7.3f}")
+
+    report('sklearn brute (baseline)', fit_seconds, predict_seconds, expected, expected_neighbours)
+
+    for index in args.indexes:
+        for n_probe in (args.n_probe if index == 'ivf' else [None]):
+            model = FastKNNClassifier(index=index, n_lists=args.n_lists, n_probe=n_probe, n_jobs=args.jobs)
+            fit_seconds, predict_seconds, predictions = time_model(model, X_train, y_train, X_query)
+            name = f"fast {index}" + (f" {model.n_probe_}/{model.n_lists_} cells" if index == 'ivf' else '')
+            report(name, fit_seconds, predict_seconds, predictions, model.kneighbors(X_query)[1])
+
+    print("=" * 96)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'training_rows': len(X_train), 'queries': len(X_query), 'results': results}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the global map builders in 'markers' and 'fast' mode
+
+For each point count, builds synthetic costed data with the vectorized
+generator, renders create_corrected_global_map in each mode and reports the
+HTML size and the time to build and save it. Browser load time is not
+measured here; HTML size is the main driver of it.
+
+Usage: python benchmarks/map_rendering.py [--points 100000 1000000] [--max-marker-points 100000]
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cost_calculator import add_cost_columns_to_dataframe
+from create_corrected_global_map import create_corrected_global_map
+from generate_global_cleanup_data import COUNTRIES_DATA, get_num_sites, generate_global_cleanup_data_vectorized
+
+def synthetic_points(num_points, seed=42):
+    """Costed cleanup records with at least num_points rows, trimmed to num_points"""
+    base_sites = sum(get_num_sites(info) for info in COUNTRIES_DATA.values())
+    multiplier = max(1, math.ceil(num_points / base_sites))
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = generate_global_cleanup_data_vectorized(multiplier, seed)
+    return add_cost_columns_to_dataframe(df.head(num_points))
+
+def time_map(df, mode, output_dir):
+    """Render one map, returning (seconds, html bytes)"""
+    output_file = os.path.join(output_dir, f"map_{mode}_{len(df)}.html")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_corrected_global_map(df=df, mode=mode, output_file=output_file)
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(output_file)
+    os.remove(output_file)
+    return seconds, size
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark global map rendering modes")
+    parser.add_argument('--points', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--modes', nargs='+', default=['markers', 'fast'])
+    parser.add_argument('--max-marker-points', type=int, default=100000,
+                        help="Skip 'markers' mode above this many points")
+    args = parser.parse_args()
+    
+    print("Map rendering benchmark")
+    print("=" * 60)
+    print(f"{'points':>10} {'mode':>8} {'seconds':>10} {'HTML MB':>10}")
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        for num_points in args.points:
+            df = synthetic_points(num_points)
+            for mode in args.modes:
+                if mode == 'markers' and num_points > args.max_marker_points:
+                    print(f"{num_points:>10,} {mode:>8} {'skipped':>10} {'':>10}")
+                    continue
+                seconds, size = time_map(df, mode, output_dir)
+                print(f"{num_points:>10,} {mode:>8} {seconds:>10.1f} {size / 1e6:>10.1f}")
+    
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
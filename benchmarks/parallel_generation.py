@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel per-country data generation
+
+Times generate_global_cleanup_data_vectorized for increasing worker counts,
+reports the speedup over a single worker and checks that every run produces
+exactly the same frame.
+
+Usage: python benchmarks/parallel_generation.py [--sites-multiplier N] [--workers 1 2 4 8 16]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_global_cleanup_data import generate_global_cleanup_data_vectorized
+
+def time_generation(workers, sites_multiplier, seed):
+    """Generate the dataset once with the given worker count, returning (seconds, frame)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = generate_global_cleanup_data_vectorized(sites_multiplier, seed, workers)
+    return time.perf_counter() - start, df
+
+def frame_fingerprint(df):
+    """Order-sensitive hash of every value in the frame"""
+    return int(pd.util.hash_pandas_object(df, index=True).sum())
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = [w for w in (1, 2, 4, 8, 16) if w <= cpu_count] or [1]
+    
+    parser = argparse.ArgumentParser(description="Benchmark parallel cleanup data generation")
+    parser.add_argument('--sites-multiplier', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    args = parser.parse_args()
+    
+    print(f"Parallel generation benchmark ({cpu_count} CPUs, sites multiplier {args.sites_multiplier})")
+    print("=" * 60)
+    print(f"{'workers':>8} {'rows':>12} {'seconds':>10} {'rows/sec':>12} {'speedup':>8}")
+    
+    baseline_seconds = None
+    baseline_fingerprint = None
+    for workers in args.workers:
+        seconds, df = time_generation(workers, args.sites_multiplier, args.seed)
+        fingerprint = frame_fingerprint(df)
+        
+        if baseline_seconds is None:
+            baseline_seconds = seconds
+            baseline_fingerprint = fingerprint
+        
+        print(f"{workers:>8} {len(df):>12,} {seconds:>10.2f} {len(df)/seconds:>12,.0f} {baseline_seconds/seconds:>7.2f}x")
+        
+        if fingerprint != baseline_fingerprint:
+            print(f"   WARNING: output with {workers} workers differs from {args.workers[0]} worker(s)")
+    
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
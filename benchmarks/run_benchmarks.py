@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the data pipeline hot paths
+
+Generates synthetic cleanup datasets with the vectorized generator at each
+requested size and measures wall time (best of --repeat runs) and peak
+traced memory (tracemalloc, one extra run) of:
+
+    add_costs        add_cost_columns_to_dataframe
+    fix_coordinates  fix_coordinates_in_dataframe
+    verify           verify_global_data (reads a Parquet copy of the data)
+    cost_summary     CostAggregator + print_cost_summary
+    cost_report      create_cost_analysis_report
+    global_map_fast  create_corrected_global_map(mode='fast')
+    global_map       create_corrected_global_map(mode='markers'), up to --max-marker-rows
+    india_map        create_india_focused_map
+
+Results are written as JSON; the compare command flags benchmarks that got
+slower or used more memory than a baseline run by more than a threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py run [--sizes 10k 100k 1m 10m] [--output results.json]
+    python benchmarks/run_benchmarks.py compare baseline.json results.json [--threshold 0.10]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleanup_schema import apply_cleanup_schema
+from cost_aggregation import CostAggregator, print_cost_summary
+from cost_calculator import add_cost_columns_to_dataframe
+from create_corrected_global_map import create_corrected_global_map, create_india_focused_map
+from data_storage import save_dataset
+from fix_coordinates import fix_coordinates_in_dataframe
+from generate_global_cleanup_data import COUNTRIES_DATA, get_num_sites, generate_global_cleanup_data_vectorized
+from simple_cost_analysis import create_cost_analysis_report
+from verify_global_data import verify_global_data
+
+SIZES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000
+}
+
+BENCHMARKS = ['add_costs', 'fix_coordinates', 'verify', 'cost_summary', 'cost_report',
+              'global_map_fast', 'global_map', 'india_map']
+
+def parse_size(size):
+    """'100k', '1m' or a plain row count"""
+    if size.lower() in SIZES:
+        return SIZES[size.lower()]
+    return int(size)
+
+def synthetic_dataset(num_rows, seed=42):
+    """Raw (uncosted) cleanup records in the cleanup schema, trimmed to num_rows"""
+    base_sites = sum(get_num_sites(info) for info in COUNTRIES_DATA.values())
+    multiplier = max(1, math.ceil(num_rows / base_sites))
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = generate_global_cleanup_data_vectorized(multiplier, seed)
+    return apply_cleanup_schema(df.head(num_rows).copy())
+
+def build_cases(raw, costed, work_dir):
+    """
+    benchmark name -> (setup, run) where run(setup()) is the timed call
+
+    Every run gets its own (shallow) copy of the costed frame, so columns or
+    attrs one case adds are not seen by, or timed in, the cases after it.
+    """
+    data_file = save_dataset(costed, os.path.join(work_dir, 'data', 'benchmark_data'), 'parquet')
+    maps_dir = os.path.join(work_dir, 'maps')
+
+    def costed_copy():
+        return costed.copy(deep=False)
+
+    return {
+        'add_costs': (lambda: raw, add_cost_columns_to_dataframe),
+        'fix_coordinates': (lambda: costed.copy(), fix_coordinates_in_dataframe),
+        'verify': (lambda: data_file, verify_global_data),
+        'cost_summary': (costed_copy, lambda df: print_cost_summary(CostAggregator.from_dataframe(df))),
+        'cost_report': (costed_copy, lambda df: create_cost_analysis_report(df=df)),
+        'global_map_fast': (costed_copy, lambda df: create_corrected_global_map(
+            df=df, mode='fast', output_file=os.path.join(maps_dir, 'global_fast.html'))),
+        'global_map': (costed_copy, lambda df: create_corrected_global_map(
+            df=df, mode='markers', output_file=os.path.join(maps_dir, 'global_markers.html'))),
+        'india_map': (costed_copy, lambda df: create_india_focused_map(df=df))
+    }
+
+def measure(setup, run, repeat, trace_memory):
+    """Best wall time over repeat runs and, optionally, peak traced memory of one more run"""
+    timings = []
+    for _ in range(repeat):
+        argument = setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run(argument)
+            timings.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if trace_memory:
+        argument = setup()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run(argument)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+
+    return min(timings), peak_mb
+
+def environment_info():
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__
+    }
+
+def run_suite(args):
+    """Run every selected benchmark at every size and write the JSON results"""
+    sizes = [parse_size(size) for size in args.sizes]
+    benchmarks = args.benchmarks or BENCHMARKS
+    results = []
+    # folium warns about tile API keys on every map build
+    warnings.simplefilter('ignore')
+
+    print(f"Pipeline benchmark suite ({os.cpu_count()} CPUs)")
+    print("=" * 72)
+    print(f"{'benchmark':<18} {'rows':>12} {'seconds':>10} {'rows/sec':>14} {'peak MB':>10}")
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        for directory in ('data', 'plots', 'maps'):
+            os.makedirs(os.path.join(work_dir, directory))
+        # Report and map builders write to relative data/, plots/ and maps/ paths
+        os.chdir(work_dir)
+        try:
+            for num_rows in sizes:
+                raw = synthetic_dataset(num_rows, args.seed)
+                costed = add_cost_columns_to_dataframe(raw)
+                cases = build_cases(raw, costed, work_dir)
+
+                for name in benchmarks:
+                    if name == 'global_map' and num_rows > args.max_marker_rows:
+                        print(f"{name:<18} {num_rows:>12,} {'skipped':>10}")
+                        continue
+                    setup, run = cases[name]
+                    seconds, peak_mb = measure(setup, run, args.repeat, not args.no_memory)
+                    results.append({
+                        'benchmark': name,
+                        'rows': num_rows,
+                        'seconds': seconds,
+                        'rows_per_sec': num_rows / seconds if seconds > 0 else None,
+                        'peak_mb': peak_mb
+                    })
+                    peak_text = f"{peak_mb:>10.1f}" if peak_mb is not None else f"{'-':>10}"
+                    print(f"{name:<18} {num_rows:>12,} {seconds:>10.3f} {num_rows / seconds:>14,.0f} {peak_text}")
+        finally:
+            os.chdir(original_dir)
+
+    report = {'environment': environment_info(), 'repeat': args.repeat, 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print("=" * 72)
+    print(f"Results saved to: {args.output}")
+
+def compare_results(baseline, current, threshold, min_seconds=0.05):
+    """
+    Rows of (benchmark, rows, metric, baseline, current, change, regressed)
+    for every benchmark/size present in both runs
+
+    A slowdown only counts as a regression when it also exceeds min_seconds,
+    so timer noise on millisecond-scale benchmarks is not flagged.
+    """
+    baseline_results = {(r['benchmark'], r['rows']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        key = (result['benchmark'], result['rows'])
+        if key not in baseline_results:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            before, after = baseline_results[key].get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            regressed = change > threshold
+            if metric == 'seconds':
+                regressed = regressed and after - before > min_seconds
+            rows.append((*key, metric, before, after, change, regressed))
+    return rows
+
+def compare(args):
+    """Print the comparison of two result files; exit status 1 on any regression"""
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare_results(baseline, current, args.threshold, args.min_seconds)
+    print(f"Comparing {args.current} against {args.baseline} (threshold {args.threshold:.0%})")
+    print("=" * 80)
+    print(f"{'benchmark':<18} {'rows':>12} {'metric':>8} {'baseline':>10} {'current':>10} {'change':>8}")
+    for benchmark, num_rows, metric, before, after, change, regressed in rows:
+        flag = "  ⚠️ REGRESSION" if regressed else ""
+        print(f"{benchmark:<18} {num_rows:>12,} {metric:>8} {before:>10.3f} {after:>10.3f} {change:>+8.1%}{flag}")
+
+    regressions = sum(row[-1] for row in rows)
+    print("=" * 80)
+    print(f"{regressions} regression(s) in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cleanup data pipeline hot paths")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the benchmarks and write JSON results")
+    run_parser.add_argument('--sizes', nargs='+', default=list(SIZES),
+                            help="Row counts (10k, 100k, 1m, 10m or a number)")
+    run_parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=None)
+    run_parser.add_argument('--repeat', type=int, default=1, help="Timed runs per benchmark (best is kept)")
+    run_parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc run")
+    run_parser.add_argument('--max-marker-rows', type=int, default=10_000,
+                            help="Skip the markers-mode global map above this many rows")
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--output', default='benchmark_results.json')
+
+    compare_parser = commands.add_parser('compare', help="Flag regressions between two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Relative increase in time or memory counted as a regression")
+    compare_parser.add_argument('--min-seconds', type=float, default=0.05,
+                                help="Ignore slowdowns smaller than this many seconds")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run_suite(args)
+    else:
+        sys.exit(compare(args))
+
+if __name__ == "__main__":
+    main()
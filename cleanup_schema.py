@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Central dtype schema for the ocean cleanup datasets
+
+Every column the generator, cost calculator and coordinate fixer produce is
+listed here with the smallest dtype that holds its values, except the free
+text Cleanup ID and GPS columns, which keep the string dtype they load with. apply_cleanup_schema
+is used by every loader (see data_storage.load_dataset), so the global frame
+is held as uint8/uint16 counts, categoricals and datetimes instead of
+int64/float64/object columns.
+"""
+
+import numpy as np
+import pandas as pd
+
+# The 46 trash item count columns, 'Cigarette Butts' through 'Plastic Pieces'
+TRASH_ITEM_COLUMNS = [
+    'Cigarette Butts',
+    'Food Wrappers (candy, chips, etc.)',
+    'Take Out/Away Containers (Plastic)',
+    'Take Out/Away Containers (Foam)',
+    'Bottle Caps (Plastic)',
+    'Bottle Caps (Metal)',
+    'Lids (Plastic)',
+    'Straws, Stirrers',
+    'Forks, Knives, Spoons',
+    'Beverage Bottles (Plastic)',
+    'Beverage Bottles (Glass)',
+    'Beverage Cans',
+    'Grocery Bags (Plastic)',
+    'Other Plastic Bags',
+    'Paper Bags',
+    'Cups, Plates (Paper)',
+    'Cups, Plates (Plastic)',
+    'Cups, Plates (Foam)',
+    'Fishing Buoys, Pots & Traps',
+    'Fishing Net & Pieces',
+    'Fishing Line (1 yard/meter = 1 piece)',
+    'Rope (1 yard/meter = 1 piece)',
+    'Fishing Gear (Clean Swell)',
+    '6-Pack Holders',
+    'Other Plastic/Foam Packaging',
+    'Other Plastic Bottles (oil, bleach, etc.)',
+    'Strapping Bands',
+    'Tobacco Packaging/Wrap',
+    'Other Packaging (Clean Swell)',
+    'Appliances (refrigerators, washers, etc.)',
+    'Balloons',
+    'Cigar Tips',
+    'Cigarette Lighters',
+    'Construction Materials',
+    'Fireworks',
+    'Tires',
+    'Toys',
+    'Other Trash (Clean Swell)',
+    'Condoms',
+    'Diapers',
+    'Syringes',
+    'Tampons/Tampon Applicators',
+    'Personal Hygiene (Clean Swell)',
+    'Foam Pieces',
+    'Glass Pieces',
+    'Plastic Pieces'
+]
+
+DATE_COLUMN = 'Cleanup Date'
+DATE_FORMAT = '%m/%d/%Y'
+
+# Column -> minimal dtype. Integer dtypes are targets: a column whose values
+# do not fit is widened rather than wrapped, and one with missing values
+# stays float.
+CLEANUP_SCHEMA = {
+    # Event and location
+    'Zone': 'category',
+    'State': 'category',
+    'Country': 'category',
+    'lat': 'float64',
+    'lon': 'float64',
+    'Cleanup Type': 'category',
+    DATE_COLUMN: 'datetime64[ns]',
+    'Group Name': 'category',
+
+    # Participants and metrics
+    'Adults': 'uint16',
+    'Children': 'uint16',
+    'People': 'uint16',
+    'Pounds': 'float64',
+    'Miles': 'float64',
+    '# of bags': 'uint8',
+
+    # Trash items
+    **{item: 'uint8' for item in TRASH_ITEM_COLUMNS},
+    'Total Items Collected': 'uint16',
+
+    # Cost columns (summed by the reports, so kept at full precision)
+    'volunteer_hours': 'float64',
+    'volunteer_cost': 'float64',
+    'equipment_cost': 'float64',
+    'transportation_cost': 'float64',
+    'disposal_cost': 'float64',
+    'administrative_cost': 'float64',
+    'total_direct_costs': 'float64',
+    'carbon_footprint_tons': 'float64',
+    'carbon_cost': 'float64',
+    'total_cost': 'float64',
+    'cost_per_pound': 'float64',
+    'cost_per_person': 'float64',
+
+    # Per-row ratios that are displayed but never summed
+    'hours_per_person': 'float32',
+    'pounds_per_person': 'float32',
+    'pounds_per_hour': 'float32',
+    'miles_per_person': 'float32'
+}
+
+def parse_cleanup_dates(values):
+    """Parse Cleanup Date values (MM/DD/YYYY, or ISO from re-saved files) to datetimes"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    dates = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+    unparsed = dates.isna() & values.notna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(values[unparsed], format='mixed', errors='coerce')
+    return dates
+
+def format_cleanup_date(value):
+    """Display a Cleanup Date the way the source data writes it (MM/DD/YYYY)"""
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).strftime(DATE_FORMAT)
+    return value
+
+def fit_integer_dtype(series, dtype):
+    """
+    Cast an integer-valued column to dtype, widening it when its values do not fit
+    """
+    if series.isna().any() or not pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_float_dtype(series) and not (series == np.floor(series)).all():
+        return series
+
+    info = np.iinfo(dtype)
+    if len(series) == 0 or (series.min() >= info.min and series.max() <= info.max):
+        return series.astype(dtype)
+    if series.min() >= 0:
+        return pd.to_numeric(series.astype(np.int64), downcast='unsigned')
+    return pd.to_numeric(series.astype(np.int64), downcast='integer')
+
+def compact_integer_column(series):
+    """Downcast an integer column outside the schema to the smallest width that holds it"""
+    if not pd.api.types.is_integer_dtype(series) or len(series) == 0:
+        return series
+    if series.min() >= 0:
+        return pd.to_numeric(series, downcast='unsigned')
+    return pd.to_numeric(series, downcast='integer')
+
+def apply_cleanup_schema(df):
+    """
+    Convert df's columns to CLEANUP_SCHEMA dtypes in place and return it
+
+    Columns not in the schema are left alone except that integer columns are
+    downcast to the narrowest width that holds them.
+    """
+    for col in df.columns:
+        dtype = CLEANUP_SCHEMA.get(col)
+        series = df[col]
+
+        if dtype is None:
+            if pd.api.types.is_integer_dtype(series):
+                df[col] = compact_integer_column(series)
+        elif dtype == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[col] = series.astype('category')
+        elif dtype.startswith('datetime'):
+            df[col] = parse_cleanup_dates(series)
+        elif dtype.startswith('uint') or dtype.startswith('int'):
+            df[col] = fit_integer_dtype(series, np.dtype(dtype))
+        elif dtype.startswith('float'):
+            if pd.api.types.is_numeric_dtype(series) and series.dtype != dtype:
+                df[col] = series.astype(dtype)
+
+    return df
+
+def memory_usage_mb(df, deep=True):
+    """Resident size of df in megabytes, including string contents unless deep=False"""
+    return df.memory_usage(deep=deep).sum() / 1e6
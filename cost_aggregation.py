@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Single-pass aggregation engine behind the cost summary reports
+
+CostAggregator reads each costed chunk once and keeps per-country sums,
+event counts and cost-range histogram buckets; global totals, means and
+efficiency ratios are derived from those instead of rescanning the data.
+Chunks can be folded in one at a time, so the same object serves the
+in-memory reports and the streaming cost pipeline.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Per-country table written by the cost report and the ingest path
+COUNTRY_ANALYSIS_FILE = 'data/country_cost_analysis.csv'
+COUNTRY_ANALYSIS_COUNTRIES = 15
+
+# Event cost bands used by the cost distribution reports: (min, max, label)
+COST_RANGES = [
+    (0, 100, "Very Low"),
+    (100, 500, "Low"),
+    (500, 1000, "Medium"),
+    (1000, 2000, "High"),
+    (2000, float('inf'), "Very High")
+]
+
+class CostAggregator:
+    """
+    Per-country sums, counts and cost-range buckets, updated one chunk at a time
+    """
+
+    SUM_COLUMNS = ['People', 'Pounds', 'Miles', '# of bags', 'volunteer_hours',
+                   'volunteer_cost', 'total_direct_costs', 'carbon_cost', 'total_cost']
+
+    # Sums reported as whole numbers
+    INTEGER_COLUMNS = ['People', '# of bags', 'events']
+
+    RANGE_COLUMNS = [label for _, _, label in COST_RANGES]
+
+    def __init__(self, group_column='Country'):
+        self.group_column = group_column
+        self.has_groups = False
+        self.stats = None
+        self.other_totals = pd.Series(0.0, index=self.SUM_COLUMNS + ['events'] + self.RANGE_COLUMNS)
+
+    @classmethod
+    def from_dataframe(cls, df, group_column='Country'):
+        """Build an aggregator from a fully materialized dataframe"""
+        aggregator = cls(group_column)
+        aggregator.update(df)
+        return aggregator
+
+    def update(self, df):
+        """Fold a costed chunk into the running aggregates in one pass over its rows"""
+        if self.group_column in df.columns:
+            self.has_groups = True
+            groups = df[self.group_column]
+            if isinstance(groups.dtype, pd.CategoricalDtype):
+                codes, names = groups.cat.codes.to_numpy(), groups.cat.categories
+            else:
+                codes, names = pd.factorize(groups)
+        else:
+            codes, names = np.zeros(len(df), dtype=np.intp), pd.Index([])
+
+        # Rows without a group go to an extra slot that only feeds the global totals
+        num_groups = len(names) + 1
+        codes = np.where(codes < 0, len(names), codes).astype(np.intp)
+
+        chunk = {}
+        for col in self.SUM_COLUMNS:
+            if col in df.columns:
+                values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                chunk[col] = np.bincount(codes, weights=np.nan_to_num(values), minlength=num_groups)
+            else:
+                chunk[col] = np.zeros(num_groups)
+        chunk['events'] = np.bincount(codes, minlength=num_groups).astype(np.float64)
+
+        # Cost-range histogram: bucket index per row, counted per group
+        edges = np.array([low for low, _, _ in COST_RANGES], dtype=np.float64)
+        costs = df['total_cost'].to_numpy(dtype=np.float64, na_value=np.nan) if 'total_cost' in df.columns else np.full(len(df), np.nan)
+        buckets = np.searchsorted(edges, costs, side='right') - 1
+        in_range = (buckets >= 0) & ~np.isnan(costs)
+        bucket_counts = np.bincount(codes[in_range] * len(COST_RANGES) + buckets[in_range],
+                                    minlength=num_groups * len(COST_RANGES)).reshape(num_groups, len(COST_RANGES))
+        for j, label in enumerate(self.RANGE_COLUMNS):
+            chunk[label] = bucket_counts[:, j].astype(np.float64)
+
+        chunk = pd.DataFrame(chunk)
+        self.other_totals = self.other_totals.add(chunk.iloc[-1], fill_value=0)
+
+        if self.has_groups:
+            chunk_stats = chunk.iloc[:-1].set_axis(pd.Index(names, name=self.group_column))
+            chunk_stats = chunk_stats[chunk_stats['events'] > 0]
+            if self.stats is None:
+                self.stats = chunk_stats
+            else:
+                self.stats = self.stats.add(chunk_stats, fill_value=0)
+
+    @property
+    def state_columns(self):
+        return self.SUM_COLUMNS + ['events'] + self.RANGE_COLUMNS
+
+    def to_frame(self):
+        """
+        Running sums as a frame for saving: one row per group, plus a row with
+        a missing group for the rows that had none
+        """
+        index = pd.Index([None], name=self.group_column)
+        other = pd.DataFrame([self.other_totals[self.state_columns].to_numpy()], index=index,
+                             columns=self.state_columns)
+        if self.stats is None:
+            return other.reset_index()
+        return pd.concat([self.stats[self.state_columns].astype(np.float64), other]).reset_index()
+
+    @classmethod
+    def from_frame(cls, frame, group_column='Country'):
+        """Rebuild an aggregator saved with to_frame"""
+        aggregator = cls(group_column)
+        has_group = frame[group_column].notna()
+        aggregator.other_totals = frame.loc[~has_group, aggregator.state_columns].sum().astype(np.float64)
+        stats = frame.loc[has_group].set_index(group_column)[aggregator.state_columns].astype(np.float64)
+        if len(stats) > 0:
+            aggregator.has_groups = True
+            aggregator.stats = stats
+        return aggregator
+
+    @property
+    def totals(self):
+        """Global sums, event count and cost-range counts as a Series"""
+        totals = self.other_totals.copy()
+        if self.stats is not None:
+            totals = totals.add(self.stats.sum(), fill_value=0)
+        return totals
+
+    @property
+    def total_events(self):
+        return int(self.totals['events'])
+
+    @property
+    def total_countries(self):
+        return None if self.stats is None else len(self.stats)
+
+    def total(self, col):
+        """One global sum, as an int for count columns"""
+        value = self.totals[col]
+        return int(value) if col in self.INTEGER_COLUMNS else value
+
+    def cost_range_counts(self):
+        """Number of events in each COST_RANGES band, keyed by label"""
+        return self.totals[self.RANGE_COLUMNS].astype(np.int64)
+
+    def country_stats(self):
+        """
+        Per-country sums with mean cost per event and efficiency ratios
+
+        Indexed by country; returns None when the data had no Country column.
+        """
+        if self.stats is None:
+            return None
+
+        stats = self.stats.copy()
+        for col in self.INTEGER_COLUMNS + self.RANGE_COLUMNS:
+            stats[col] = stats[col].astype(np.int64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats['mean_cost'] = stats['total_cost'] / stats['events']
+            stats['cost_per_person'] = stats['total_cost'] / stats['People']
+            stats['cost_per_pound'] = stats['total_cost'] / stats['Pounds']
+            stats['pounds_per_person'] = stats['Pounds'] / stats['People']
+        return stats
+
+def country_cost_table(aggregator, countries=COUNTRY_ANALYSIS_COUNTRIES):
+    """
+    The COUNTRY_ANALYSIS_FILE table: cost, people and pounds sums and event
+    count ('Cleanup ID') of the countries with the highest total cost
+    """
+    table = aggregator.country_stats()[['total_cost', 'volunteer_cost', 'total_direct_costs', 'carbon_cost',
+                                        'People', 'Pounds', 'events']].round(2)
+    table = table.rename(columns={'events': 'Cleanup ID'})
+    return table.sort_values('total_cost', ascending=False).head(countries)
+
+def print_cost_summary(aggregator, title="COST ANALYSIS SUMMARY"):
+    """Print a summary of the cost analysis from a CostAggregator"""
+    print("\n" + "="*60)
+    print(title)
+    print("="*60)
+
+    # Basic statistics
+    total_events = aggregator.total_events
+    total_people = aggregator.total('People')
+    total_pounds = aggregator.total('Pounds')
+    total_miles = aggregator.total('Miles')
+
+    # Cost statistics
+    total_volunteer_cost = aggregator.total('volunteer_cost')
+    total_direct_costs = aggregator.total('total_direct_costs')
+    total_carbon_cost = aggregator.total('carbon_cost')
+    total_cost = aggregator.total('total_cost')
+
+    print(f"Total Cleanup Events: {total_events:,}")
+    print(f"Total People Involved: {total_people:,}")
+    print(f"Total Pounds Collected: {total_pounds:,.2f}")
+    print(f"Total Miles Covered: {total_miles:,.2f}")
+
+    if aggregator.has_groups:
+        print(f"Total Countries: {aggregator.total_countries}")
+
+    print(f"\nCOST BREAKDOWN:")
+    print(f"Volunteer Time Value: ${total_volunteer_cost:,.2f}")
+    print(f"Direct Costs (Equipment, Transport, etc.): ${total_direct_costs:,.2f}")
+    print(f"Carbon Footprint Cost: ${total_carbon_cost:,.2f}")
+    print(f"TOTAL COST: ${total_cost:,.2f}")
+
+    print(f"\nEFFICIENCY METRICS:")
+    print(f"Average Cost per Event: ${total_cost/total_events:,.2f}")
+    print(f"Average Cost per Person: ${total_cost/total_people:,.2f}")
+    print(f"Average Cost per Pound: ${total_cost/total_pounds:,.2f}")
+    print(f"Average Pounds per Person: {total_pounds/total_people:.2f}")
+
+    # Top countries by cost (if Country column exists)
+    if aggregator.has_groups:
+        country_costs = aggregator.country_stats()['total_cost'].sort_values(ascending=False).head(10)
+        print(f"\nTOP 10 COUNTRIES BY TOTAL COST:")
+        for i, (country, cost) in enumerate(country_costs.items(), 1):
+            print(f"{i:2d}. {country}: ${cost:,.2f}")
+
+    print("="*60)
@@ -1,33 +1,114 @@
+import itertools
+import json
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from cost_aggregation import CostAggregator
+from instrumentation import instrumented
+
+# Rates used when no config overrides them
+DEFAULT_RATES = {
+    # Base volunteer time value (2019 rate from Independent Sector)
+    'volunteer_hourly_rate': 25.43,
+    
+    # Additional cost factors
+    'equipment_cost_per_person': 5.00,  # USD per person for gloves, bags, tools
+    'transportation_cost_per_mile': 0.50,  # USD per mile
+    'administrative_cost_per_event': 25.00,  # USD per cleanup event
+    'disposal_cost_per_pound': 0.15,  # USD per pound of waste disposed
+    
+    # Carbon footprint costs (USD per ton CO2)
+    'carbon_cost_per_ton': 50.00
+}
+
+# Rate -> (cost column it prices, per-row base quantity it multiplies).
+# A None quantity means the rate is charged once per event.
+RATE_DEPENDENCIES = {
+    'volunteer_hourly_rate': ('volunteer_cost', 'volunteer_hours'),
+    'equipment_cost_per_person': ('equipment_cost', 'People'),
+    'transportation_cost_per_mile': ('transportation_cost', 'Miles'),
+    'administrative_cost_per_event': ('administrative_cost', None),
+    'disposal_cost_per_pound': ('disposal_cost', 'Pounds'),
+    'carbon_cost_per_ton': ('carbon_cost', 'carbon_footprint_tons')
+}
+
+# Default: 32.1 hours per month / 3 = ~10.7 hours per person per cleanup
+DEFAULT_HOURS_PER_PERSON = 32.1 / 3
+
+# Carbon footprint factor: 1 ton of waste ≈ 0.5 tons CO2
+CO2_TONS_PER_WASTE_TON = 0.5
+
+# Parameters a scenario sweep may vary: every rate plus hours per person
+SWEEP_PARAMETERS = list(DEFAULT_RATES) + ['hours_per_person']
+
+DIRECT_COST_COLUMNS = ['equipment_cost', 'transportation_cost', 'disposal_cost', 'administrative_cost']
+
+# Columns recompute_costs needs to re-price a dataframe without a full recalculation
+REPRICING_COLUMNS = ['People', 'Pounds', 'Miles', 'volunteer_hours', 'carbon_footprint_tons',
+                     'volunteer_cost', *DIRECT_COST_COLUMNS, 'total_direct_costs', 'carbon_cost']
+
+def has_cost_columns(df):
+    """True when df already carries the cost columns recompute_costs works from"""
+    return all(col in df.columns for col in REPRICING_COLUMNS)
+
+def load_cost_rates(config_file, scenario=None):
+    """
+    Read calculator rates from a JSON config
+    
+    The file holds either a flat {rate: value} mapping or base "rates" plus
+    named "scenarios" that override them. Rates not given keep their
+    DEFAULT_RATES value. Raises ValueError for unknown rates or scenarios.
+    """
+    with open(config_file) as f:
+        config = json.load(f)
+    
+    if 'rates' in config or 'scenarios' in config:
+        base_rates = config.get('rates', {})
+        scenarios = config.get('scenarios', {})
+    else:
+        base_rates, scenarios = config, {}
+    
+    rates = dict(base_rates)
+    if scenario is not None:
+        if scenario not in scenarios:
+            raise ValueError(f"Unknown scenario '{scenario}'; available: {', '.join(scenarios) or 'none'}")
+        rates.update(scenarios[scenario])
+    
+    return rates
+
 class OceanCleanupCostCalculator:
     """
     Comprehensive cost calculator for ocean cleanup activities
     Calculates various cost components for each cleanup point
     """
     
-    def __init__(self):
-        # Base volunteer time value (2019 rate from Independent Sector)
-        self.volunteer_hourly_rate = 25.43
-        
-        # Additional cost factors
-        self.equipment_cost_per_person = 5.00  # USD per person for gloves, bags, tools
-        self.transportation_cost_per_mile = 0.50  # USD per mile
-        self.administrative_cost_per_event = 25.00  # USD per cleanup event
-        self.disposal_cost_per_pound = 0.15  # USD per pound of waste disposed
-        
-        # Carbon footprint costs (USD per ton CO2)
-        self.carbon_cost_per_ton = 50.00
+    def __init__(self, rates=None):
+        rates = dict(DEFAULT_RATES, **(rates or {}))
+        unknown = set(rates) - set(DEFAULT_RATES)
+        if unknown:
+            raise ValueError(f"Unknown cost rates: {', '.join(sorted(unknown))}")
         
+        for name, value in rates.items():
+            setattr(self, name, float(value))
+    
+    @classmethod
+    def from_config(cls, config_file, scenario=None):
+        """Create a calculator with the rates of a JSON config (see load_cost_rates)"""
+        return cls(load_cost_rates(config_file, scenario))
+    
+    @property
+    def rates(self):
+        """Current rates as a {name: value} dict"""
+        return {name: getattr(self, name) for name in DEFAULT_RATES}
+    
     def calculate_volunteer_time_cost(self, people, hours_per_person=None):
         """
         Calculate the economic value of volunteer time
         """
         if hours_per_person is None:
-            # Default: 32.1 hours per month / 3 = ~10.7 hours per person per cleanup
-            hours_per_person = 32.1 / 3
+            hours_per_person = DEFAULT_HOURS_PER_PERSON
         
         total_hours = people * hours_per_person
         volunteer_cost = total_hours * self.volunteer_hourly_rate
@@ -62,7 +143,7 @@ class OceanCleanupCostCalculator:
         """
         # Estimate CO2 footprint based on waste collected
         # 1 bag ≈ 5 pounds, and 1 ton of waste ≈ 0.5 tons CO2
-        carbon_footprint_tons = (pounds / 2000) * 0.5  # Convert to tons and apply factor
+        carbon_footprint_tons = (pounds / 2000) * CO2_TONS_PER_WASTE_TON  # Convert to tons and apply factor
         carbon_cost = carbon_footprint_tons * self.carbon_cost_per_ton
         
         return {
@@ -153,35 +234,234 @@ class OceanCleanupCostCalculator:
             'miles_per_person': efficiency['miles_per_person']
         }
     
+    def calculate_comprehensive_costs_batch(self, df):
+        """
+        Calculate all cost components for every cleanup event in a dataframe
+
+        Columnar equivalent of calculate_comprehensive_costs: works on NumPy
+        arrays for People/Pounds/Miles/# of bags and returns the same cost
+        columns with the same zero-division rules, indexed like df.
+        """
+        def column(name):
+            if name in df.columns:
+                return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            return np.zeros(len(df))
+
+        people = column('People')
+        pounds = column('Pounds')
+        miles = column('Miles')
+
+        # Calculate volunteer time cost
+        hours_per_person = DEFAULT_HOURS_PER_PERSON
+        volunteer_hours = people * hours_per_person
+        volunteer_cost = volunteer_hours * self.volunteer_hourly_rate
+
+        # Calculate other costs
+        equipment_cost = people * self.equipment_cost_per_person
+        transportation_cost = miles * self.transportation_cost_per_mile
+        disposal_cost = pounds * self.disposal_cost_per_pound
+        administrative_cost = np.full(len(df), float(self.administrative_cost_per_event))
+
+        # Calculate carbon footprint cost
+        carbon_footprint_tons = (pounds / 2000) * CO2_TONS_PER_WASTE_TON
+        carbon_cost = carbon_footprint_tons * self.carbon_cost_per_ton
+
+        # Calculate total costs
+        total_direct_costs = equipment_cost + transportation_cost + disposal_cost + administrative_cost
+        total_cost = volunteer_cost + total_direct_costs + carbon_cost
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cost_per_pound = np.where(pounds > 0, total_cost / pounds, 0.0)
+            cost_per_person = np.where(people > 0, total_cost / people, 0.0)
+
+            # Efficiency metrics are zeroed when there are no people or no hours
+            active = (people != 0) & (volunteer_hours != 0)
+            pounds_per_person = np.where(active, pounds / people, 0.0)
+            pounds_per_hour = np.where(active & (volunteer_hours > 0), pounds / volunteer_hours, 0.0)
+            miles_per_person = np.where(active, miles / people, 0.0)
+
+        return pd.DataFrame({
+            # Volunteer costs
+            'volunteer_hours': volunteer_hours,
+            'volunteer_cost': volunteer_cost,
+            'hours_per_person': np.full(len(df), hours_per_person),
+
+            # Direct costs
+            'equipment_cost': equipment_cost,
+            'transportation_cost': transportation_cost,
+            'disposal_cost': disposal_cost,
+            'administrative_cost': administrative_cost,
+            'total_direct_costs': total_direct_costs,
+
+            # Environmental costs
+            'carbon_footprint_tons': carbon_footprint_tons,
+            'carbon_cost': carbon_cost,
+
+            # Total costs
+            'total_cost': total_cost,
+            'cost_per_pound': cost_per_pound,
+            'cost_per_person': cost_per_person,
+
+            # Efficiency metrics
+            'pounds_per_person': pounds_per_person,
+            'pounds_per_hour': pounds_per_hour,
+            'miles_per_person': miles_per_person
+        }, index=df.index)
+    
+    def recompute_costs(self, df, previous_rates=None):
+        """
+        Re-price a costed dataframe in place after a rate change
+        
+        Only the cost columns priced by rates that differ from previous_rates
+        (default: the rates recorded in df.attrs['cost_rates'] by
+        add_cost_columns_to_dataframe) are recomputed, from the per-row base
+        quantities already stored in df (volunteer_hours, People, Miles,
+        Pounds, carbon_footprint_tons), followed by the totals and per-unit
+        costs that depend on them. When the rates df was priced at are not
+        known (e.g. it was loaded from CSV, which does not keep attrs), every
+        cost column is recalculated with calculate_comprehensive_costs_batch.
+        Returns the list of columns that were rewritten (empty when no rate
+        changed).
+        """
+        if previous_rates is None:
+            previous_rates = df.attrs.get('cost_rates')
+        if previous_rates is None:
+            cost_df = self.calculate_comprehensive_costs_batch(df)
+            for column in cost_df.columns:
+                df[column] = cost_df[column]
+            df.attrs['cost_rates'] = self.rates
+            return list(cost_df.columns)
+        previous_rates = dict(DEFAULT_RATES, **previous_rates)
+        
+        current_rates = self.rates
+        changed_rates = [name for name in DEFAULT_RATES if current_rates[name] != previous_rates[name]]
+        if not changed_rates:
+            return []
+        
+        changed_columns = []
+        for name in changed_rates:
+            column, quantity = RATE_DEPENDENCIES[name]
+            if quantity is None:
+                df[column] = np.full(len(df), current_rates[name])
+            else:
+                df[column] = df[quantity].to_numpy(dtype=np.float64, na_value=np.nan) * current_rates[name]
+            changed_columns.append(column)
+        
+        if any(column in DIRECT_COST_COLUMNS for column in changed_columns):
+            df['total_direct_costs'] = (df['equipment_cost'] + df['transportation_cost'] +
+                                        df['disposal_cost'] + df['administrative_cost'])
+            changed_columns.append('total_direct_costs')
+        
+        # Every rate feeds the total and the per-unit costs
+        total_cost = (df['volunteer_cost'] + df['total_direct_costs'] + df['carbon_cost']).to_numpy()
+        pounds = df['Pounds'].to_numpy(dtype=np.float64, na_value=np.nan)
+        people = df['People'].to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['total_cost'] = total_cost
+            df['cost_per_pound'] = np.where(pounds > 0, total_cost / pounds, 0.0)
+            df['cost_per_person'] = np.where(people > 0, total_cost / people, 0.0)
+        changed_columns += ['total_cost', 'cost_per_pound', 'cost_per_person']
+        
+        df.attrs['cost_rates'] = current_rates
+        return changed_columns
+
     def calculate_country_level_costs(self, df):
         """
         Calculate aggregated costs by country
         """
-        country_costs = df.groupby('Country').agg({
-            'People': 'sum',
-            'Pounds': 'sum',
-            'Miles': 'sum',
-            '# of bags': 'sum',
-            'volunteer_cost': 'sum',
-            'total_direct_costs': 'sum',
-            'carbon_cost': 'sum',
-            'total_cost': 'sum'
-        }).reset_index()
-        
-        # Calculate averages and ratios
-        country_costs['cost_per_person'] = country_costs['total_cost'] / country_costs['People']
-        country_costs['cost_per_pound'] = country_costs['total_cost'] / country_costs['Pounds']
-        country_costs['pounds_per_person'] = country_costs['Pounds'] / country_costs['People']
-        
-        return country_costs
-
-def add_cost_columns_to_dataframe(df, cost_calculator=None):
+        stats = CostAggregator.from_dataframe(df).country_stats()
+        country_costs = stats[['People', 'Pounds', 'Miles', '# of bags', 'volunteer_cost',
+                               'total_direct_costs', 'carbon_cost', 'total_cost',
+                               'cost_per_person', 'cost_per_pound', 'pounds_per_person']]
+        
+        return country_costs.reset_index()
+
+    def sweep_scenarios(self, df, grid, aggregator=None):
+        """
+        Per-country costs for every combination of parameter values in grid
+        
+        grid maps SWEEP_PARAMETERS names (rates or 'hours_per_person') to lists
+        of values; parameters not in the grid keep this calculator's value.
+        Costs are linear in the per-country sums of People, Miles, Pounds and
+        events, so those are aggregated once (or taken from aggregator) and
+        every scenario is priced in one broadcasted scenarios x countries
+        array computation. Returns a long-format DataFrame with one row per
+        (scenario, country): scenario number, the parameter values, Country,
+        total_cost, cost_per_pound and cost_per_person.
+        """
+        unknown = set(grid) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+        
+        if aggregator is None:
+            aggregator = CostAggregator.from_dataframe(df)
+        country_stats = aggregator.country_stats()
+        
+        # Scenario parameter table, one row per grid combination
+        base = dict(self.rates, hours_per_person=DEFAULT_HOURS_PER_PERSON)
+        names = list(grid)
+        combinations = list(itertools.product(*(grid[name] for name in names)))
+        params = pd.DataFrame(combinations, columns=names, dtype=np.float64)
+        for name in SWEEP_PARAMETERS:
+            if name not in params.columns:
+                params[name] = base[name]
+        
+        def scenario_column(name):
+            return params[name].to_numpy()[:, None]
+        
+        def country_row(name):
+            return country_stats[name].to_numpy(dtype=np.float64)[None, :]
+        
+        people = country_row('People')
+        pounds = country_row('Pounds')
+        carbon_tons = (pounds / 2000) * CO2_TONS_PER_WASTE_TON
+        
+        total_cost = (people * scenario_column('hours_per_person') * scenario_column('volunteer_hourly_rate') +
+                      people * scenario_column('equipment_cost_per_person') +
+                      country_row('Miles') * scenario_column('transportation_cost_per_mile') +
+                      pounds * scenario_column('disposal_cost_per_pound') +
+                      country_row('events') * scenario_column('administrative_cost_per_event') +
+                      carbon_tons * scenario_column('carbon_cost_per_ton'))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cost_per_pound = np.where(pounds > 0, total_cost / pounds, 0.0)
+            cost_per_person = np.where(people > 0, total_cost / people, 0.0)
+        
+        num_scenarios, num_countries = total_cost.shape
+        table = params.loc[np.repeat(np.arange(num_scenarios), num_countries), names].reset_index(drop=True)
+        table.insert(0, 'scenario', np.repeat(np.arange(num_scenarios), num_countries))
+        table['Country'] = np.tile(country_stats.index.to_numpy(), num_scenarios)
+        table['total_cost'] = total_cost.ravel()
+        table['cost_per_pound'] = cost_per_pound.ravel()
+        table['cost_per_person'] = cost_per_person.ravel()
+        return table
+
+def load_sweep_grid(config_file):
+    """Read the "sweep" grid ({parameter: [values]}) from a JSON config"""
+    with open(config_file) as f:
+        config = json.load(f)
+    if 'sweep' not in config:
+        raise ValueError(f"No 'sweep' grid in {config_file}")
+    return config['sweep']
+
+@instrumented('add_costs')
+def add_cost_columns_to_dataframe(df, cost_calculator=None, vectorized=True):
     """
     Add comprehensive cost columns to an existing dataframe
+
+    By default costs are computed column-wise with
+    calculate_comprehensive_costs_batch; pass vectorized=False to fall back
+    to the original row-by-row calculation.
     """
     if cost_calculator is None:
         cost_calculator = OceanCleanupCostCalculator()
     
+    if vectorized:
+        cost_df = cost_calculator.calculate_comprehensive_costs_batch(df)
+        result_df = pd.concat([df, cost_df], axis=1)
+        result_df.attrs['cost_rates'] = cost_calculator.rates
+        return result_df
+    
     # Calculate costs for each row
     cost_data = []
     for _, row in df.iterrows():
@@ -191,6 +471,7 @@ def add_cost_columns_to_dataframe(df, cost_calculator=None):
     # Convert to DataFrame and merge with original data
     cost_df = pd.DataFrame(cost_data)
     result_df = pd.concat([df, cost_df], axis=1)
+    result_df.attrs['cost_rates'] = cost_calculator.rates
     
     return result_df
 
@@ -210,3 +491,27 @@ if __name__ == "__main__":
     print("Sample Cost Analysis:")
     for key, value in costs.items():
         print(f"{key}: ${value:.2f}" if isinstance(value, (int, float)) else f"{key}: {value}")
+    
+    # Re-pricing data costed under other rates and saved as CSV (no recorded rates)
+    import os
+    import tempfile
+    from data_storage import load_dataset, save_dataset
+    
+    sample_df = pd.DataFrame({'People': [25, 3, 0], 'Pounds': [150.5, 12.0, 0.0],
+                              'Miles': [2.3, 0.5, 0.0], '# of bags': [8, 1, 0]})
+    high_volunteer_value = OceanCleanupCostCalculator({'volunteer_hourly_rate': 34.79})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = save_dataset(add_cost_columns_to_dataframe(sample_df, high_volunteer_value),
+                                os.path.join(tmp_dir, 'costed.csv'))
+        reloaded = load_dataset(csv_file)
+        # add_costs_to_existing_data.py --chunksize re-prices the CSV one chunk at a time
+        chunks = list(pd.read_csv(csv_file, chunksize=2))
+        for chunk in chunks:
+            calculator.recompute_costs(chunk)
+    assert 'cost_rates' not in reloaded.attrs
+    assert 'total_cost' in calculator.recompute_costs(reloaded)
+    expected = calculator.calculate_comprehensive_costs_batch(sample_df)
+    assert np.allclose(reloaded['total_cost'], expected['total_cost'])
+    assert calculator.recompute_costs(reloaded) == []
+    assert np.allclose(pd.concat(chunks)['total_cost'], expected['total_cost'])
+    print("\nCSV round-trip re-pricing (whole and in chunks): OK")
@@ -3,34 +3,93 @@
 Create a corrected global ocean cleanup map with accurate coordinates
 """
 
-import os
+import argparse
+import json
+import sys
 
 import pandas as pd
 import folium
+from branca.element import MacroElement
 from folium import plugins
+from jinja2 import Template
 import numpy as np
 
-DEFAULT_COASTAL_DATA = 'data/global_ocean_cleanup_data_coastal_only.csv'
-FALLBACK_DATA = 'data/global_ocean_cleanup_data_fixed_coordinates.csv'
+import cleanup_schema
+import cost_aggregation
+import data_storage
+import gps_codec
+from artifact_cache import ArtifactCache, default_cache, source_fingerprint
+from cleanup_schema import DATE_FORMAT, format_cleanup_date
+from cost_aggregation import CostAggregator
+from data_storage import dataset_exists, load_dataset, resolve_dataset_path
+from gps_codec import valid_coordinates_mask
+from instrumentation import instrumented, note_frame
 
+DEFAULT_COASTAL_DATA = 'data/global_ocean_cleanup_data_coastal_only'
+FALLBACK_DATA = 'data/global_ocean_cleanup_data_fixed_coordinates'
 
-def create_corrected_global_map(csv_file=DEFAULT_COASTAL_DATA):
+
+# Total cost bands shared by the marker colors/sizes, the legend and the fast-mode JS
+COST_BANDS = [
+    (1000, 'green', 4),
+    (5000, 'yellow', 6),
+    (10000, 'orange', 8),
+    (15000, 'red', 10),
+    (float('inf'), 'darkred', 12)
+]
+
+GLOBAL_MAP_FILE = 'maps/corrected_global_world_map.html'
+INDIA_MAP_FILE = 'maps/india_corrected_map.html'
+
+def get_cost_color(cost):
+    """Marker color for a total cost"""
+    for upper, color, _ in COST_BANDS:
+        if cost < upper:
+            return color
+    return COST_BANDS[-1][1]
+
+def get_cost_size(cost):
+    """Marker radius for a total cost"""
+    for upper, _, radius in COST_BANDS:
+        if cost < upper:
+            return radius
+    return COST_BANDS[-1][2]
+
+def load_map_data(csv_file):
     """
-    Create an interactive global map with corrected coordinates
+    Load cleanup data for the maps, falling back to the fixed-coordinates file
     """
-    print("Loading global cleanup data with corrected coordinates...")
-    
-    # Load the data
     try:
-        df = pd.read_csv(csv_file)
+        df = load_dataset(csv_file)
         print(f"Loaded {len(df)} cleanup records from {csv_file}")
     except FileNotFoundError:
-        if csv_file != FALLBACK_DATA and os.path.exists(FALLBACK_DATA):
+        if csv_file != FALLBACK_DATA and dataset_exists(FALLBACK_DATA):
             print(f"File {csv_file} not found. Falling back to {FALLBACK_DATA}.")
-            df = pd.read_csv(FALLBACK_DATA)
+            df = load_dataset(FALLBACK_DATA)
         else:
             print(f"File {csv_file} not found. Please run fix_coordinates.py first.")
             return None
+    return df
+
+@instrumented('global_map')
+def create_corrected_global_map(csv_file=DEFAULT_COASTAL_DATA, mode='markers', output_file=GLOBAL_MAP_FILE, df=None,
+                                aggregator=None):
+    """
+    Create an interactive global map with corrected coordinates
+    
+    mode='markers' draws one DivIcon marker with a full HTML popup per point.
+    mode='fast' scales to millions of points: a pre-aggregated grid of cost
+    circles at low zoom and a FastMarkerCluster over a compact JS array at
+    high zoom, with popups built in the browser only when a point is opened.
+    A CostAggregator of df may be passed to reuse it for the statistics panel.
+    """
+    # Load the data
+    if df is None:
+        print("Loading global cleanup data with corrected coordinates...")
+        df = load_map_data(csv_file)
+        if df is None:
+            return None
+    note_frame(df)
     
     # Create base map
     m = folium.Map(
@@ -38,9 +97,235 @@ def create_corrected_global_map(csv_file=DEFAULT_COASTAL_DATA):
         zoom_start=2,
         tiles='cartodbdark_matter',
         max_zoom=18,
-        min_zoom=1
+        min_zoom=1,
+        prefer_canvas=(mode == 'fast')
     )
     
+    if mode == 'fast':
+        add_scalable_cost_layers(m, df)
+    else:
+        add_cost_markers(m, df)
+    
+    # Add legend
+    legend_html = '''
+    <div style="position: fixed; 
+                bottom: 50px; left: 50px; width: 200px; height: 120px; 
+                background-color: white; border:2px solid grey; z-index:9999; 
+                font-size:14px; padding: 10px">
+    <p><b>Total Cost Legend</b></p>
+    <p><i class="fa fa-circle" style="color:green"></i> < $1,000</p>
+    <p><i class="fa fa-circle" style="color:yellow"></i> $1,000-$5,000</p>
+    <p><i class="fa fa-circle" style="color:orange"></i> $5,000-$10,000</p>
+    <p><i class="fa fa-circle" style="color:red"></i> $10,000-$15,000</p>
+    <p><i class="fa fa-circle" style="color:darkred"></i> > $15,000</p>
+    </div>
+    '''
+    m.get_root().html.add_child(folium.Element(legend_html))
+    
+    # Add cost statistics layer
+    add_cost_statistics_layer(m, df, aggregator)
+    
+    # Save map
+    m.save(output_file)
+    print(f"Corrected map saved to: {output_file}")
+    
+    return m
+
+def bin_points_to_grid(df, cell_degrees=1.0):
+    """
+    Pre-aggregate cleanup points into a lat/lon grid of cell_degrees cells
+    
+    Returns one row per non-empty cell with the mean position of its points,
+    the number of cleanups and their total/average cost.
+    """
+    points = df[valid_coordinates_mask(df)]
+    cells = pd.DataFrame({
+        'cell_lat': np.floor(points['lat'].to_numpy() / cell_degrees),
+        'cell_lon': np.floor(points['lon'].to_numpy() / cell_degrees),
+        'lat': points['lat'].to_numpy(),
+        'lon': points['lon'].to_numpy(),
+        'total_cost': points['total_cost'].to_numpy()
+    })
+    grid = cells.groupby(['cell_lat', 'cell_lon'], sort=False).agg(
+        lat=('lat', 'mean'),
+        lon=('lon', 'mean'),
+        count=('total_cost', 'size'),
+        total_cost=('total_cost', 'sum')
+    ).reset_index(drop=True)
+    grid['avg_cost'] = grid['total_cost'] / grid['count']
+    return grid
+
+# Fields packed per point for the fast map; strings are sent as indexes into lookup tables
+FAST_POINT_NUMERIC_FIELDS = ['total_cost', 'volunteer_cost', 'total_direct_costs', 'carbon_cost',
+                             'cost_per_pound', 'cost_per_person', 'People', 'Pounds', 'Total Items Collected']
+FAST_POINT_LOOKUP_FIELDS = ['Country', 'Zone', 'Cleanup Date', 'Group Name']
+
+def build_compact_point_data(df):
+    """
+    Pack cleanup points into compact rows for FastMarkerCluster
+    
+    Each row is [lat, lon, *FAST_POINT_NUMERIC_FIELDS, *lookup indexes];
+    returns (rows, lookups) where lookups maps each FAST_POINT_LOOKUP_FIELDS
+    column to its list of distinct values.
+    """
+    points = df[valid_coordinates_mask(df)]
+    columns = [points['lat'].round(5).to_numpy(), points['lon'].round(5).to_numpy()]
+    columns += [points[field].astype(float).round(2).to_numpy() for field in FAST_POINT_NUMERIC_FIELDS]
+    
+    lookups = {}
+    for field in FAST_POINT_LOOKUP_FIELDS:
+        values = points[field]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime(DATE_FORMAT)
+        codes, uniques = pd.factorize(values.astype(str))
+        lookups[field] = uniques.tolist()
+        columns.append(codes)
+    
+    rows = np.column_stack(columns).tolist()
+    return rows, lookups
+
+def build_fast_marker_callback(lookups):
+    """
+    JavaScript callback that turns a compact point row into a circle marker
+    whose popup HTML is only built when the point is opened
+    """
+    bands = [[upper if upper != float('inf') else 1e308, color, radius] for upper, color, radius in COST_BANDS]
+    lookup_offset = 2 + len(FAST_POINT_NUMERIC_FIELDS)
+    return f"""(function () {{
+        var bands = {json.dumps(bands)};
+        var lookups = {json.dumps([lookups[field] for field in FAST_POINT_LOOKUP_FIELDS])};
+        var offset = {lookup_offset};
+        function band(cost) {{
+            for (var i = 0; i < bands.length; i++) {{
+                if (cost < bands[i][0]) {{ return bands[i]; }}
+            }}
+            return bands[bands.length - 1];
+        }}
+        function money(value) {{ return '$' + value.toFixed(2); }}
+        return function (row) {{
+            var style = band(row[2]);
+            var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {{
+                radius: style[2], color: 'black', weight: 1,
+                fillColor: style[1], fillOpacity: 0.8
+            }});
+            marker.bindTooltip(money(row[2]) + ' - ' + lookups[0][row[offset]]);
+            marker.bindPopup(function () {{
+                return '<div style="width: 300px;">' +
+                    '<h4><b>' + lookups[0][row[offset]] + ' Cleanup Site</b></h4>' +
+                    '<p><b>Location:</b> ' + lookups[1][row[offset + 1]] + '</p>' +
+                    '<p><b>Date:</b> ' + lookups[2][row[offset + 2]] + '</p>' +
+                    '<p><b>Group:</b> ' + lookups[3][row[offset + 3]] + '</p>' +
+                    '<p><b>People:</b> ' + row[8] + '</p>' +
+                    '<p><b>Pounds:</b> ' + row[9].toFixed(2) + '</p>' +
+                    '<p><b>Total Items:</b> ' + row[10] + '</p><hr>' +
+                    '<h5><b>Cost Analysis:</b></h5>' +
+                    '<p><b>Total Cost:</b> ' + money(row[2]) + '</p>' +
+                    '<p><b>Volunteer Value:</b> ' + money(row[3]) + '</p>' +
+                    '<p><b>Direct Costs:</b> ' + money(row[4]) + '</p>' +
+                    '<p><b>Carbon Cost:</b> ' + money(row[5]) + '</p>' +
+                    '<p><b>Cost per Pound:</b> ' + money(row[6]) + '</p>' +
+                    '<p><b>Cost per Person:</b> ' + money(row[7]) + '</p>' +
+                    '</div>';
+            }}, {{maxWidth: 350}});
+            return marker;
+        }};
+    }})()"""
+
+class CompactCircleLayer(MacroElement):
+    """
+    Layer of circle markers built in the browser from a compact data array
+    
+    Each row is [lat, lon, radius, color, tooltip]; this avoids emitting a
+    separate Leaflet object definition per circle in the HTML.
+    """
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function () {
+            var rows = {{ this.rows_json }};
+            var layer = L.layerGroup();
+            for (var i = 0; i < rows.length; i++) {
+                var row = rows[i];
+                L.circleMarker([row[0], row[1]], {
+                    radius: row[2], color: 'black', weight: 1,
+                    fillColor: row[3], fillOpacity: 0.7
+                }).bindTooltip(row[4]).addTo(layer);
+            }
+            layer.addTo({{ this._parent.get_name() }});
+            return layer;
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, rows):
+        super().__init__()
+        self._name = 'CompactCircleLayer'
+        self.rows_json = json.dumps(rows)
+
+class ZoomLayerSwitch(MacroElement):
+    """
+    Show the overview layer below detail_zoom and the detail layer from it up
+    """
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var map = {{ this._parent.get_name() }};
+            var overview = {{ this.overview.get_name() }};
+            var detail = {{ this.detail.get_name() }};
+            function switchLayers() {
+                var showDetail = map.getZoom() >= {{ this.detail_zoom }};
+                if (showDetail && map.hasLayer(overview)) { map.removeLayer(overview); }
+                if (!showDetail && !map.hasLayer(overview)) { map.addLayer(overview); }
+                if (showDetail && !map.hasLayer(detail)) { map.addLayer(detail); }
+                if (!showDetail && map.hasLayer(detail)) { map.removeLayer(detail); }
+            }
+            map.on('zoomend', switchLayers);
+            switchLayers();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, overview, detail, detail_zoom):
+        super().__init__()
+        self._name = 'ZoomLayerSwitch'
+        self.overview = overview
+        self.detail = detail
+        self.detail_zoom = detail_zoom
+
+def add_scalable_cost_layers(m, df, cell_degrees=2.0, detail_zoom=5):
+    """
+    Add the fast-mode layers: aggregated grid circles below detail_zoom and
+    a FastMarkerCluster of individual points from detail_zoom up
+    """
+    # Low zoom: one circle per grid cell, sized by cleanups and colored by average cost
+    grid = bin_points_to_grid(df, cell_degrees)
+    overview = CompactCircleLayer([
+        [round(cell.lat, 4), round(cell.lon, 4),
+         round(float(min(25, 3 + 2 * np.sqrt(cell.count))), 1),
+         get_cost_color(cell.avg_cost),
+         f"{cell.count:,} cleanups - ${cell.total_cost:,.0f} total, ${cell.avg_cost:,.0f} avg"]
+        for cell in grid.itertuples(index=False)
+    ])
+    overview.add_to(m)
+    
+    # High zoom: individual points from a compact array, popups built on demand
+    rows, lookups = build_compact_point_data(df)
+    detail = plugins.FastMarkerCluster(
+        rows,
+        callback=build_fast_marker_callback(lookups),
+        name="Cleanup Sites",
+        disableClusteringAtZoom=8,
+        showCoverageOnHover=False,
+        chunkedLoading=True
+    )
+    detail.add_to(m)
+    
+    ZoomLayerSwitch(overview, detail, detail_zoom).add_to(m)
+    print(f"Aggregated {len(rows):,} points into {len(grid):,} grid cells")
+
+def add_cost_markers(m, df):
+    """
+    Add one clustered DivIcon marker with a full cost popup per cleanup point
+    """
     # Create marker cluster group for better performance and interactivity
     marker_cluster = plugins.MarkerCluster(
         name="Cleanup Sites",
@@ -49,46 +334,19 @@ def create_corrected_global_map(csv_file=DEFAULT_COASTAL_DATA):
     )
     marker_cluster.add_to(m)
     
-    # Define color scheme based on total cost
-    def get_cost_color(cost):
-        if cost < 1000:
-            return 'green'
-        elif cost < 5000:
-            return 'yellow'
-        elif cost < 10000:
-            return 'orange'
-        elif cost < 15000:
-            return 'red'
-        else:
-            return 'darkred'
-    
-    # Define size based on total cost
-    def get_cost_size(cost):
-        if cost < 1000:
-            return 4
-        elif cost < 5000:
-            return 6
-        elif cost < 10000:
-            return 8
-        elif cost < 15000:
-            return 10
-        else:
-            return 12
+    # Use the numeric coordinates, skipping points without a valid GPS pair
+    mapped_df = df[valid_coordinates_mask(df)]
     
     # Add markers for each cleanup point
-    for idx, row in df.iterrows():
-        # Parse GPS coordinates
-        try:
-            lat, lon = map(float, row['GPS'].split(', '))
-        except:
-            continue
+    for idx, row in mapped_df.iterrows():
+        lat, lon = row['lat'], row['lon']
         
         # Create popup content with cost details
         popup_content = f"""
         <div style="width: 300px;">
             <h4><b>{row['Country']} Cleanup Site</b></h4>
             <p><b>Location:</b> {row['Zone']}</p>
-            <p><b>Date:</b> {row['Cleanup Date']}</p>
+            <p><b>Date:</b> {format_cleanup_date(row['Cleanup Date'])}</p>
             <p><b>Group:</b> {row['Group Name']}</p>
             <p><b>People:</b> {row['People']}</p>
             <p><b>Pounds:</b> {row['Pounds']:.2f}</p>
@@ -132,53 +390,18 @@ def create_corrected_global_map(csv_file=DEFAULT_COASTAL_DATA):
             tooltip=f"${row['total_cost']:.2f} - {row['Country']}"
         )
         marker.add_to(marker_cluster)
-    
-    # Add legend
-    legend_html = '''
-    <div style="position: fixed; 
-                bottom: 50px; left: 50px; width: 200px; height: 120px; 
-                background-color: white; border:2px solid grey; z-index:9999; 
-                font-size:14px; padding: 10px">
-    <p><b>Total Cost Legend</b></p>
-    <p><i class="fa fa-circle" style="color:green"></i> < $1,000</p>
-    <p><i class="fa fa-circle" style="color:yellow"></i> $1,000-$5,000</p>
-    <p><i class="fa fa-circle" style="color:orange"></i> $5,000-$10,000</p>
-    <p><i class="fa fa-circle" style="color:red"></i> $10,000-$15,000</p>
-    <p><i class="fa fa-circle" style="color:darkred"></i> > $15,000</p>
-    </div>
-    '''
-    m.get_root().html.add_child(folium.Element(legend_html))
-    
-    # Add cost statistics layer
-    add_cost_statistics_layer(m, df)
-    
-    # Save map
-    output_file = 'maps/corrected_global_world_map.html'
-    m.save(output_file)
-    print(f"Corrected map saved to: {output_file}")
-    
-    return m
 
-def add_cost_statistics_layer(m, df):
+def add_cost_statistics_layer(m, df, aggregator=None):
     """
     Add a statistics layer showing cost summaries by country
     """
     # Calculate country-level statistics
-    country_stats = df.groupby('Country').agg({
-        'total_cost': ['sum', 'mean', 'count'],
-        'volunteer_cost': 'sum',
-        'total_direct_costs': 'sum',
-        'carbon_cost': 'sum',
-        'People': 'sum',
-        'Pounds': 'sum'
-    }).round(2)
-    
-    # Flatten column names
-    country_stats.columns = ['_'.join(col).strip() for col in country_stats.columns]
-    country_stats = country_stats.reset_index()
+    if aggregator is None:
+        aggregator = CostAggregator.from_dataframe(df)
+    country_stats = aggregator.country_stats().reset_index()
     
     # Add text layer with top countries
-    top_countries = country_stats.nlargest(10, 'total_cost_sum')
+    top_countries = country_stats.nlargest(10, 'total_cost')
     
     stats_html = f"""
     <div style="position: fixed; 
@@ -192,29 +415,32 @@ def add_cost_statistics_layer(m, df):
         stats_html += f"""
         <p><b>{i}.</b> {country['Country']}</p>
         <p style="margin-left: 20px;">
-            Total: ${country['total_cost_sum']:,.0f}<br>
-            Events: {country['total_cost_count']:.0f}<br>
-            Avg/Event: ${country['total_cost_mean']:.0f}<br>
-            People: {country['People_sum']:,.0f}<br>
-            Pounds: {country['Pounds_sum']:,.0f}
+            Total: ${country['total_cost']:,.0f}<br>
+            Events: {country['events']:.0f}<br>
+            Avg/Event: ${country['mean_cost']:.0f}<br>
+            People: {country['People']:,.0f}<br>
+            Pounds: {country['Pounds']:,.0f}
         </p>
         """
     
     stats_html += "</div>"
     m.get_root().html.add_child(folium.Element(stats_html))
 
-def create_india_focused_map(csv_file=DEFAULT_COASTAL_DATA):
+@instrumented('india_map')
+def create_india_focused_map(csv_file=DEFAULT_COASTAL_DATA, df=None):
     """
     Create a focused map on India to verify coordinate corrections
     """
     print("Creating India-focused map to verify coordinate corrections...")
     
     # Load the data
-    if not os.path.exists(csv_file) and csv_file != FALLBACK_DATA:
-        print(f"India map csv {csv_file} not found. Falling back to {FALLBACK_DATA}.")
-        csv_file = FALLBACK_DATA
-
-    df = pd.read_csv(csv_file)
+    if df is None:
+        if not dataset_exists(csv_file) and csv_file != FALLBACK_DATA:
+            print(f"India map csv {csv_file} not found. Falling back to {FALLBACK_DATA}.")
+            csv_file = FALLBACK_DATA
+        
+        df = load_dataset(csv_file)
+    note_frame(df)
     
     # Filter for India only
     india_df = df[df['Country'] == 'India']
@@ -231,18 +457,17 @@ def create_india_focused_map(csv_file=DEFAULT_COASTAL_DATA):
     marker_cluster = folium.plugins.MarkerCluster().add_to(m)
     
     # Add markers for Indian cleanup points
+    india_df = india_df[valid_coordinates_mask(india_df)]
+    
     for idx, row in india_df.iterrows():
-        try:
-            lat, lon = map(float, row['GPS'].split(', '))
-        except:
-            continue
+        lat, lon = row['lat'], row['lon']
         
         # Create popup content
         popup_content = f"""
         <div style="width: 250px;">
             <h4><b>India Cleanup Site</b></h4>
             <p><b>Location:</b> {row['Zone']}</p>
-            <p><b>Date:</b> {row['Cleanup Date']}</p>
+            <p><b>Date:</b> {format_cleanup_date(row['Cleanup Date'])}</p>
             <p><b>Group:</b> {row['Group Name']}</p>
             <p><b>People:</b> {row['People']}</p>
             <p><b>Pounds:</b> {row['Pounds']:.2f}</p>
@@ -266,7 +491,7 @@ def create_india_focused_map(csv_file=DEFAULT_COASTAL_DATA):
         ).add_to(marker_cluster)
     
     # Save India-focused map
-    output_file = 'maps/india_corrected_map.html'
+    output_file = INDIA_MAP_FILE
     m.save(output_file)
     print(f"India-focused map saved to: {output_file}")
     
@@ -276,19 +501,41 @@ def main():
     """
     Main function to create corrected maps
     """
+    parser = argparse.ArgumentParser(description="Create corrected global ocean cleanup maps")
+    parser.add_argument('--mode', choices=['markers', 'fast'], default='markers',
+                        help="'fast' pre-aggregates points for large datasets")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always rebuild instead of restoring unchanged maps from the artifact cache")
+    args = parser.parse_args()
+    
     print("🌊 Creating Corrected Global Ocean Cleanup Maps")
     print("=" * 60)
     
-    # Create the main corrected global map
-    data_source = DEFAULT_COASTAL_DATA if os.path.exists(DEFAULT_COASTAL_DATA) else FALLBACK_DATA
-    global_map = create_corrected_global_map(data_source)
+    data_source = DEFAULT_COASTAL_DATA if dataset_exists(DEFAULT_COASTAL_DATA) else FALLBACK_DATA
+    
+    def build():
+        # Create the main corrected global map
+        global_map = create_corrected_global_map(data_source, mode=args.mode)
+        if global_map is None:
+            return None
+        
+        # Create India-focused map for verification
+        india_map = create_india_focused_map(data_source)
+        return True
     
-    # Create India-focused map for verification
-    india_map = create_india_focused_map(data_source)
+    resolved_source = resolve_dataset_path(data_source)
+    cache = ArtifactCache(enabled=False) if args.no_cache or resolved_source is None else default_cache()
+    cache.run_stage(
+        'maps', build, [GLOBAL_MAP_FILE, INDIA_MAP_FILE],
+        inputs=[resolved_source] if resolved_source else [],
+        params={'mode': args.mode},
+        code_version=source_fingerprint(sys.modules[__name__], cost_aggregation, gps_codec, cleanup_schema, data_storage),
+        capture_output=True
+    )
     
     print("\n✅ Corrected maps created successfully!")
-    print("   📁 Global map: maps/corrected_global_world_map.html")
-    print("   📁 India map: maps/india_corrected_map.html")
+    print(f"   📁 Global map: {GLOBAL_MAP_FILE}")
+    print(f"   📁 India map: {INDIA_MAP_FILE}")
     print("\n📍 The coordinates should now be correctly positioned!")
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Columnar storage layer for the ocean cleanup datasets
+
+Datasets are written as Parquet (or Feather) with the explicit dtypes of
+cleanup_schema (categorical text columns, uint8/uint16 counts, datetime
+Cleanup Date, float32 per-row ratios), and every load applies the same
+schema, CSV included. CSV stays available as an export format and keeps
+the source MM/DD/YYYY dates. Paths may be given without an extension, in
+which case the newest of <stem>.parquet, <stem>.feather and <stem>.csv is
+used.
+"""
+
+import os
+
+import pandas as pd
+
+from cleanup_schema import DATE_FORMAT, apply_cleanup_schema
+
+STORAGE_FORMATS = {
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'csv': '.csv'
+}
+DEFAULT_FORMAT = 'parquet'
+
+# df.attrs entries written with the data (Parquet only; they must be JSON-serializable)
+PERSISTED_ATTRS = ['cost_rates']
+
+def dataset_format(path):
+    """Storage format implied by a file extension (csv for unknown extensions)"""
+    extension = os.path.splitext(path)[1].lower()
+    for fmt, fmt_extension in STORAGE_FORMATS.items():
+        if extension == fmt_extension:
+            return fmt
+    return 'csv'
+
+def dataset_path(path, fmt):
+    """Replace (or add) the extension of path to match fmt"""
+    stem, extension = os.path.splitext(path)
+    if extension.lower() not in STORAGE_FORMATS.values():
+        stem = path
+    return stem + STORAGE_FORMATS[fmt]
+
+def resolve_dataset_path(path):
+    """
+    Find the file to load for path
+
+    An existing path is returned as is. Otherwise the stem is tried with
+    every storage extension and the most recently written match is used.
+    Returns None when nothing matches.
+    """
+    if os.path.isfile(path):
+        return path
+
+    candidates = [dataset_path(path, fmt) for fmt in STORAGE_FORMATS]
+    existing = [candidate for candidate in candidates if os.path.isfile(candidate)]
+    if not existing:
+        return None
+    return max(existing, key=os.path.getmtime)
+
+def dataset_exists(path):
+    """True when resolve_dataset_path finds a file for path"""
+    return resolve_dataset_path(path) is not None
+
+def output_dataset_path(path, fmt=None):
+    """Path save_dataset writes for path and fmt (default: implied by the extension, else DEFAULT_FORMAT)"""
+    if fmt is None:
+        fmt = dataset_format(path) if os.path.splitext(path)[1] else DEFAULT_FORMAT
+    return dataset_path(path, fmt)
+
+def save_dataset(df, path, fmt=None, index=False, row_group_size=None):
+    """
+    Write df in the requested format (default: implied by the extension)
+
+    Returns the path actually written, whose extension always matches fmt.
+    The PERSISTED_ATTRS entries of df.attrs are kept in Parquet metadata.
+    row_group_size sets the Parquet row group length (default: pyarrow's).
+    """
+    output_file = output_dataset_path(path, fmt)
+    fmt = dataset_format(output_file)
+
+    if fmt == 'csv':
+        df.to_csv(output_file, index=index, date_format=DATE_FORMAT)
+        return output_file
+
+    stored = apply_cleanup_schema(df.copy(deep=False))
+    stored.attrs = {key: value for key, value in df.attrs.items() if key in PERSISTED_ATTRS}
+    if fmt == 'parquet':
+        stored.to_parquet(output_file, index=index, row_group_size=row_group_size)
+    else:
+        stored.reset_index(drop=not index).to_feather(output_file)
+    return output_file
+
+def load_dataset(path, columns=None, apply_schema=True):
+    """
+    Load a dataset written by save_dataset (or any cleanup CSV)
+
+    Raises FileNotFoundError when no file matches path.
+    """
+    resolved = resolve_dataset_path(path)
+    if resolved is None:
+        raise FileNotFoundError(path)
+
+    fmt = dataset_format(resolved)
+    if fmt == 'parquet':
+        df = pd.read_parquet(resolved, columns=columns)
+    elif fmt == 'feather':
+        df = pd.read_feather(resolved, columns=columns)
+    else:
+        df = pd.read_csv(resolved, usecols=columns, low_memory=False)
+
+    if apply_schema:
+        df = apply_cleanup_schema(df)
+    return df
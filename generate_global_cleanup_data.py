@@ -1,101 +1,289 @@
+import argparse
 import pandas as pd
 import numpy as np
 import random
 from datetime import datetime, timedelta
 import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from cleanup_schema import apply_cleanup_schema, format_cleanup_date
+from cost_aggregation import CostAggregator, print_cost_summary
 from cost_calculator import OceanCleanupCostCalculator, add_cost_columns_to_dataframe
+from data_storage import DEFAULT_FORMAT, STORAGE_FORMATS, save_dataset
+from gps_codec import format_gps
+from instrumentation import instrumented
 
-def generate_global_cleanup_data():
-    """Generate comprehensive global ocean cleanup data for 100+ sites per country"""
-    
-    # List of countries with significant coastlines and ocean cleanup activities
-    countries_data = {
-        # North America
-        'United States': {'coastal_regions': ['California', 'Florida', 'Texas', 'New York', 'Washington', 'Oregon', 'Louisiana', 'Alaska', 'Hawaii', 'North Carolina', 'South Carolina', 'Georgia', 'Virginia', 'Maryland', 'Delaware', 'New Jersey', 'Connecticut', 'Rhode Island', 'Massachusetts', 'Maine', 'New Hampshire'], 'coastline_length': 19924},
-        'Canada': {'coastal_regions': ['British Columbia', 'Newfoundland and Labrador', 'Nova Scotia', 'New Brunswick', 'Prince Edward Island', 'Quebec', 'Ontario', 'Manitoba', 'Saskatchewan', 'Alberta', 'Northwest Territories', 'Yukon', 'Nunavut'], 'coastline_length': 202080},
-        'Mexico': {'coastal_regions': ['Baja California', 'Sonora', 'Sinaloa', 'Nayarit', 'Jalisco', 'Colima', 'Michoacan', 'Guerrero', 'Oaxaca', 'Chiapas', 'Tabasco', 'Campeche', 'Yucatan', 'Quintana Roo', 'Tamaulipas', 'Veracruz'], 'coastline_length': 9330},
-        
-        # South America
-        'Brazil': {'coastal_regions': ['Rio de Janeiro', 'Sao Paulo', 'Bahia', 'Ceara', 'Pernambuco', 'Alagoas', 'Sergipe', 'Paraiba', 'Rio Grande do Norte', 'Maranhao', 'Para', 'Amapa', 'Santa Catarina', 'Parana', 'Espirito Santo'], 'coastline_length': 7491},
-        'Argentina': {'coastal_regions': ['Buenos Aires', 'Rio Negro', 'Chubut', 'Santa Cruz', 'Tierra del Fuego'], 'coastline_length': 4989},
-        'Chile': {'coastal_regions': ['Arica y Parinacota', 'Tarapaca', 'Antofagasta', 'Atacama', 'Coquimbo', 'Valparaiso', 'Metropolitana', 'O Higgins', 'Maule', 'Biobio', 'Araucania', 'Los Rios', 'Los Lagos', 'Aysen', 'Magallanes'], 'coastline_length': 6435},
-        'Colombia': {'coastal_regions': ['Atlantico', 'Bolivar', 'Cesar', 'Cordoba', 'La Guajira', 'Magdalena', 'Sucre', 'Antioquia', 'Choco', 'Valle del Cauca', 'Cauca', 'Narino'], 'coastline_length': 3208},
-        'Peru': {'coastal_regions': ['Tumbes', 'Piura', 'Lambayeque', 'La Libertad', 'Ancash', 'Lima', 'Ica', 'Arequipa', 'Moquegua', 'Tacna'], 'coastline_length': 2414},
-        'Ecuador': {'coastal_regions': ['Esmeraldas', 'Manabi', 'Guayas', 'Santa Elena', 'El Oro'], 'coastline_length': 2237},
-        'Venezuela': {'coastal_regions': ['Zulia', 'Falcon', 'Lara', 'Yaracuy', 'Carabobo', 'Aragua', 'Vargas', 'Miranda', 'Anzoategui', 'Sucre', 'Monagas', 'Delta Amacuro'], 'coastline_length': 2800},
-        'Uruguay': {'coastal_regions': ['Rocha', 'Maldonado', 'Canelones', 'Montevideo', 'San Jose', 'Colonia', 'Soriano'], 'coastline_length': 660},
-        
-        # Europe
-        'United Kingdom': {'coastal_regions': ['England', 'Scotland', 'Wales', 'Northern Ireland'], 'coastline_length': 12429},
-        'France': {'coastal_regions': ['Brittany', 'Normandy', 'Aquitaine', 'Provence', 'Corsica', 'Occitanie', 'Nouvelle-Aquitaine', 'Pays de la Loire', 'Hauts-de-France'], 'coastline_length': 3427},
-        'Spain': {'coastal_regions': ['Galicia', 'Asturias', 'Cantabria', 'Basque Country', 'Catalonia', 'Valencia', 'Murcia', 'Andalusia', 'Balearic Islands', 'Canary Islands'], 'coastline_length': 4964},
-        'Italy': {'coastal_regions': ['Liguria', 'Tuscany', 'Lazio', 'Campania', 'Calabria', 'Sicily', 'Sardinia', 'Apulia', 'Abruzzo', 'Marche', 'Emilia-Romagna', 'Veneto', 'Friuli-Venezia Giulia'], 'coastline_length': 7600},
-        'Germany': {'coastal_regions': ['Schleswig-Holstein', 'Lower Saxony', 'Mecklenburg-Vorpommern', 'Hamburg', 'Bremen'], 'coastline_length': 2389},
-        'Netherlands': {'coastal_regions': ['North Holland', 'South Holland', 'Zeeland', 'Friesland', 'Groningen'], 'coastline_length': 451},
-        'Norway': {'coastal_regions': ['Finnmark', 'Troms', 'Nordland', 'Trondelag', 'More og Romsdal', 'Vestland', 'Rogaland', 'Agder', 'Vestfold og Telemark', 'Oslo', 'Viken', 'Innlandet'], 'coastline_length': 25148},
-        'Sweden': {'coastal_regions': ['Stockholm', 'Vastra Gotaland', 'Skane', 'Halland', 'Blekinge', 'Kalmar', 'Kronoberg', 'Jonkoping', 'Ostergotland', 'Sodermanland', 'Uppsala', 'Vastmanland', 'Dalarna', 'Gavleborg', 'Vasternorrland', 'Jamtland', 'Vasterbotten', 'Norrbotten'], 'coastline_length': 3218},
-        'Denmark': {'coastal_regions': ['Zealand', 'Funen', 'Jutland', 'Bornholm'], 'coastline_length': 7314},
-        'Portugal': {'coastal_regions': ['North', 'Center', 'Lisbon', 'Alentejo', 'Algarve', 'Azores', 'Madeira'], 'coastline_length': 1793},
-        'Greece': {'coastal_regions': ['Attica', 'Central Greece', 'Thessaly', 'Epirus', 'Macedonia', 'Thrace', 'Peloponnese', 'Crete', 'Aegean Islands', 'Ionian Islands'], 'coastline_length': 13676},
-        'Turkey': {'coastal_regions': ['Istanbul', 'Marmara', 'Aegean', 'Mediterranean', 'Black Sea'], 'coastline_length': 7200},
-        'Russia': {'coastal_regions': ['Kaliningrad', 'Leningrad', 'Murmansk', 'Arkhangelsk', 'Karelia', 'Komi', 'Nenets', 'Yamalo-Nenets', 'Krasnoyarsk', 'Sakha', 'Chukotka', 'Kamchatka', 'Primorsky', 'Khabarovsk', 'Sakhalin', 'Magadan', 'Amur', 'Jewish Autonomous Oblast'], 'coastline_length': 37653},
-        
-        # Asia
-        'China': {'coastal_regions': ['Liaoning', 'Hebei', 'Tianjin', 'Shandong', 'Jiangsu', 'Shanghai', 'Zhejiang', 'Fujian', 'Guangdong', 'Hainan', 'Guangxi', 'Hong Kong', 'Macau'], 'coastline_length': 14500},
-        'Japan': {'coastal_regions': ['Hokkaido', 'Tohoku', 'Kanto', 'Chubu', 'Kansai', 'Chugoku', 'Shikoku', 'Kyushu', 'Okinawa'], 'coastline_length': 29751},
-        'South Korea': {'coastal_regions': ['Gyeonggi', 'Incheon', 'Gangwon', 'Chungcheong', 'Jeolla', 'Gyeongsang', 'Jeju'], 'coastline_length': 2413},
-        'India': {'coastal_regions': ['Maharashtra', 'Goa', 'Karnataka', 'Kerala', 'Tamil Nadu', 'Andhra Pradesh', 'Odisha', 'West Bengal', 'Gujarat', 'Daman and Diu', 'Puducherry', 'Lakshadweep', 'Andaman and Nicobar Islands'], 'coastline_length': 7516},
-        'Indonesia': {'coastal_regions': ['Aceh', 'North Sumatra', 'West Sumatra', 'Riau', 'Riau Islands', 'Jambi', 'South Sumatra', 'Bangka Belitung', 'Lampung', 'Banten', 'Jakarta', 'West Java', 'Central Java', 'Yogyakarta', 'East Java', 'Bali', 'West Nusa Tenggara', 'East Nusa Tenggara', 'West Kalimantan', 'Central Kalimantan', 'South Kalimantan', 'East Kalimantan', 'North Kalimantan', 'North Sulawesi', 'Gorontalo', 'Central Sulawesi', 'West Sulawesi', 'South Sulawesi', 'Southeast Sulawesi', 'North Maluku', 'Maluku', 'West Papua', 'Papua'], 'coastline_length': 54716},
-        'Philippines': {'coastal_regions': ['Ilocos', 'Cagayan Valley', 'Central Luzon', 'Calabarzon', 'Mimaropa', 'Bicol', 'Western Visayas', 'Central Visayas', 'Eastern Visayas', 'Zamboanga Peninsula', 'Northern Mindanao', 'Davao', 'Soccsksargen', 'Caraga', 'Bangsamoro', 'Cordillera', 'National Capital Region'], 'coastline_length': 36289},
-        'Thailand': {'coastal_regions': ['Central', 'Eastern', 'Western', 'Southern'], 'coastline_length': 3219},
-        'Vietnam': {'coastal_regions': ['Red River Delta', 'North Central Coast', 'South Central Coast', 'Southeast', 'Mekong Delta'], 'coastline_length': 3444},
-        'Malaysia': {'coastal_regions': ['Perlis', 'Kedah', 'Penang', 'Perak', 'Selangor', 'Negeri Sembilan', 'Malacca', 'Johor', 'Pahang', 'Terengganu', 'Kelantan', 'Sabah', 'Sarawak', 'Labuan', 'Putrajaya'], 'coastline_length': 4675},
-        'Singapore': {'coastal_regions': ['Central Region', 'East Region', 'North Region', 'Northeast Region', 'West Region'], 'coastline_length': 193},
-        'Bangladesh': {'coastal_regions': ['Barisal', 'Chittagong', 'Dhaka', 'Khulna', 'Rajshahi', 'Rangpur', 'Sylhet'], 'coastline_length': 580},
-        'Sri Lanka': {'coastal_regions': ['Western', 'Central', 'Southern', 'Northern', 'Eastern', 'North Western', 'North Central', 'Uva', 'Sabaragamuwa'], 'coastline_length': 1340},
-        'Myanmar': {'coastal_regions': ['Rakhine', 'Ayeyarwady', 'Yangon', 'Mon', 'Kayin', 'Tanintharyi'], 'coastline_length': 1930},
-        
-        # Africa
-        'South Africa': {'coastal_regions': ['Western Cape', 'Eastern Cape', 'KwaZulu-Natal', 'Northern Cape'], 'coastline_length': 2798},
-        'Egypt': {'coastal_regions': ['Alexandria', 'Beheira', 'Kafr el-Sheikh', 'Dakahlia', 'Damietta', 'Port Said', 'Ismailia', 'Suez', 'North Sinai', 'South Sinai', 'Red Sea'], 'coastline_length': 2450},
-        'Morocco': {'coastal_regions': ['Tangier-Tetouan-Al Hoceima', 'Rabat-Sale-Kenitra', 'Casablanca-Settat', 'Marrakech-Safi', 'Souss-Massa', 'Guelmim-Oued Noun', 'Laayoune-Sakia El Hamra', 'Dakhla-Oued Ed-Dahab'], 'coastline_length': 1835},
-        'Algeria': {'coastal_regions': ['Tlemcen', 'Ain Temouchent', 'Oran', 'Mostaganem', 'Chlef', 'Tipaza', 'Algiers', 'Boumerdes', 'Tizi Ouzou', 'Bejaia', 'Jijel', 'Skikda', 'Annaba', 'El Tarf'], 'coastline_length': 998},
-        'Tunisia': {'coastal_regions': ['Bizerte', 'Ariana', 'Tunis', 'Ben Arous', 'Nabeul', 'Sousse', 'Monastir', 'Mahdia', 'Sfax', 'Gabes', 'Medenine', 'Tataouine'], 'coastline_length': 1148},
-        'Libya': {'coastal_regions': ['Tripolitania', 'Cyrenaica', 'Fezzan'], 'coastline_length': 1770},
-        'Nigeria': {'coastal_regions': ['Lagos', 'Ogun', 'Ondo', 'Edo', 'Delta', 'Bayelsa', 'Rivers', 'Akwa Ibom', 'Cross River'], 'coastline_length': 853},
-        'Ghana': {'coastal_regions': ['Greater Accra', 'Central', 'Western', 'Volta'], 'coastline_length': 539},
-        'Senegal': {'coastal_regions': ['Dakar', 'Thies', 'Diourbel', 'Fatick', 'Kaolack', 'Kolda', 'Ziguinchor', 'Tambacounda', 'Saint-Louis', 'Matam', 'Kaffrine', 'Kedougou', 'Sedhiou'], 'coastline_length': 531},
-        'Kenya': {'coastal_regions': ['Mombasa', 'Kwale', 'Kilifi', 'Tana River', 'Lamu', 'Taita-Taveta'], 'coastline_length': 536},
-        'Tanzania': {'coastal_regions': ['Tanga', 'Pwani', 'Dar es Salaam', 'Lindi', 'Mtwara'], 'coastline_length': 1424},
-        'Mozambique': {'coastal_regions': ['Cabo Delgado', 'Nampula', 'Zambezia', 'Sofala', 'Inhambane', 'Gaza', 'Maputo'], 'coastline_length': 2470},
-        'Madagascar': {'coastal_regions': ['Antsiranana', 'Sava', 'Analanjirofo', 'Atsinanana', 'Vatovavy-Fitovinany', 'Atsimo-Atsinanana', 'Vatovavy', 'Atsimo-Andrefana', 'Androy', 'Anosy'], 'coastline_length': 4828},
+# List of countries with significant coastlines and ocean cleanup activities
+COUNTRIES_DATA = {
+    # North America
+    'United States': {'coastal_regions': ['California', 'Florida', 'Texas', 'New York', 'Washington', 'Oregon', 'Louisiana', 'Alaska', 'Hawaii', 'North Carolina', 'South Carolina', 'Georgia', 'Virginia', 'Maryland', 'Delaware', 'New Jersey', 'Connecticut', 'Rhode Island', 'Massachusetts', 'Maine', 'New Hampshire'], 'coastline_length': 19924},
+    'Canada': {'coastal_regions': ['British Columbia', 'Newfoundland and Labrador', 'Nova Scotia', 'New Brunswick', 'Prince Edward Island', 'Quebec', 'Ontario', 'Manitoba', 'Saskatchewan', 'Alberta', 'Northwest Territories', 'Yukon', 'Nunavut'], 'coastline_length': 202080},
+    'Mexico': {'coastal_regions': ['Baja California', 'Sonora', 'Sinaloa', 'Nayarit', 'Jalisco', 'Colima', 'Michoacan', 'Guerrero', 'Oaxaca', 'Chiapas', 'Tabasco', 'Campeche', 'Yucatan', 'Quintana Roo', 'Tamaulipas', 'Veracruz'], 'coastline_length': 9330},
+
+    # South America
+    'Brazil': {'coastal_regions': ['Rio de Janeiro', 'Sao Paulo', 'Bahia', 'Ceara', 'Pernambuco', 'Alagoas', 'Sergipe', 'Paraiba', 'Rio Grande do Norte', 'Maranhao', 'Para', 'Amapa', 'Santa Catarina', 'Parana', 'Espirito Santo'], 'coastline_length': 7491},
+    'Argentina': {'coastal_regions': ['Buenos Aires', 'Rio Negro', 'Chubut', 'Santa Cruz', 'Tierra del Fuego'], 'coastline_length': 4989},
+    'Chile': {'coastal_regions': ['Arica y Parinacota', 'Tarapaca', 'Antofagasta', 'Atacama', 'Coquimbo', 'Valparaiso', 'Metropolitana', 'O Higgins', 'Maule', 'Biobio', 'Araucania', 'Los Rios', 'Los Lagos', 'Aysen', 'Magallanes'], 'coastline_length': 6435},
+    'Colombia': {'coastal_regions': ['Atlantico', 'Bolivar', 'Cesar', 'Cordoba', 'La Guajira', 'Magdalena', 'Sucre', 'Antioquia', 'Choco', 'Valle del Cauca', 'Cauca', 'Narino'], 'coastline_length': 3208},
+    'Peru': {'coastal_regions': ['Tumbes', 'Piura', 'Lambayeque', 'La Libertad', 'Ancash', 'Lima', 'Ica', 'Arequipa', 'Moquegua', 'Tacna'], 'coastline_length': 2414},
+    'Ecuador': {'coastal_regions': ['Esmeraldas', 'Manabi', 'Guayas', 'Santa Elena', 'El Oro'], 'coastline_length': 2237},
+    'Venezuela': {'coastal_regions': ['Zulia', 'Falcon', 'Lara', 'Yaracuy', 'Carabobo', 'Aragua', 'Vargas', 'Miranda', 'Anzoategui', 'Sucre', 'Monagas', 'Delta Amacuro'], 'coastline_length': 2800},
+    'Uruguay': {'coastal_regions': ['Rocha', 'Maldonado', 'Canelones', 'Montevideo', 'San Jose', 'Colonia', 'Soriano'], 'coastline_length': 660},
+
+    # Europe
+    'United Kingdom': {'coastal_regions': ['England', 'Scotland', 'Wales', 'Northern Ireland'], 'coastline_length': 12429},
+    'France': {'coastal_regions': ['Brittany', 'Normandy', 'Aquitaine', 'Provence', 'Corsica', 'Occitanie', 'Nouvelle-Aquitaine', 'Pays de la Loire', 'Hauts-de-France'], 'coastline_length': 3427},
+    'Spain': {'coastal_regions': ['Galicia', 'Asturias', 'Cantabria', 'Basque Country', 'Catalonia', 'Valencia', 'Murcia', 'Andalusia', 'Balearic Islands', 'Canary Islands'], 'coastline_length': 4964},
+    'Italy': {'coastal_regions': ['Liguria', 'Tuscany', 'Lazio', 'Campania', 'Calabria', 'Sicily', 'Sardinia', 'Apulia', 'Abruzzo', 'Marche', 'Emilia-Romagna', 'Veneto', 'Friuli-Venezia Giulia'], 'coastline_length': 7600},
+    'Germany': {'coastal_regions': ['Schleswig-Holstein', 'Lower Saxony', 'Mecklenburg-Vorpommern', 'Hamburg', 'Bremen'], 'coastline_length': 2389},
+    'Netherlands': {'coastal_regions': ['North Holland', 'South Holland', 'Zeeland', 'Friesland', 'Groningen'], 'coastline_length': 451},
+    'Norway': {'coastal_regions': ['Finnmark', 'Troms', 'Nordland', 'Trondelag', 'More og Romsdal', 'Vestland', 'Rogaland', 'Agder', 'Vestfold og Telemark', 'Oslo', 'Viken', 'Innlandet'], 'coastline_length': 25148},
+    'Sweden': {'coastal_regions': ['Stockholm', 'Vastra Gotaland', 'Skane', 'Halland', 'Blekinge', 'Kalmar', 'Kronoberg', 'Jonkoping', 'Ostergotland', 'Sodermanland', 'Uppsala', 'Vastmanland', 'Dalarna', 'Gavleborg', 'Vasternorrland', 'Jamtland', 'Vasterbotten', 'Norrbotten'], 'coastline_length': 3218},
+    'Denmark': {'coastal_regions': ['Zealand', 'Funen', 'Jutland', 'Bornholm'], 'coastline_length': 7314},
+    'Portugal': {'coastal_regions': ['North', 'Center', 'Lisbon', 'Alentejo', 'Algarve', 'Azores', 'Madeira'], 'coastline_length': 1793},
+    'Greece': {'coastal_regions': ['Attica', 'Central Greece', 'Thessaly', 'Epirus', 'Macedonia', 'Thrace', 'Peloponnese', 'Crete', 'Aegean Islands', 'Ionian Islands'], 'coastline_length': 13676},
+    'Turkey': {'coastal_regions': ['Istanbul', 'Marmara', 'Aegean', 'Mediterranean', 'Black Sea'], 'coastline_length': 7200},
+    'Russia': {'coastal_regions': ['Kaliningrad', 'Leningrad', 'Murmansk', 'Arkhangelsk', 'Karelia', 'Komi', 'Nenets', 'Yamalo-Nenets', 'Krasnoyarsk', 'Sakha', 'Chukotka', 'Kamchatka', 'Primorsky', 'Khabarovsk', 'Sakhalin', 'Magadan', 'Amur', 'Jewish Autonomous Oblast'], 'coastline_length': 37653},
+
+    # Asia
+    'China': {'coastal_regions': ['Liaoning', 'Hebei', 'Tianjin', 'Shandong', 'Jiangsu', 'Shanghai', 'Zhejiang', 'Fujian', 'Guangdong', 'Hainan', 'Guangxi', 'Hong Kong', 'Macau'], 'coastline_length': 14500},
+    'Japan': {'coastal_regions': ['Hokkaido', 'Tohoku', 'Kanto', 'Chubu', 'Kansai', 'Chugoku', 'Shikoku', 'Kyushu', 'Okinawa'], 'coastline_length': 29751},
+    'South Korea': {'coastal_regions': ['Gyeonggi', 'Incheon', 'Gangwon', 'Chungcheong', 'Jeolla', 'Gyeongsang', 'Jeju'], 'coastline_length': 2413},
+    'India': {'coastal_regions': ['Maharashtra', 'Goa', 'Karnataka', 'Kerala', 'Tamil Nadu', 'Andhra Pradesh', 'Odisha', 'West Bengal', 'Gujarat', 'Daman and Diu', 'Puducherry', 'Lakshadweep', 'Andaman and Nicobar Islands'], 'coastline_length': 7516},
+    'Indonesia': {'coastal_regions': ['Aceh', 'North Sumatra', 'West Sumatra', 'Riau', 'Riau Islands', 'Jambi', 'South Sumatra', 'Bangka Belitung', 'Lampung', 'Banten', 'Jakarta', 'West Java', 'Central Java', 'Yogyakarta', 'East Java', 'Bali', 'West Nusa Tenggara', 'East Nusa Tenggara', 'West Kalimantan', 'Central Kalimantan', 'South Kalimantan', 'East Kalimantan', 'North Kalimantan', 'North Sulawesi', 'Gorontalo', 'Central Sulawesi', 'West Sulawesi', 'South Sulawesi', 'Southeast Sulawesi', 'North Maluku', 'Maluku', 'West Papua', 'Papua'], 'coastline_length': 54716},
+    'Philippines': {'coastal_regions': ['Ilocos', 'Cagayan Valley', 'Central Luzon', 'Calabarzon', 'Mimaropa', 'Bicol', 'Western Visayas', 'Central Visayas', 'Eastern Visayas', 'Zamboanga Peninsula', 'Northern Mindanao', 'Davao', 'Soccsksargen', 'Caraga', 'Bangsamoro', 'Cordillera', 'National Capital Region'], 'coastline_length': 36289},
+    'Thailand': {'coastal_regions': ['Central', 'Eastern', 'Western', 'Southern'], 'coastline_length': 3219},
+    'Vietnam': {'coastal_regions': ['Red River Delta', 'North Central Coast', 'South Central Coast', 'Southeast', 'Mekong Delta'], 'coastline_length': 3444},
+    'Malaysia': {'coastal_regions': ['Perlis', 'Kedah', 'Penang', 'Perak', 'Selangor', 'Negeri Sembilan', 'Malacca', 'Johor', 'Pahang', 'Terengganu', 'Kelantan', 'Sabah', 'Sarawak', 'Labuan', 'Putrajaya'], 'coastline_length': 4675},
+    'Singapore': {'coastal_regions': ['Central Region', 'East Region', 'North Region', 'Northeast Region', 'West Region'], 'coastline_length': 193},
+    'Bangladesh': {'coastal_regions': ['Barisal', 'Chittagong', 'Dhaka', 'Khulna', 'Rajshahi', 'Rangpur', 'Sylhet'], 'coastline_length': 580},
+    'Sri Lanka': {'coastal_regions': ['Western', 'Central', 'Southern', 'Northern', 'Eastern', 'North Western', 'North Central', 'Uva', 'Sabaragamuwa'], 'coastline_length': 1340},
+    'Myanmar': {'coastal_regions': ['Rakhine', 'Ayeyarwady', 'Yangon', 'Mon', 'Kayin', 'Tanintharyi'], 'coastline_length': 1930},
+
+    # Africa
+    'South Africa': {'coastal_regions': ['Western Cape', 'Eastern Cape', 'KwaZulu-Natal', 'Northern Cape'], 'coastline_length': 2798},
+    'Egypt': {'coastal_regions': ['Alexandria', 'Beheira', 'Kafr el-Sheikh', 'Dakahlia', 'Damietta', 'Port Said', 'Ismailia', 'Suez', 'North Sinai', 'South Sinai', 'Red Sea'], 'coastline_length': 2450},
+    'Morocco': {'coastal_regions': ['Tangier-Tetouan-Al Hoceima', 'Rabat-Sale-Kenitra', 'Casablanca-Settat', 'Marrakech-Safi', 'Souss-Massa', 'Guelmim-Oued Noun', 'Laayoune-Sakia El Hamra', 'Dakhla-Oued Ed-Dahab'], 'coastline_length': 1835},
+    'Algeria': {'coastal_regions': ['Tlemcen', 'Ain Temouchent', 'Oran', 'Mostaganem', 'Chlef', 'Tipaza', 'Algiers', 'Boumerdes', 'Tizi Ouzou', 'Bejaia', 'Jijel', 'Skikda', 'Annaba', 'El Tarf'], 'coastline_length': 998},
+    'Tunisia': {'coastal_regions': ['Bizerte', 'Ariana', 'Tunis', 'Ben Arous', 'Nabeul', 'Sousse', 'Monastir', 'Mahdia', 'Sfax', 'Gabes', 'Medenine', 'Tataouine'], 'coastline_length': 1148},
+    'Libya': {'coastal_regions': ['Tripolitania', 'Cyrenaica', 'Fezzan'], 'coastline_length': 1770},
+    'Nigeria': {'coastal_regions': ['Lagos', 'Ogun', 'Ondo', 'Edo', 'Delta', 'Bayelsa', 'Rivers', 'Akwa Ibom', 'Cross River'], 'coastline_length': 853},
+    'Ghana': {'coastal_regions': ['Greater Accra', 'Central', 'Western', 'Volta'], 'coastline_length': 539},
+    'Senegal': {'coastal_regions': ['Dakar', 'Thies', 'Diourbel', 'Fatick', 'Kaolack', 'Kolda', 'Ziguinchor', 'Tambacounda', 'Saint-Louis', 'Matam', 'Kaffrine', 'Kedougou', 'Sedhiou'], 'coastline_length': 531},
+    'Kenya': {'coastal_regions': ['Mombasa', 'Kwale', 'Kilifi', 'Tana River', 'Lamu', 'Taita-Taveta'], 'coastline_length': 536},
+    'Tanzania': {'coastal_regions': ['Tanga', 'Pwani', 'Dar es Salaam', 'Lindi', 'Mtwara'], 'coastline_length': 1424},
+    'Mozambique': {'coastal_regions': ['Cabo Delgado', 'Nampula', 'Zambezia', 'Sofala', 'Inhambane', 'Gaza', 'Maputo'], 'coastline_length': 2470},
+    'Madagascar': {'coastal_regions': ['Antsiranana', 'Sava', 'Analanjirofo', 'Atsinanana', 'Vatovavy-Fitovinany', 'Atsimo-Atsinanana', 'Vatovavy', 'Atsimo-Andrefana', 'Androy', 'Anosy'], 'coastline_length': 4828},
+
+    # Oceania
+    'Australia': {'coastal_regions': ['Western Australia', 'South Australia', 'Victoria', 'Tasmania', 'New South Wales', 'Queensland', 'Northern Territory', 'Australian Capital Territory'], 'coastline_length': 25760},
+    'New Zealand': {'coastal_regions': ['Northland', 'Auckland', 'Waikato', 'Bay of Plenty', 'Gisborne', 'Hawke Bay', 'Taranaki', 'Manawatu-Wanganui', 'Wellington', 'Tasman', 'Nelson', 'Marlborough', 'West Coast', 'Canterbury', 'Otago', 'Southland'], 'coastline_length': 15134},
+    'Papua New Guinea': {'coastal_regions': ['Central', 'Gulf', 'Milne Bay', 'Oro', 'Western', 'West New Britain', 'East New Britain', 'New Ireland', 'Manus', 'Madang', 'Morobe', 'East Sepik', 'West Sepik', 'Sandaun', 'Enga', 'Southern Highlands', 'Hela', 'Jiwaka', 'Chimbu', 'Eastern Highlands', 'Western Highlands'], 'coastline_length': 5152},
+    'Fiji': {'coastal_regions': ['Central', 'Eastern', 'Northern', 'Western'], 'coastline_length': 1129},
+    'Solomon Islands': {'coastal_regions': ['Central', 'Choiseul', 'Guadalcanal', 'Isabel', 'Makira-Ulawa', 'Malaita', 'Rennell and Bellona', 'Temotu', 'Western'], 'coastline_length': 5313},
+    'Vanuatu': {'coastal_regions': ['Torba', 'Sanma', 'Penama', 'Malampa', 'Shefa', 'Tafea'], 'coastline_length': 2528},
+    'Samoa': {'coastal_regions': ['Upolu', 'Savaii'], 'coastline_length': 403},
+    'Tonga': {'coastal_regions': ['Tongatapu', 'Vava u', 'Ha apai', 'Eua', 'Niuas'], 'coastline_length': 419},
+    'Kiribati': {'coastal_regions': ['Gilbert Islands', 'Phoenix Islands', 'Line Islands'], 'coastline_length': 1143},
+    'Marshall Islands': {'coastal_regions': ['Ralik Chain', 'Ratak Chain'], 'coastline_length': 370},
+    'Micronesia': {'coastal_regions': ['Yap', 'Chuuk', 'Pohnpei', 'Kosrae'], 'coastline_length': 6112},
+    'Palau': {'coastal_regions': ['Koror', 'Aimeliik', 'Airai', 'Melekeok', 'Ngaraard', 'Ngarchelong', 'Ngardmau', 'Ngatpang', 'Ngchesar', 'Ngeremlengui', 'Ngiwal', 'Peleliu', 'Sonsorol'], 'coastline_length': 1519},
+    'Tuvalu': {'coastal_regions': ['Funafuti', 'Nanumanga', 'Nanumea', 'Niutao', 'Nui', 'Nukufetau', 'Nukulaelae', 'Vaitupu'], 'coastline_length': 24},
+    'Nauru': {'coastal_regions': ['Yaren', 'Anabar', 'Anetan', 'Anibare', 'Baiti', 'Boe', 'Buada', 'Denigomodu', 'Ewa', 'Ijuw', 'Meneng', 'Uaboe', 'Ijuw'], 'coastline_length': 30}
+}
+
+# Country-specific coordinate ranges
+COUNTRY_COORDS = {
+    'United States': {'lat_range': (24.5, 49.0), 'lon_range': (-125.0, -66.9)},
+    'Canada': {'lat_range': (41.7, 83.1), 'lon_range': (-141.0, -52.6)},
+    'Mexico': {'lat_range': (14.5, 32.7), 'lon_range': (-118.4, -86.7)},
+    'Brazil': {'lat_range': (-33.8, 5.3), 'lon_range': (-73.9, -34.8)},
+    'Argentina': {'lat_range': (-55.1, -21.8), 'lon_range': (-73.6, -53.6)},
+    'Chile': {'lat_range': (-56.0, -17.5), 'lon_range': (-75.6, -66.4)},
+    'Colombia': {'lat_range': (-4.2, 15.5), 'lon_range': (-81.7, -66.9)},
+    'Peru': {'lat_range': (-18.3, -0.0), 'lon_range': (-84.6, -68.7)},
+    'Ecuador': {'lat_range': (-5.0, 1.7), 'lon_range': (-92.0, -75.2)},
+    'Venezuela': {'lat_range': (0.6, 15.9), 'lon_range': (-73.4, -59.8)},
+    'Uruguay': {'lat_range': (-35.0, -30.1), 'lon_range': (-58.4, -53.1)},
+    'United Kingdom': {'lat_range': (49.9, 60.8), 'lon_range': (-8.2, 1.8)},
+    'France': {'lat_range': (41.3, 51.1), 'lon_range': (-5.1, 9.6)},
+    'Spain': {'lat_range': (27.6, 43.8), 'lon_range': (-9.3, 4.3)},
+    'Italy': {'lat_range': (35.5, 47.1), 'lon_range': (6.6, 18.5)},
+    'Germany': {'lat_range': (47.3, 55.1), 'lon_range': (5.9, 15.0)},
+    'Netherlands': {'lat_range': (50.8, 53.6), 'lon_range': (3.4, 7.2)},
+    'Norway': {'lat_range': (58.0, 80.8), 'lon_range': (4.6, 31.3)},
+    'Sweden': {'lat_range': (55.3, 69.1), 'lon_range': (11.0, 24.2)},
+    'Denmark': {'lat_range': (54.6, 57.8), 'lon_range': (8.1, 15.2)},
+    'Portugal': {'lat_range': (36.9, 42.2), 'lon_range': (-9.5, -6.2)},
+    'Greece': {'lat_range': (34.8, 41.7), 'lon_range': (19.4, 29.7)},
+    'Turkey': {'lat_range': (35.8, 42.1), 'lon_range': (25.7, 44.8)},
+    'Russia': {'lat_range': (41.2, 81.9), 'lon_range': (-180.0, 180.0)},
+    'China': {'lat_range': (18.2, 53.6), 'lon_range': (73.6, 135.1)},
+    'Japan': {'lat_range': (24.2, 45.5), 'lon_range': (123.0, 145.8)},
+    'South Korea': {'lat_range': (33.1, 38.6), 'lon_range': (124.6, 131.9)},
+    'India': {'lat_range': (6.7, 37.1), 'lon_range': (68.2, 97.4)},
+    'Indonesia': {'lat_range': (-11.0, 6.1), 'lon_range': (95.0, 141.0)},
+    'Philippines': {'lat_range': (4.6, 21.1), 'lon_range': (116.9, 126.6)},
+    'Thailand': {'lat_range': (5.6, 20.5), 'lon_range': (97.3, 105.6)},
+    'Vietnam': {'lat_range': (8.6, 23.4), 'lon_range': (102.1, 109.5)},
+    'Malaysia': {'lat_range': (0.9, 7.4), 'lon_range': (99.6, 119.3)},
+    'Singapore': {'lat_range': (1.2, 1.5), 'lon_range': (103.6, 104.0)},
+    'Bangladesh': {'lat_range': (20.7, 26.6), 'lon_range': (88.0, 92.7)},
+    'Sri Lanka': {'lat_range': (5.9, 9.8), 'lon_range': (79.7, 81.9)},
+    'Myanmar': {'lat_range': (9.8, 28.5), 'lon_range': (92.2, 101.2)},
+    'South Africa': {'lat_range': (-47.0, -22.1), 'lon_range': (16.5, 32.9)},
+    'Egypt': {'lat_range': (22.0, 31.7), 'lon_range': (24.7, 36.9)},
+    'Morocco': {'lat_range': (21.4, 35.9), 'lon_range': (-17.0, -1.0)},
+    'Algeria': {'lat_range': (18.9, 37.1), 'lon_range': (-8.7, 12.0)},
+    'Tunisia': {'lat_range': (30.2, 37.5), 'lon_range': (7.5, 11.6)},
+    'Libya': {'lat_range': (19.5, 33.2), 'lon_range': (9.3, 25.2)},
+    'Nigeria': {'lat_range': (4.3, 13.9), 'lon_range': (2.7, 14.7)},
+    'Ghana': {'lat_range': (4.7, 11.2), 'lon_range': (-3.3, 1.3)},
+    'Senegal': {'lat_range': (12.3, 16.7), 'lon_range': (-17.5, -11.3)},
+    'Kenya': {'lat_range': (-4.7, 5.5), 'lon_range': (33.9, 41.9)},
+    'Tanzania': {'lat_range': (-11.7, -0.9), 'lon_range': (29.3, 40.3)},
+    'Mozambique': {'lat_range': (-26.9, -10.5), 'lon_range': (30.2, 40.8)},
+    'Madagascar': {'lat_range': (-25.6, -11.9), 'lon_range': (43.2, 50.5)},
+    'Australia': {'lat_range': (-43.6, -10.7), 'lon_range': (113.3, 153.6)},
+    'New Zealand': {'lat_range': (-47.3, -34.4), 'lon_range': (166.5, 178.6)},
+    'Papua New Guinea': {'lat_range': (-12.0, -1.0), 'lon_range': (140.8, 159.9)},
+    'Fiji': {'lat_range': (-20.7, -16.0), 'lon_range': (177.0, -178.1)},
+    'Solomon Islands': {'lat_range': (-11.9, -5.3), 'lon_range': (155.5, 166.9)},
+    'Vanuatu': {'lat_range': (-20.2, -13.1), 'lon_range': (166.5, 170.2)},
+    'Samoa': {'lat_range': (-14.0, -13.4), 'lon_range': (-172.8, -171.4)},
+    'Tonga': {'lat_range': (-24.0, -15.6), 'lon_range': (-179.1, -173.9)},
+    'Kiribati': {'lat_range': (-4.7, 4.7), 'lon_range': (-174.5, -150.2)},
+    'Marshall Islands': {'lat_range': (4.6, 14.7), 'lon_range': (160.8, 172.0)},
+    'Micronesia': {'lat_range': (1.0, 10.1), 'lon_range': (137.3, 163.0)},
+    'Palau': {'lat_range': (2.9, 8.2), 'lon_range': (131.1, 134.7)},
+    'Tuvalu': {'lat_range': (-10.8, -5.6), 'lon_range': (176.0, 179.9)},
+    'Nauru': {'lat_range': (-0.6, -0.5), 'lon_range': (166.9, 166.9)}
+}
+
+# Trash item columns in record order, with the upper bound of their random counts
+TRASH_ITEM_RANGES = [
+    ('Cigarette Butts', 100),
+    ('Food Wrappers (candy, chips, etc.)', 50),
+    ('Take Out/Away Containers (Plastic)', 30),
+    ('Take Out/Away Containers (Foam)', 20),
+    ('Bottle Caps (Plastic)', 40),
+    ('Bottle Caps (Metal)', 20),
+    ('Lids (Plastic)', 30),
+    ('Straws, Stirrers', 25),
+    ('Forks, Knives, Spoons', 15),
+    ('Beverage Bottles (Plastic)', 35),
+    ('Beverage Bottles (Glass)', 20),
+    ('Beverage Cans', 25),
+    ('Grocery Bags (Plastic)', 30),
+    ('Other Plastic Bags', 25),
+    ('Paper Bags', 15),
+    ('Cups, Plates (Paper)', 20),
+    ('Cups, Plates (Plastic)', 25),
+    ('Cups, Plates (Foam)', 15),
+    ('Fishing Buoys, Pots & Traps', 10),
+    ('Fishing Net & Pieces', 8),
+    ('Fishing Line (1 yard/meter = 1 piece)', 15),
+    ('Rope (1 yard/meter = 1 piece)', 12),
+    ('Fishing Gear (Clean Swell)', 5),
+    ('6-Pack Holders', 10),
+    ('Other Plastic/Foam Packaging', 20),
+    ('Other Plastic Bottles (oil, bleach, etc.)', 15),
+    ('Strapping Bands', 8),
+    ('Tobacco Packaging/Wrap', 12),
+    ('Other Packaging (Clean Swell)', 10),
+    ('Appliances (refrigerators, washers, etc.)', 3),
+    ('Balloons', 15),
+    ('Cigar Tips', 8),
+    ('Cigarette Lighters', 10),
+    ('Construction Materials', 5),
+    ('Fireworks', 3),
+    ('Tires', 2),
+    ('Toys', 12),
+    ('Other Trash (Clean Swell)', 15),
+    ('Condoms', 5),
+    ('Diapers', 3),
+    ('Syringes', 2),
+    ('Tampons/Tampon Applicators', 4),
+    ('Personal Hygiene (Clean Swell)', 8),
+    ('Foam Pieces', 30),
+    ('Glass Pieces', 25),
+    ('Plastic Pieces', 50)
+]
+
+GROUP_NAME_SUFFIXES = [
+    'Beach Cleaners', 'Ocean Guardians', 'Coastal Warriors',
+    'Marine Savers', 'Cleanup Crew', 'Eco Warriors',
+    'Blue Guardians', 'Ocean Protectors', 'Beach Warriors',
+    'Coastal Cleaners', 'Marine Protectors', 'Ocean Heroes'
+]
+
+# Cleanup dates are drawn from the DATE_WINDOW_DAYS days up to a fixed end
+# date rather than today, so a seed gives the same dataset on any day
+DEFAULT_END_DATE = datetime(2025, 11, 26)
+DATE_WINDOW_DAYS = 730
+
+CLEANUP_TYPES = ['Land (beach, shoreline and inland)', 'Water (boat, kayak, paddleboard)', 'Underwater (diving)']
+
+def get_num_sites(info, sites_multiplier=1):
+    """Number of cleanup sites for a country (100-200 based on coastline length, times sites_multiplier)"""
+    return min(200, max(100, int(info['coastline_length'] / 100))) * sites_multiplier
+
+@instrumented('generate')
+def generate_global_cleanup_data(vectorized=False, sites_multiplier=1, seed=42, save=True, workers=1, fmt=DEFAULT_FORMAT,
+                                  end_date=DEFAULT_END_DATE):
+    """Generate comprehensive global ocean cleanup data for 100+ sites per country
+    
+    vectorized=True draws whole columns per country from a numpy Generator
+    seeded from seed and the country name instead of building one dict per
+    record; combined with sites_multiplier (e.g. 10-100) it produces
+    load-testing datasets in the tens of millions of rows. workers > 1
+    generates countries in a process pool (implies vectorized) with output
+    identical to workers=1. The legacy path uses the global random state.
+    Cleanup dates fall in the DATE_WINDOW_DAYS days up to end_date.
+    Datasets are saved in fmt ('parquet', 'feather' or 'csv').
+    """
+    
+    if vectorized or workers > 1:
+        df = generate_global_cleanup_data_vectorized(sites_multiplier, seed, workers, end_date)
+    else:
+        df = generate_global_cleanup_data_records(sites_multiplier, end_date)
+    
+    # Hold the frame in the compact cleanup schema (uint8/uint16 counts, categoricals, datetimes)
+    df = apply_cleanup_schema(df)
+    
+    # Add comprehensive cost analysis to each cleanup point
+    print("Calculating costs for each cleanup point...")
+    df_with_costs = apply_cleanup_schema(add_cost_columns_to_dataframe(df))
+    
+    if save:
+        # Save the data with costs
+        output_file = save_dataset(df_with_costs, 'data/global_ocean_cleanup_data_with_costs', fmt)
         
-        # Oceania
-        'Australia': {'coastal_regions': ['Western Australia', 'South Australia', 'Victoria', 'Tasmania', 'New South Wales', 'Queensland', 'Northern Territory', 'Australian Capital Territory'], 'coastline_length': 25760},
-        'New Zealand': {'coastal_regions': ['Northland', 'Auckland', 'Waikato', 'Bay of Plenty', 'Gisborne', 'Hawke Bay', 'Taranaki', 'Manawatu-Wanganui', 'Wellington', 'Tasman', 'Nelson', 'Marlborough', 'West Coast', 'Canterbury', 'Otago', 'Southland'], 'coastline_length': 15134},
-        'Papua New Guinea': {'coastal_regions': ['Central', 'Gulf', 'Milne Bay', 'Oro', 'Western', 'West New Britain', 'East New Britain', 'New Ireland', 'Manus', 'Madang', 'Morobe', 'East Sepik', 'West Sepik', 'Sandaun', 'Enga', 'Southern Highlands', 'Hela', 'Jiwaka', 'Chimbu', 'Eastern Highlands', 'Western Highlands'], 'coastline_length': 5152},
-        'Fiji': {'coastal_regions': ['Central', 'Eastern', 'Northern', 'Western'], 'coastline_length': 1129},
-        'Solomon Islands': {'coastal_regions': ['Central', 'Choiseul', 'Guadalcanal', 'Isabel', 'Makira-Ulawa', 'Malaita', 'Rennell and Bellona', 'Temotu', 'Western'], 'coastline_length': 5313},
-        'Vanuatu': {'coastal_regions': ['Torba', 'Sanma', 'Penama', 'Malampa', 'Shefa', 'Tafea'], 'coastline_length': 2528},
-        'Samoa': {'coastal_regions': ['Upolu', 'Savaii'], 'coastline_length': 403},
-        'Tonga': {'coastal_regions': ['Tongatapu', 'Vava u', 'Ha apai', 'Eua', 'Niuas'], 'coastline_length': 419},
-        'Kiribati': {'coastal_regions': ['Gilbert Islands', 'Phoenix Islands', 'Line Islands'], 'coastline_length': 1143},
-        'Marshall Islands': {'coastal_regions': ['Ralik Chain', 'Ratak Chain'], 'coastline_length': 370},
-        'Micronesia': {'coastal_regions': ['Yap', 'Chuuk', 'Pohnpei', 'Kosrae'], 'coastline_length': 6112},
-        'Palau': {'coastal_regions': ['Koror', 'Aimeliik', 'Airai', 'Melekeok', 'Ngaraard', 'Ngarchelong', 'Ngardmau', 'Ngatpang', 'Ngchesar', 'Ngeremlengui', 'Ngiwal', 'Peleliu', 'Sonsorol'], 'coastline_length': 1519},
-        'Tuvalu': {'coastal_regions': ['Funafuti', 'Nanumanga', 'Nanumea', 'Niutao', 'Nui', 'Nukufetau', 'Nukulaelae', 'Vaitupu'], 'coastline_length': 24},
-        'Nauru': {'coastal_regions': ['Yaren', 'Anabar', 'Anetan', 'Anibare', 'Baiti', 'Boe', 'Buada', 'Denigomodu', 'Ewa', 'Ijuw', 'Meneng', 'Uaboe', 'Ijuw'], 'coastline_length': 30}
-    }
+        # Also save original data without costs
+        original_output_file = save_dataset(df, 'data/global_ocean_cleanup_data', fmt)
+    
+    print(f"\nGenerated {len(df)} cleanup records for {len(COUNTRIES_DATA)} countries")
+    if save:
+        print(f"Data with costs saved to: {output_file}")
+        print(f"Original data saved to: {original_output_file}")
+    
+    # Print cost summary
+    print_cost_summary(CostAggregator.from_dataframe(df_with_costs), "GLOBAL OCEAN CLEANUP COST ANALYSIS SUMMARY")
+    
+    return df_with_costs
+
+def generate_global_cleanup_data_records(sites_multiplier=1, end_date=DEFAULT_END_DATE):
+    """Generate the raw cleanup records one dict per record using the global random state"""
     
     # Generate cleanup data for each country
     all_cleanup_data = []
     cleanup_id_counter = 1
     
-    for country, info in countries_data.items():
+    for country, info in COUNTRIES_DATA.items():
         print(f"Generating data for {country}...")
         
         # Determine number of cleanup sites (100-200 per country based on coastline length)
-        num_sites = min(200, max(100, int(info['coastline_length'] / 100)))
+        num_sites = get_num_sites(info, sites_multiplier)
         
         for i in range(num_sites):
             # Select random coastal region
@@ -106,154 +294,129 @@ def generate_global_cleanup_data():
             
             # Generate cleanup data
             cleanup_data = generate_single_cleanup_record(
-                cleanup_id_counter, country, region, lat, lon
+                cleanup_id_counter, country, region, lat, lon, end_date
             )
             
             all_cleanup_data.append(cleanup_data)
             cleanup_id_counter += 1
     
     # Create DataFrame
-    df = pd.DataFrame(all_cleanup_data)
-    
-    # Add comprehensive cost analysis to each cleanup point
-    print("Calculating costs for each cleanup point...")
-    df_with_costs = add_cost_columns_to_dataframe(df)
+    return pd.DataFrame(all_cleanup_data)
+
+def country_seed(seed, country):
+    """Seed sequence for one country derived from the master seed and the country name
     
-    # Save to CSV
-    output_file = 'data/global_ocean_cleanup_data_with_costs.csv'
-    df_with_costs.to_csv(output_file, index=False)
+    Uses a stable hash of the name (not hash(), which is salted per process)
+    so a country's records do not depend on processing order or worker count.
+    """
+    name_key = int.from_bytes(hashlib.sha256(country.encode('utf-8')).digest()[:8], 'little')
+    return np.random.SeedSequence([seed, name_key])
+
+def generate_global_cleanup_data_vectorized(sites_multiplier=1, seed=42, workers=1, end_date=DEFAULT_END_DATE):
+    """Generate the raw cleanup records column-wise, one seeded numpy Generator per country"""
     
-    # Also save original data without costs
-    original_output_file = 'data/global_ocean_cleanup_data.csv'
-    df.to_csv(original_output_file, index=False)
+    # Fix the date window and cleanup ID blocks up front so every country is independent
+    start_date = end_date - timedelta(days=DATE_WINDOW_DAYS)
+    tasks = []
+    cleanup_id_counter = 1
     
-    print(f"\nGenerated {len(df)} cleanup records for {len(countries_data)} countries")
-    print(f"Data with costs saved to: {output_file}")
-    print(f"Original data saved to: {original_output_file}")
+    for country, info in COUNTRIES_DATA.items():
+        num_sites = get_num_sites(info, sites_multiplier)
+        tasks.append((seed, country, info, num_sites, cleanup_id_counter, start_date))
+        cleanup_id_counter += num_sites
     
-    # Print cost summary
-    print_cost_summary(df_with_costs)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            country_frames = list(executor.map(_generate_country_task, tasks))
+    else:
+        country_frames = [_generate_country_task(task) for task in tasks]
     
-    return df_with_costs
+    return pd.concat(country_frames, ignore_index=True)
 
-def print_cost_summary(df):
-    """Print comprehensive cost summary for the global cleanup data"""
-    print("\n" + "="*60)
-    print("GLOBAL OCEAN CLEANUP COST ANALYSIS SUMMARY")
-    print("="*60)
-    
-    # Basic statistics
-    total_events = len(df)
-    total_people = df['People'].sum()
-    total_pounds = df['Pounds'].sum()
-    total_miles = df['Miles'].sum()
-    
-    # Cost statistics
-    total_volunteer_cost = df['volunteer_cost'].sum()
-    total_direct_costs = df['total_direct_costs'].sum()
-    total_carbon_cost = df['carbon_cost'].sum()
-    total_cost = df['total_cost'].sum()
-    
-    print(f"Total Cleanup Events: {total_events:,}")
-    print(f"Total People Involved: {total_people:,}")
-    print(f"Total Pounds Collected: {total_pounds:,.2f}")
-    print(f"Total Miles Covered: {total_miles:,.2f}")
-    print(f"Total Countries: {df['Country'].nunique()}")
-    
-    print(f"\nCOST BREAKDOWN:")
-    print(f"Volunteer Time Value: ${total_volunteer_cost:,.2f}")
-    print(f"Direct Costs (Equipment, Transport, etc.): ${total_direct_costs:,.2f}")
-    print(f"Carbon Footprint Cost: ${total_carbon_cost:,.2f}")
-    print(f"TOTAL COST: ${total_cost:,.2f}")
-    
-    print(f"\nEFFICIENCY METRICS:")
-    print(f"Average Cost per Event: ${total_cost/total_events:,.2f}")
-    print(f"Average Cost per Person: ${total_cost/total_people:,.2f}")
-    print(f"Average Cost per Pound: ${total_cost/total_pounds:,.2f}")
-    print(f"Average Pounds per Person: {total_pounds/total_people:.2f}")
-    
-    # Top 10 countries by total cost
-    country_costs = df.groupby('Country')['total_cost'].sum().sort_values(ascending=False).head(10)
-    print(f"\nTOP 10 COUNTRIES BY TOTAL COST:")
-    for i, (country, cost) in enumerate(country_costs.items(), 1):
-        print(f"{i:2d}. {country}: ${cost:,.2f}")
-    
-    print("="*60)
+def _generate_country_task(task):
+    """Process pool entry point: generate one country's records from its own seed"""
+    seed, country, info, num_sites, start_id, start_date = task
+    print(f"Generating data for {country}...")
+    rng = np.random.default_rng(country_seed(seed, country))
+    return generate_country_records_vectorized(rng, country, info, num_sites, start_id, start_date)
 
-def generate_coordinates_for_country(country, region):
-    """Generate realistic GPS coordinates for a country/region"""
+def generate_country_records_vectorized(rng, country, info, num_sites, start_id, start_date=None):
+    """Generate num_sites cleanup records for one country as whole columns
+    
+    Mirrors generate_single_cleanup_record field by field, but every column
+    is drawn with a single call on rng and the frame is built from arrays.
+    """
+    n = num_sites
+    regions = info['coastal_regions']
+    region_idx = rng.integers(0, len(regions), n)
+    
+    # Generate realistic GPS coordinates based on country
+    if country in COUNTRY_COORDS:
+        lat_range = COUNTRY_COORDS[country]['lat_range']
+        lon_range = COUNTRY_COORDS[country]['lon_range']
+    else:
+        lat_range = (-60, 60)
+        lon_range = (-180, 180)
+    lat = np.round(lat_range[0] + (lat_range[1] - lat_range[0]) * rng.random(n), 6)
+    lon = np.round(lon_range[0] + (lon_range[1] - lon_range[0]) * rng.random(n), 6)
+    
+    # Generate cleanup dates (random date in the 2 years up to the end date), formatting only the possible days
+    if start_date is None:
+        start_date = DEFAULT_END_DATE - timedelta(days=DATE_WINDOW_DAYS)
+    date_strings = np.array([(start_date + timedelta(days=d)).strftime('%m/%d/%Y') for d in range(DATE_WINDOW_DAYS + 1)])
+    cleanup_dates = date_strings[rng.integers(0, DATE_WINDOW_DAYS + 1, n)]
+    
+    # Generate group names from the region x suffix combinations
+    group_names = np.array([f"{region} {suffix}" for region in regions for suffix in GROUP_NAME_SUFFIXES])
+    group_idx = region_idx * len(GROUP_NAME_SUFFIXES) + rng.integers(0, len(GROUP_NAME_SUFFIXES), n)
     
-    # Country-specific coordinate ranges
-    country_coords = {
-        'United States': {'lat_range': (24.5, 49.0), 'lon_range': (-125.0, -66.9)},
-        'Canada': {'lat_range': (41.7, 83.1), 'lon_range': (-141.0, -52.6)},
-        'Mexico': {'lat_range': (14.5, 32.7), 'lon_range': (-118.4, -86.7)},
-        'Brazil': {'lat_range': (-33.8, 5.3), 'lon_range': (-73.9, -34.8)},
-        'Argentina': {'lat_range': (-55.1, -21.8), 'lon_range': (-73.6, -53.6)},
-        'Chile': {'lat_range': (-56.0, -17.5), 'lon_range': (-75.6, -66.4)},
-        'Colombia': {'lat_range': (-4.2, 15.5), 'lon_range': (-81.7, -66.9)},
-        'Peru': {'lat_range': (-18.3, -0.0), 'lon_range': (-84.6, -68.7)},
-        'Ecuador': {'lat_range': (-5.0, 1.7), 'lon_range': (-92.0, -75.2)},
-        'Venezuela': {'lat_range': (0.6, 15.9), 'lon_range': (-73.4, -59.8)},
-        'Uruguay': {'lat_range': (-35.0, -30.1), 'lon_range': (-58.4, -53.1)},
-        'United Kingdom': {'lat_range': (49.9, 60.8), 'lon_range': (-8.2, 1.8)},
-        'France': {'lat_range': (41.3, 51.1), 'lon_range': (-5.1, 9.6)},
-        'Spain': {'lat_range': (27.6, 43.8), 'lon_range': (-9.3, 4.3)},
-        'Italy': {'lat_range': (35.5, 47.1), 'lon_range': (6.6, 18.5)},
-        'Germany': {'lat_range': (47.3, 55.1), 'lon_range': (5.9, 15.0)},
-        'Netherlands': {'lat_range': (50.8, 53.6), 'lon_range': (3.4, 7.2)},
-        'Norway': {'lat_range': (58.0, 80.8), 'lon_range': (4.6, 31.3)},
-        'Sweden': {'lat_range': (55.3, 69.1), 'lon_range': (11.0, 24.2)},
-        'Denmark': {'lat_range': (54.6, 57.8), 'lon_range': (8.1, 15.2)},
-        'Portugal': {'lat_range': (36.9, 42.2), 'lon_range': (-9.5, -6.2)},
-        'Greece': {'lat_range': (34.8, 41.7), 'lon_range': (19.4, 29.7)},
-        'Turkey': {'lat_range': (35.8, 42.1), 'lon_range': (25.7, 44.8)},
-        'Russia': {'lat_range': (41.2, 81.9), 'lon_range': (-180.0, 180.0)},
-        'China': {'lat_range': (18.2, 53.6), 'lon_range': (73.6, 135.1)},
-        'Japan': {'lat_range': (24.2, 45.5), 'lon_range': (123.0, 145.8)},
-        'South Korea': {'lat_range': (33.1, 38.6), 'lon_range': (124.6, 131.9)},
-        'India': {'lat_range': (6.7, 37.1), 'lon_range': (68.2, 97.4)},
-        'Indonesia': {'lat_range': (-11.0, 6.1), 'lon_range': (95.0, 141.0)},
-        'Philippines': {'lat_range': (4.6, 21.1), 'lon_range': (116.9, 126.6)},
-        'Thailand': {'lat_range': (5.6, 20.5), 'lon_range': (97.3, 105.6)},
-        'Vietnam': {'lat_range': (8.6, 23.4), 'lon_range': (102.1, 109.5)},
-        'Malaysia': {'lat_range': (0.9, 7.4), 'lon_range': (99.6, 119.3)},
-        'Singapore': {'lat_range': (1.2, 1.5), 'lon_range': (103.6, 104.0)},
-        'Bangladesh': {'lat_range': (20.7, 26.6), 'lon_range': (88.0, 92.7)},
-        'Sri Lanka': {'lat_range': (5.9, 9.8), 'lon_range': (79.7, 81.9)},
-        'Myanmar': {'lat_range': (9.8, 28.5), 'lon_range': (92.2, 101.2)},
-        'South Africa': {'lat_range': (-47.0, -22.1), 'lon_range': (16.5, 32.9)},
-        'Egypt': {'lat_range': (22.0, 31.7), 'lon_range': (24.7, 36.9)},
-        'Morocco': {'lat_range': (21.4, 35.9), 'lon_range': (-17.0, -1.0)},
-        'Algeria': {'lat_range': (18.9, 37.1), 'lon_range': (-8.7, 12.0)},
-        'Tunisia': {'lat_range': (30.2, 37.5), 'lon_range': (7.5, 11.6)},
-        'Libya': {'lat_range': (19.5, 33.2), 'lon_range': (9.3, 25.2)},
-        'Nigeria': {'lat_range': (4.3, 13.9), 'lon_range': (2.7, 14.7)},
-        'Ghana': {'lat_range': (4.7, 11.2), 'lon_range': (-3.3, 1.3)},
-        'Senegal': {'lat_range': (12.3, 16.7), 'lon_range': (-17.5, -11.3)},
-        'Kenya': {'lat_range': (-4.7, 5.5), 'lon_range': (33.9, 41.9)},
-        'Tanzania': {'lat_range': (-11.7, -0.9), 'lon_range': (29.3, 40.3)},
-        'Mozambique': {'lat_range': (-26.9, -10.5), 'lon_range': (30.2, 40.8)},
-        'Madagascar': {'lat_range': (-25.6, -11.9), 'lon_range': (43.2, 50.5)},
-        'Australia': {'lat_range': (-43.6, -10.7), 'lon_range': (113.3, 153.6)},
-        'New Zealand': {'lat_range': (-47.3, -34.4), 'lon_range': (166.5, 178.6)},
-        'Papua New Guinea': {'lat_range': (-12.0, -1.0), 'lon_range': (140.8, 159.9)},
-        'Fiji': {'lat_range': (-20.7, -16.0), 'lon_range': (177.0, -178.1)},
-        'Solomon Islands': {'lat_range': (-11.9, -5.3), 'lon_range': (155.5, 166.9)},
-        'Vanuatu': {'lat_range': (-20.2, -13.1), 'lon_range': (166.5, 170.2)},
-        'Samoa': {'lat_range': (-14.0, -13.4), 'lon_range': (-172.8, -171.4)},
-        'Tonga': {'lat_range': (-24.0, -15.6), 'lon_range': (-179.1, -173.9)},
-        'Kiribati': {'lat_range': (-4.7, 4.7), 'lon_range': (-174.5, -150.2)},
-        'Marshall Islands': {'lat_range': (4.6, 14.7), 'lon_range': (160.8, 172.0)},
-        'Micronesia': {'lat_range': (1.0, 10.1), 'lon_range': (137.3, 163.0)},
-        'Palau': {'lat_range': (2.9, 8.2), 'lon_range': (131.1, 134.7)},
-        'Tuvalu': {'lat_range': (-10.8, -5.6), 'lon_range': (176.0, 179.9)},
-        'Nauru': {'lat_range': (-0.6, -0.5), 'lon_range': (166.9, 166.9)}
+    # Generate people count
+    adults = rng.integers(1, 51, n)
+    children = rng.integers(0, np.minimum(20, adults // 2) + 1)
+    
+    # Generate cleanup metrics
+    pounds = np.round(0.1 + (100.0 - 0.1) * rng.random(n), 2)
+    miles = np.round(0.01 + (5.0 - 0.01) * rng.random(n), 4)
+    bags = rng.integers(0, 21, n)
+    
+    # Generate trash item counts, one column per item
+    item_maxima = np.array([maximum for _, maximum in TRASH_ITEM_RANGES])
+    item_counts = rng.integers(0, item_maxima + 1, size=(n, len(TRASH_ITEM_RANGES)))
+    
+    zones = np.array([f"{region}, {country}" for region in regions])[region_idx]
+    cleanup_ids = 'GLOBAL' + pd.Series(np.arange(start_id, start_id + n)).astype(str).str.zfill(6)
+    gps = format_gps(lat, lon)
+    
+    columns = {
+        'Cleanup ID': cleanup_ids.to_numpy(),
+        'Zone': zones,
+        'State': zones,
+        'Country': np.full(n, country, dtype=object),
+        'GPS': gps.to_numpy(),
+        'lat': lat,
+        'lon': lon,
+        'Cleanup Type': np.array(CLEANUP_TYPES)[rng.integers(0, len(CLEANUP_TYPES), n)],
+        'Cleanup Date': cleanup_dates,
+        'Group Name': group_names[group_idx],
+        'Adults': adults,
+        'Children': children,
+        'People': adults + children,
+        'Pounds': pounds,
+        'Miles': miles,
+        '# of bags': bags
     }
+    for j, (item, _) in enumerate(TRASH_ITEM_RANGES):
+        columns[item] = item_counts[:, j]
+    columns['Total Items Collected'] = item_counts.sum(axis=1)
     
-    if country in country_coords:
-        lat_range = country_coords[country]['lat_range']
-        lon_range = country_coords[country]['lon_range']
+    return pd.DataFrame(columns)
+
+def generate_coordinates_for_country(country, region):
+    """Generate realistic GPS coordinates for a country/region"""
+    
+    if country in COUNTRY_COORDS:
+        lat_range = COUNTRY_COORDS[country]['lat_range']
+        lon_range = COUNTRY_COORDS[country]['lon_range']
         
         lat = random.uniform(lat_range[0], lat_range[1])
         lon = random.uniform(lon_range[0], lon_range[1])
@@ -263,13 +426,12 @@ def generate_coordinates_for_country(country, region):
         # Default fallback
         return round(random.uniform(-60, 60), 6), round(random.uniform(-180, 180), 6)
 
-def generate_single_cleanup_record(cleanup_id, country, region, lat, lon):
+def generate_single_cleanup_record(cleanup_id, country, region, lat, lon, end_date=DEFAULT_END_DATE):
     """Generate a single cleanup record with realistic data"""
     
-    # Generate cleanup date (random date in the last 2 years)
-    start_date = datetime.now() - timedelta(days=730)
-    end_date = datetime.now()
-    random_date = start_date + timedelta(days=random.randint(0, 730))
+    # Generate cleanup date (random date in the 2 years up to end_date)
+    start_date = end_date - timedelta(days=DATE_WINDOW_DAYS)
+    random_date = start_date + timedelta(days=random.randint(0, DATE_WINDOW_DAYS))
     cleanup_date = random_date.strftime('%m/%d/%Y')
     
     # Generate group name
@@ -357,6 +519,8 @@ def generate_single_cleanup_record(cleanup_id, country, region, lat, lon):
         'State': f"{region}, {country}",
         'Country': country,
         'GPS': f"{lat}, {lon}",
+        'lat': lat,
+        'lon': lon,
         'Cleanup Type': random.choice(['Land (beach, shoreline and inland)', 'Water (boat, kayak, paddleboard)', 'Underwater (diving)']),
         'Cleanup Date': cleanup_date,
         'Group Name': group_name,
@@ -416,20 +580,42 @@ def generate_single_cleanup_record(cleanup_id, country, region, lat, lon):
     }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the synthetic global ocean cleanup dataset")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="Draw whole columns per country with numpy instead of one record at a time")
+    parser.add_argument('--sites-multiplier', type=int, default=1,
+                        help="Generate this many times the usual sites per country (e.g. 10-100 for load testing)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Generate countries in this many worker processes (implies --vectorized)")
+    parser.add_argument('--format', choices=list(STORAGE_FORMATS), default=DEFAULT_FORMAT,
+                        help="Storage format of the generated datasets")
+    parser.add_argument('--end-date', type=lambda text: datetime.strptime(text, '%m/%d/%Y'),
+                        default=DEFAULT_END_DATE,
+                        help=f"Last possible cleanup date, MM/DD/YYYY (default {DEFAULT_END_DATE:%m/%d/%Y})")
+    args = parser.parse_args()
+    
     print("Generating global ocean cleanup dataset...")
     print("This may take several minutes due to the large dataset size...")
     
     # Set random seed for reproducibility
-    random.seed(42)
-    np.random.seed(42)
+    random.seed(args.seed)
+    np.random.seed(args.seed)
     
     # Generate the data
-    df = generate_global_cleanup_data()
+    df = generate_global_cleanup_data(
+        vectorized=args.vectorized,
+        sites_multiplier=args.sites_multiplier,
+        seed=args.seed,
+        workers=args.workers,
+        fmt=args.format,
+        end_date=args.end_date
+    )
     
     print(f"\nDataset Summary:")
     print(f"Total records: {len(df)}")
     print(f"Countries: {df['Country'].nunique()}")
-    print(f"Date range: {df['Cleanup Date'].min()} to {df['Cleanup Date'].max()}")
+    print(f"Date range: {format_cleanup_date(df['Cleanup Date'].min())} to {format_cleanup_date(df['Cleanup Date'].max())}")
     print(f"Total people involved: {df['People'].sum():,}")
     print(f"Total pounds collected: {df['Pounds'].sum():,.2f}")
     print(f"Total items collected: {df['Total Items Collected'].sum():,}")
@@ -0,0 +1,79 @@
+"""
+Shared codec for the "lat, lon" GPS column used throughout the cleanup data
+
+The GPS string is parsed once, vectorized, into float64 lat/lon columns so
+downstream scripts read numbers instead of splitting strings row by row.
+"""
+
+import numpy as np
+import pandas as pd
+
+GPS_COLUMN = 'GPS'
+LAT_COLUMN = 'lat'
+LON_COLUMN = 'lon'
+
+def parse_gps_column(gps):
+    """
+    Parse a Series of "lat, lon" strings
+
+    Returns a DataFrame (same index) with float64 lat/lon columns and a
+    boolean valid column. Missing, malformed and out-of-range pairs are
+    invalid and get NaN coordinates.
+    """
+    gps = pd.Series(gps)
+    parts = gps.astype('string').str.split(',', expand=True)
+
+    if parts.shape[1] < 2:
+        lat = pd.Series(np.nan, index=gps.index)
+        lon = pd.Series(np.nan, index=gps.index)
+        extra = pd.Series(False, index=gps.index)
+    else:
+        lat = pd.to_numeric(parts[0].str.strip(), errors='coerce').astype(np.float64)
+        lon = pd.to_numeric(parts[1].str.strip(), errors='coerce').astype(np.float64)
+        extra = parts.iloc[:, 2:].notna().any(axis=1) if parts.shape[1] > 2 else pd.Series(False, index=gps.index)
+
+    valid = (lat.between(-90, 90) & lon.between(-180, 180) & ~extra).to_numpy(dtype=bool)
+
+    return pd.DataFrame({
+        LAT_COLUMN: np.where(valid, lat, np.nan),
+        LON_COLUMN: np.where(valid, lon, np.nan),
+        'valid': valid
+    }, index=gps.index)
+
+def format_gps(lat, lon, index=None):
+    """
+    Build "lat, lon" strings from numeric arrays, matching f"{lat}, {lon}"
+    """
+    return (pd.Series(lat, index=index, dtype=np.float64).astype(str) + ', ' +
+            pd.Series(lon, index=index, dtype=np.float64).astype(str))
+
+def set_lat_lon_columns(df, lat, lon):
+    """
+    Store numeric lat/lon columns on df, placed right after GPS when first added
+    """
+    for offset, (name, values) in enumerate(((LAT_COLUMN, lat), (LON_COLUMN, lon)), 1):
+        values = np.asarray(values, dtype=np.float64)
+        if name in df.columns:
+            df[name] = values
+        elif GPS_COLUMN in df.columns:
+            df.insert(df.columns.get_loc(GPS_COLUMN) + offset, name, values)
+        else:
+            df[name] = values
+    return df
+
+def ensure_lat_lon(df):
+    """
+    Make sure df has numeric lat/lon columns, parsing GPS only if they are missing
+
+    Returns df; rows whose GPS is invalid have NaN lat/lon.
+    """
+    if LAT_COLUMN in df.columns and LON_COLUMN in df.columns:
+        return df
+
+    parsed = parse_gps_column(df[GPS_COLUMN])
+    return set_lat_lon_columns(df, parsed[LAT_COLUMN], parsed[LON_COLUMN])
+
+def valid_coordinates_mask(df):
+    """Boolean mask of rows with usable lat/lon"""
+    ensure_lat_lon(df)
+    return (df[LAT_COLUMN].notna() & df[LON_COLUMN].notna()).to_numpy()
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Incremental ingestion of new cleanup records into a partitioned cost store
+
+A batch of records in the generator's schema is validated, gets its GPS /
+lat / lon fields and its cost columns (OceanCleanupCostCalculator) computed
+for that batch only, and is appended as one Parquet file to a store
+partitioned by ingest date:
+
+    data/cleanup_store/
+        ingest_date=2026-10-17/<batch>.parquet
+        _manifest.json                  rates, aggregates file, ID buckets, commit generation, pending batch
+        _batches/<fingerprint>.json     each batch's file, date range and row counts
+        _country_aggregates-<batch>.parquet   running per-country sums (CostAggregator)
+        _ids/<bucket>-<batch>.feather   stored Cleanup IDs, in ID_BUCKETS buckets by ID hash
+        _rejected/<batch>.csv           rows that failed validation, with the reason
+        _lock                           held by the ingest in progress
+
+The per-country sums are updated with the batch alone and rewritten, and
+data/country_cost_analysis.csv is regenerated from them. Rows whose Cleanup
+ID is already stored are rejected, so a resubmitted batch does not count
+the same cleanups twice; the check reads and rewrites only the ID buckets
+the batch's IDs hash to. An ingest therefore costs time in proportion to
+the batch, not the store (until a batch spans every bucket, at which point
+it touches each bucket's 1/ID_BUCKETS of the IDs once).
+
+The manifest keeps a fixed set of fields and is replaced last. A batch
+entry counts only once the manifest's generation reaches its seq, so an
+interrupted ingest leaves the store as it was; the manifest names the entry
+being written, and the next ingest discards it if it was never committed.
+Ingests hold a lock on the store, so concurrent ones run one after the
+other. A batch already ingested (same content) is skipped. Reads for a
+Cleanup Date range skip the batches whose date range does not overlap it.
+
+Usage:
+    python ingest_cleanups.py data/global_ocean_cleanup_data_with_costs.parquet   # seed with the full dataset
+    python ingest_cleanups.py new_reports.csv [more.csv ...] [--store DIR] [--rates FILE --scenario NAME]
+    python ingest_cleanups.py --rebuild       # recompute the aggregates and ID buckets from every stored batch
+"""
+
+import argparse
+import contextlib
+import datetime
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from add_costs_to_existing_data import REQUIRED_COLUMN_DEFAULTS, fill_missing_required_columns
+from cleanup_schema import DATE_COLUMN, apply_cleanup_schema, parse_cleanup_dates
+from cost_aggregation import COUNTRY_ANALYSIS_FILE, CostAggregator, country_cost_table
+from cost_calculator import OceanCleanupCostCalculator, add_cost_columns_to_dataframe
+from data_storage import load_dataset, save_dataset
+from gps_codec import GPS_COLUMN, LAT_COLUMN, LON_COLUMN, format_gps, parse_gps_column, set_lat_lon_columns
+from instrumentation import instrumented, note_frame
+from verify_global_data import NUMERIC_COLUMN_RANGES
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+STORE_DIR = 'data/cleanup_store'
+MANIFEST_FILE = '_manifest.json'
+REJECTED_DIR = '_rejected'
+IDS_DIR = '_ids'
+BATCHES_DIR = '_batches'
+LOCK_FILE = '_lock'
+# Layout of _manifest.json; 2 moved the batch list to _batches/ and added the ID buckets
+STORE_VERSION = 2
+ID_BUCKETS = 256
+PARTITION_KEY = 'ingest_date'
+
+# Columns every batch must have (GPS may be given as lat/lon instead)
+REQUIRED_COLUMNS = ['Cleanup ID', 'Country', DATE_COLUMN]
+
+def batch_fingerprint(df):
+    """Content hash of a batch, used to skip re-ingesting the same records"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    columns = '\t'.join(map(str, df.columns)).encode('utf-8')
+    return hashlib.sha256(columns + row_hashes.tobytes()).hexdigest()[:16]
+
+def normalize_ids(ids):
+    """Cleanup IDs as stripped strings (missing stays missing), the form they are stored and compared in"""
+    return ids.astype('string').str.strip()
+
+def id_buckets(ids):
+    """ID bucket (0 .. ID_BUCKETS - 1) of each normalized Cleanup ID, from a CRC-32 that is stable across runs"""
+    return np.fromiter((zlib.crc32(value.encode('utf-8')) % ID_BUCKETS for value in ids),
+                       dtype=np.int64, count=len(ids))
+
+def string_array(ids):
+    """pyarrow string array of normalized IDs (missing IDs become nulls)"""
+    return pa.array(ids.to_numpy(dtype=object, na_value=None), type=pa.string())
+
+@contextlib.contextmanager
+def exclusive_lock(path):
+    """Hold an exclusive lock on the file at path for the block, waiting while another process holds it"""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def validate_batch(df, stored_ids=None):
+    """
+    Split a batch into (valid rows, rejected rows)
+
+    Rejected rows get a reject_reason: missing ID or country, an ID repeated
+    in the batch or in stored_ids (a pyarrow string array of stored IDs; the
+    store passes those of the buckets the batch's IDs fall in), an
+    unparseable date, invalid coordinates, a missing cost input (People,
+    Pounds, Miles, # of bags) or a numeric value that is not a number or
+    outside NUMERIC_COLUMN_RANGES. IDs are compared after normalize_ids.
+    Valid rows come back with normalized Cleanup IDs, parsed dates, numeric
+    columns and GPS/lat/lon filled in. Raises ValueError when required
+    columns are missing altogether.
+    """
+    has_gps = GPS_COLUMN in df.columns
+    has_lat_lon = LAT_COLUMN in df.columns and LON_COLUMN in df.columns
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if not has_gps and not has_lat_lon:
+        missing.append(f"{GPS_COLUMN} (or {LAT_COLUMN}/{LON_COLUMN})")
+    if missing:
+        raise ValueError(f"Batch is missing required columns: {', '.join(missing)}")
+
+    df = df.reset_index(drop=True)
+    reasons = pd.Series('', index=df.index, dtype=object)
+
+    def reject(mask, reason):
+        reasons[np.asarray(mask) & (reasons == '').to_numpy()] = reason
+
+    # One normalized form for the in-batch and the store checks, and for the stored rows
+    ids = normalize_ids(df['Cleanup ID'])
+    missing_ids = (ids.fillna('') == '').to_numpy()
+    reject(missing_ids, 'missing Cleanup ID')
+    reject(df['Country'].isna(), 'missing Country')
+    reject(ids.duplicated(keep='first').to_numpy() & ~missing_ids, 'Cleanup ID repeated in batch')
+    if stored_ids is not None:
+        # The batch's IDs are hashed and the stored ones scanned (Series.isin of Arrow strings
+        # builds a Python list of every stored ID)
+        batch_ids = string_array(ids)
+        already_stored = stored_ids.filter(pc.is_in(stored_ids, value_set=batch_ids))
+        reject(pc.is_in(batch_ids, value_set=already_stored).to_numpy(zero_copy_only=False),
+               'Cleanup ID already stored')
+
+    dates = parse_cleanup_dates(df[DATE_COLUMN])
+    reject(dates.isna(), f"invalid {DATE_COLUMN}")
+
+    if has_gps:
+        gps = parse_gps_column(df[GPS_COLUMN])
+        lat, lon = gps[LAT_COLUMN], gps[LON_COLUMN]
+    else:
+        lat = pd.to_numeric(df[LAT_COLUMN], errors='coerce')
+        lon = pd.to_numeric(df[LON_COLUMN], errors='coerce')
+    reject(~(lat.between(-90, 90) & lon.between(-180, 180)), 'invalid coordinates')
+
+    numeric = {}
+    for col in [col for col in NUMERIC_COLUMN_RANGES if col in df.columns and col not in (LAT_COLUMN, LON_COLUMN)]:
+        values = pd.to_numeric(df[col], errors='coerce')
+        low, high = NUMERIC_COLUMN_RANGES[col]
+        reject(values.isna() & df[col].notna(), f"{col} is not a number")
+        if col in REQUIRED_COLUMN_DEFAULTS:
+            reject(values.isna(), f"missing {col}")
+        out_of_range = pd.Series(False, index=df.index)
+        if low is not None:
+            out_of_range |= values.lt(low)
+        if high is not None:
+            out_of_range |= values.gt(high)
+        reject(out_of_range, f"{col} out of range")
+        numeric[col] = values
+
+    valid_mask = (reasons == '').to_numpy()
+    rejected = df[~valid_mask].assign(reject_reason=reasons[~valid_mask])
+
+    valid = df[valid_mask].copy()
+    valid['Cleanup ID'] = ids[valid_mask]
+    for col, values in numeric.items():
+        valid[col] = values[valid_mask]
+    valid[DATE_COLUMN] = dates[valid_mask]
+    set_lat_lon_columns(valid, lat[valid_mask], lon[valid_mask])
+    if not has_gps:
+        valid.insert(valid.columns.get_loc(LAT_COLUMN), GPS_COLUMN,
+                     format_gps(valid[LAT_COLUMN], valid[LON_COLUMN], valid.index))
+    return valid.reset_index(drop=True), rejected
+
+def _write_json(path, data):
+    """Replace a JSON file atomically"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.json', dir=directory)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+class CleanupStore:
+    """
+    Append-only Parquet store of costed cleanup records, partitioned by ingest date, with running country sums
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        self.manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+
+    def _path(self, *parts):
+        return os.path.join(self.store_dir, *parts)
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Exclusive lock on the store, held by ingests, rebuilds and orphan removal"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        with exclusive_lock(self._path(LOCK_FILE)):
+            yield
+
+    def _read_manifest_file(self):
+        if not os.path.isfile(self.manifest_path):
+            return {'version': STORE_VERSION, 'rates': None, 'aggregates': None, 'generation': 0,
+                    'id_buckets': {}, 'pending': None}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def read_manifest(self):
+        """The store's manifest; raises ValueError for a store written in an older layout"""
+        manifest = self._read_manifest_file()
+        if manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"{self.store_dir} uses an older store layout; "
+                             "run ingest_cleanups.py --rebuild to upgrade it")
+        return manifest
+
+    def batches(self, manifest=None):
+        """Entries of the committed batches, oldest first"""
+        manifest = manifest or self.read_manifest()
+        entries = []
+        for path in glob.glob(self._path(BATCHES_DIR, '*.json')):
+            with open(path) as f:
+                entry = json.load(f)
+            # Entries past the manifest's generation belong to an ingest that did not commit
+            if entry['seq'] <= manifest['generation']:
+                entries.append(entry)
+        return sorted(entries, key=lambda entry: entry['seq'])
+
+    def _committed_batch(self, fingerprint, manifest):
+        """Entry of the committed batch with this fingerprint, or None"""
+        path = self._path(BATCHES_DIR, f"{fingerprint}.json")
+        if not os.path.isfile(path):
+            return None
+        with open(path) as f:
+            entry = json.load(f)
+        return entry if entry['seq'] <= manifest['generation'] else None
+
+    def _discard_pending(self, manifest):
+        """Delete the entry of an ingest that was interrupted before its commit, so its seq can be reused"""
+        if manifest.get('pending') and os.path.isfile(self._path(manifest['pending'])):
+            with open(self._path(manifest['pending'])) as f:
+                if json.load(f)['seq'] > manifest['generation']:
+                    os.remove(self._path(manifest['pending']))
+        manifest['pending'] = None
+
+    def aggregator(self, manifest=None):
+        """The stored running sums as a CostAggregator (empty for a new store)"""
+        manifest = manifest or self.read_manifest()
+        if not manifest['aggregates']:
+            return CostAggregator()
+        return CostAggregator.from_frame(pd.read_parquet(self._path(manifest['aggregates'])))
+
+    def read_id_buckets(self, buckets, manifest=None):
+        """{bucket: pyarrow string array of the stored Cleanup IDs in it} for the given buckets"""
+        manifest = manifest or self.read_manifest()
+        found = {}
+        for bucket in buckets:
+            path = manifest['id_buckets'].get(f"{bucket:02x}")
+            found[bucket] = (feather.read_table(self._path(path)).column(0).combine_chunks() if path
+                             else pa.array([], type=pa.string()))
+        return found
+
+    def _write_id_buckets(self, bucket_ids, new_ids, name):
+        """
+        Write the buckets of new_ids (normalized IDs), each merged with its stored IDs from bucket_ids
+
+        Returns {bucket key: file} of the written files, for the manifest.
+        """
+        written = {}
+        if len(new_ids) == 0:
+            return written
+        os.makedirs(self._path(IDS_DIR), exist_ok=True)
+        buckets = id_buckets(new_ids)
+        new_ids = string_array(new_ids)
+        for bucket in np.unique(buckets):
+            stored = bucket_ids.get(bucket, pa.array([], type=pa.string()))
+            merged = pa.concat_arrays([stored, new_ids.filter(pa.array(buckets == bucket))])
+            # Uncompressed Arrow files: a bucket is a few thousand IDs, where Parquet's per-file cost dominates
+            path = f"{IDS_DIR}/{bucket:02x}-{name}.feather"
+            feather.write_feather(pa.table({'Cleanup ID': merged.take(pc.array_sort_indices(merged))}),
+                                  self._path(path), compression='uncompressed')
+            written[f"{bucket:02x}"] = path
+        return written
+
+    def files(self, start=None, end=None):
+        """Data files of the ingested batches, optionally only those with Cleanup Dates in [start, end]"""
+        # A batch whose rows were all rejected has no file
+        batches = [batch for batch in self.batches() if batch['file']]
+        if start is not None:
+            batches = [batch for batch in batches if batch['last_date'] >= pd.Timestamp(start).isoformat()]
+        if end is not None:
+            batches = [batch for batch in batches if batch['first_date'] <= pd.Timestamp(end).isoformat()]
+        return [self._path(batch['file']) for batch in batches]
+
+    def load(self, columns=None, start=None, end=None):
+        """
+        Read the stored records (optionally some columns / Cleanup Dates in [start, end]) as one frame
+
+        Batches are read one by one and their column types unified, since
+        categories and integer widths can differ from batch to batch.
+        """
+        filters = []
+        if start is not None:
+            filters.append((DATE_COLUMN, '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append((DATE_COLUMN, '<=', pd.Timestamp(end)))
+        tables = [pq.read_table(path, columns=columns, filters=filters or None, partitioning=None)
+                  for path in self.files(start, end)]
+        if not tables:
+            return pd.DataFrame(columns=columns)
+        df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+        return apply_cleanup_schema(df)
+
+    @instrumented('ingest_batch')
+    def ingest(self, records, cost_calculator=None, source=None,
+               country_analysis_file=COUNTRY_ANALYSIS_FILE):
+        """
+        Validate, cost and append a batch of records (DataFrame, list of dicts or dataset path)
+
+        Returns a summary dict (batch id, rows stored and rejected, file
+        written), or None when the same batch was already ingested. Holds
+        the store lock, so concurrent ingests are applied one at a time.
+        """
+        if isinstance(records, str):
+            source = source or records
+            records = load_dataset(records, apply_schema=False)
+        elif not isinstance(records, pd.DataFrame):
+            records = pd.DataFrame.from_records(list(records))
+
+        if cost_calculator is None:
+            cost_calculator = OceanCleanupCostCalculator()
+        with self.lock():
+            return self._ingest(records, cost_calculator, source, country_analysis_file)
+
+    def _ingest(self, records, cost_calculator, source, country_analysis_file):
+        manifest = self.read_manifest()
+        if manifest['rates'] is not None and manifest['rates'] != cost_calculator.rates:
+            raise ValueError(f"{self.store_dir} is priced with different rates; ingest with the same rates "
+                             "or re-price the store with add_costs_to_existing_data.py")
+
+        fingerprint = batch_fingerprint(records)
+        if self._committed_batch(fingerprint, manifest):
+            print(f"⏭️  Batch {source or fingerprint} was already ingested; skipping")
+            return None
+
+        self._discard_pending(manifest)
+        entry_path = f"{BATCHES_DIR}/{fingerprint}.json"
+        _write_json(self.manifest_path, dict(manifest, pending=entry_path))
+
+        now = datetime.datetime.now()
+        batch_id = now.strftime('%Y%m%dT%H%M%S%f') + '-' + fingerprint[:8]
+        # Only the ID buckets the batch's IDs fall in are read
+        batch_ids = normalize_ids(records['Cleanup ID']).dropna() if 'Cleanup ID' in records.columns else []
+        bucket_ids = self.read_id_buckets(np.unique(id_buckets(batch_ids)), manifest)
+        stored_ids = pa.concat_arrays(list(bucket_ids.values())) if bucket_ids else pa.array([], type=pa.string())
+        valid, rejected = validate_batch(records, stored_ids)
+        valid = apply_cleanup_schema(fill_missing_required_columns(valid, warn=False))
+        costed = add_cost_columns_to_dataframe(valid, cost_calculator)
+        # A batch that arrives already costed is re-priced: keep only the new cost columns
+        costed = costed.loc[:, ~costed.columns.duplicated(keep='last')]
+
+        path = None
+        if len(costed) > 0:
+            path = f"{PARTITION_KEY}={now.date().isoformat()}/{batch_id}.parquet"
+            os.makedirs(self._path(os.path.dirname(path)), exist_ok=True)
+            save_dataset(costed, self._path(path), 'parquet')
+        if len(rejected) > 0:
+            os.makedirs(self._path(REJECTED_DIR), exist_ok=True)
+            rejected.to_csv(self._path(REJECTED_DIR, f"{batch_id}.csv"), index=False)
+        id_files = self._write_id_buckets(bucket_ids, normalize_ids(costed['Cleanup ID']), batch_id)
+
+        # Fold the batch into the running sums and save them under a new name...
+        aggregator = self.aggregator(manifest)
+        aggregator.update(costed)
+        aggregates = f"_country_aggregates-{batch_id}.parquet"
+        aggregator.to_frame().to_parquet(self._path(aggregates), index=False)
+
+        seq = manifest['generation'] + 1
+        os.makedirs(self._path(BATCHES_DIR), exist_ok=True)
+        _write_json(self._path(entry_path), {
+            'seq': seq,
+            'batch': batch_id,
+            'fingerprint': fingerprint,
+            'source': source,
+            'rows': len(costed),
+            'rejected': len(rejected),
+            'file': path,
+            'first_date': costed[DATE_COLUMN].min().isoformat() if len(costed) else None,
+            'last_date': costed[DATE_COLUMN].max().isoformat() if len(costed) else None,
+            'ingested': now.isoformat(timespec='seconds')
+        })
+
+        # ...so replacing the manifest commits the batch, its sums and its ID buckets together
+        replaced = [manifest['aggregates']] + [manifest['id_buckets'].get(key) for key in id_files]
+        manifest.update(rates=cost_calculator.rates, aggregates=aggregates, generation=seq, pending=None)
+        manifest['id_buckets'].update(id_files)
+        _write_json(self.manifest_path, manifest)
+        for old_path in replaced:
+            if old_path:
+                os.remove(self._path(old_path))
+
+        if country_analysis_file and aggregator.has_groups:
+            country_cost_table(aggregator).to_csv(country_analysis_file)
+        note_frame(costed)
+        return {'batch': batch_id, 'rows': len(costed), 'rejected': len(rejected), 'file': path}
+
+    def rebuild(self, country_analysis_file=COUNTRY_ANALYSIS_FILE):
+        """
+        Recompute the running sums and ID buckets from every stored file (one file in memory at a time)
+
+        Also upgrades a store written in an older layout. Returns the
+        rebuilt CostAggregator.
+        """
+        with self.lock():
+            manifest = self._read_manifest_file()
+            if manifest.get('version') != STORE_VERSION:
+                manifest = self._upgrade(manifest)
+            return self._rebuild(manifest, country_analysis_file)
+
+    def _upgrade(self, old_manifest):
+        """Move the batch list of a layout 1 manifest to _batches/ entries; the caller rebuilds the rest"""
+        os.makedirs(self._path(BATCHES_DIR), exist_ok=True)
+        for seq, batch in enumerate(old_manifest.get('batches', []), start=1):
+            entry = {key: value for key, value in batch.items() if key != 'ids'}
+            _write_json(self._path(BATCHES_DIR, f"{batch['fingerprint']}.json"), {'seq': seq, **entry})
+        return {'version': STORE_VERSION, 'rates': old_manifest.get('rates'),
+                'aggregates': old_manifest.get('aggregates'), 'generation': len(old_manifest.get('batches', [])),
+                'id_buckets': {}, 'pending': None}
+
+    def _rebuild(self, manifest, country_analysis_file):
+        aggregator = CostAggregator()
+        ids = []
+        for path in [self._path(batch['file']) for batch in self.batches(manifest) if batch['file']]:
+            df = apply_cleanup_schema(pd.read_parquet(path, partitioning=None))
+            aggregator.update(df)
+            ids.append(normalize_ids(df['Cleanup ID']))
+
+        name = f"rebuilt-{datetime.datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+        aggregates = f"_country_aggregates-{name}.parquet"
+        aggregator.to_frame().to_parquet(self._path(aggregates), index=False)
+        id_files = self._write_id_buckets({}, pd.concat(ids, ignore_index=True) if ids else [], name)
+
+        replaced = [manifest['aggregates']] + list(manifest['id_buckets'].values())
+        manifest.update(aggregates=aggregates, id_buckets=id_files)
+        _write_json(self.manifest_path, manifest)
+        for old_path in replaced:
+            if old_path and os.path.exists(self._path(old_path)):
+                os.remove(self._path(old_path))
+
+        if country_analysis_file and aggregator.has_groups:
+            country_cost_table(aggregator).to_csv(country_analysis_file)
+        return aggregator
+
+    def remove_orphans(self):
+        """Delete files left by interrupted ingests: data, ID, aggregate and batch files the manifest does not reach"""
+        with self.lock():
+            manifest = self.read_manifest()
+            batches = self.batches(manifest)
+            listed = {self._path(batch['file']) for batch in batches if batch['file']}
+            listed |= {self._path(BATCHES_DIR, f"{batch['fingerprint']}.json") for batch in batches}
+            listed |= {self._path(path) for path in manifest['id_buckets'].values()}
+            if manifest['aggregates']:
+                listed.add(self._path(manifest['aggregates']))
+            found = glob.glob(self._path(f"{PARTITION_KEY}=*", '*.parquet')) + \
+                glob.glob(self._path('_country_aggregates-*.parquet')) + \
+                glob.glob(self._path(IDS_DIR, '*.*')) + \
+                glob.glob(self._path(BATCHES_DIR, '*.json'))
+            orphans = [path for path in found if path not in listed]
+            for path in orphans:
+                os.remove(path)
+            return orphans
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest batches of new cleanup records into the cost store")
+    parser.add_argument('batches', nargs='*', help="CSV/Parquet/Feather files of new records, ingested in order")
+    parser.add_argument('--store', default=STORE_DIR, help="Store directory")
+    parser.add_argument('--country-analysis', default=COUNTRY_ANALYSIS_FILE,
+                        help="Per-country table regenerated after each batch")
+    parser.add_argument('--rates', default=None, help="JSON file with calculator rates and optional named scenarios")
+    parser.add_argument('--scenario', default=None, help="Scenario from the --rates file")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Recompute the aggregates and ID buckets from all stored batches (upgrading an "
+                             "older store) and drop orphaned files")
+    args = parser.parse_args()
+
+    store = CleanupStore(args.store)
+    if args.rebuild:
+        start = time.perf_counter()
+        aggregator = store.rebuild(args.country_analysis)
+        elapsed = time.perf_counter() - start
+        removed = store.remove_orphans()
+        print(f"🔁 Rebuilt aggregates and ID buckets of {aggregator.total_events:,} records in {elapsed:.2f}s"
+              + (f", removed {len(removed)} orphaned files" if removed else ''))
+        return
+    if not args.batches:
+        parser.error("give at least one batch file (or --rebuild)")
+
+    cost_calculator = None
+    if args.rates:
+        try:
+            cost_calculator = OceanCleanupCostCalculator.from_config(args.rates, args.scenario)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error loading rates: {e}")
+            sys.exit(1)
+
+    for batch_file in args.batches:
+        start = time.perf_counter()
+        try:
+            summary = store.ingest(batch_file, cost_calculator, country_analysis_file=args.country_analysis)
+        except FileNotFoundError:
+            print(f"❌ Batch file not found: {batch_file}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"❌ {batch_file}: {e}")
+            sys.exit(1)
+        if summary is None:
+            continue
+        print(f"📥 {batch_file}: stored {summary['rows']:,} records"
+              + (f", rejected {summary['rejected']:,} (see {args.store}/{REJECTED_DIR}/{summary['batch']}.csv)"
+                 if summary['rejected'] else '')
+              + f" in {time.perf_counter() - start:.2f}s")
+
+    aggregator = store.aggregator()
+    print(f"✅ Store {args.store}: {aggregator.total_events:,} records, "
+          f"total cost ${aggregator.total('total_cost'):,.2f}; country analysis in {args.country_analysis}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Stage-level timing and memory instrumentation for the pipeline scripts
+
+Wrap a stage with @instrumented('name') or `with stage('name'):` to record
+its wall time, rows processed, rows/sec, peak RSS and the pandas memory
+usage of the frame it produced. Tracing is off by default and the wrappers
+just call through; set CLEANUP_TRACE to turn it on without code changes:
+
+    CLEANUP_TRACE=1             one JSON object per stage on stderr
+    CLEANUP_TRACE=trace.jsonl   append one JSON object per stage to a file
+
+Frame memory is the shallow pandas figure (object columns count their
+pointers only); CLEANUP_TRACE_DEEP_MEMORY=1 also measures string contents,
+which scans every object column of every traced frame.
+
+Summarize a trace file with:
+    python instrumentation.py trace.jsonl
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from cleanup_schema import memory_usage_mb
+
+TRACE_ENV = 'CLEANUP_TRACE'
+DEEP_MEMORY_ENV = 'CLEANUP_TRACE_DEEP_MEMORY'
+
+_state = threading.local()
+_write_lock = threading.Lock()
+
+def trace_target():
+    """Where stage records go: None (tracing off), 'stderr' or a file path"""
+    value = os.environ.get(TRACE_ENV, '').strip()
+    if value.lower() in ('', '0', 'off', 'false', 'no'):
+        return None
+    if value.lower() in ('1', 'on', 'true', 'yes', 'stderr'):
+        return 'stderr'
+    return value
+
+def deep_memory_enabled():
+    """True when traced frame memory should include string contents"""
+    return os.environ.get(DEEP_MEMORY_ENV, '').strip().lower() in ('1', 'on', 'true', 'yes')
+
+def peak_rss_mb():
+    """High-water mark of this process's resident set size in megabytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kibibytes elsewhere
+    return peak / 1e6 if sys.platform == 'darwin' else peak * 1024 / 1e6
+
+def current_rss_mb():
+    """Current resident set size in megabytes (Linux only)"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / 1e6
+
+class StageRecord:
+    """Measurements of one stage run; rows and frame can be filled in by the stage"""
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.rows = None
+        self.frame = None
+
+    def to_dict(self, seconds, status, peak_before):
+        peak_after = peak_rss_mb()
+        frame_mb = None
+        if isinstance(self.frame, pd.DataFrame):
+            frame_mb = memory_usage_mb(self.frame, deep=deep_memory_enabled())
+        return {
+            'stage': self.name,
+            'parent': self.parent,
+            'status': status,
+            'seconds': round(seconds, 6),
+            'rows': self.rows,
+            'rows_per_sec': round(self.rows / seconds, 1) if self.rows is not None and seconds > 0 else None,
+            'rss_mb': current_rss_mb(),
+            'peak_rss_mb': peak_after,
+            'peak_rss_growth_mb': peak_after - peak_before if peak_after is not None else None,
+            'frame_mb': frame_mb,
+            'pid': os.getpid(),
+            'thread': threading.current_thread().name,
+            'timestamp': time.time()
+        }
+
+def _active_stages():
+    if not hasattr(_state, 'stack'):
+        _state.stack = []
+    return _state.stack
+
+def emit(record, target):
+    """Write one stage record as a JSON line to target"""
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock:
+        if target == 'stderr':
+            sys.stderr.write(line)
+        else:
+            with open(target, 'a') as f:
+                f.write(line)
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Time and measure the enclosed block as stage name
+
+    Yields the StageRecord (None when tracing is off) so the block can set
+    rows or frame; note_frame does the same from deeper in the call stack.
+    """
+    target = trace_target()
+    if target is None:
+        yield None
+        return
+
+    with _traced_stage(name, target) as record:
+        yield record
+
+@contextlib.contextmanager
+def _traced_stage(name, target):
+    """stage() once tracing is known to be on, emitting the record to target"""
+    stack = _active_stages()
+    record = StageRecord(name, stack[-1].name if stack else None)
+    stack.append(record)
+    peak_before = peak_rss_mb()
+    start = time.perf_counter()
+    status = 'error'
+    try:
+        yield record
+        status = 'ok'
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        emit(record.to_dict(seconds, status, peak_before), target)
+
+def note_frame(df=None, rows=None):
+    """Report the frame (and/or row count) the innermost running stage is working on"""
+    stack = _active_stages()
+    if not stack:
+        return
+    record = stack[-1]
+    if df is not None:
+        record.frame = df
+        record.rows = len(df)
+    if rows is not None:
+        record.rows = rows
+
+def instrumented(name):
+    """
+    Decorator form of stage()
+
+    Unless the function called note_frame itself, rows and frame memory are
+    taken from a returned DataFrame, otherwise from its first DataFrame
+    argument.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = trace_target()
+            if target is None:
+                return func(*args, **kwargs)
+
+            with _traced_stage(name, target) as record:
+                result = func(*args, **kwargs)
+                if record.rows is None:
+                    if isinstance(result, pd.DataFrame):
+                        note_frame(result)
+                    else:
+                        frames = [arg for arg in list(args) + list(kwargs.values()) if isinstance(arg, pd.DataFrame)]
+                        if frames:
+                            note_frame(frames[0])
+                return result
+        return wrapper
+    return decorator
+
+def load_trace(trace_file):
+    """Read a JSON-lines trace file into a DataFrame"""
+    with open(trace_file) as f:
+        return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+
+def main():
+    """Print per-stage totals from a trace file"""
+    parser = argparse.ArgumentParser(description="Summarize a stage trace written with CLEANUP_TRACE=<file>")
+    parser.add_argument('trace_file')
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace_file)
+    if trace.empty:
+        print(f"No stage records in {args.trace_file}")
+        return
+
+    summary = trace.groupby('stage', sort=False).agg(
+        runs=('seconds', 'size'),
+        seconds=('seconds', 'sum'),
+        rows=('rows', lambda rows: rows.sum(min_count=1)),
+        peak_rss_mb=('peak_rss_mb', 'max'),
+        frame_mb=('frame_mb', 'max')
+    )
+    summary['rows_per_sec'] = summary['rows'] / summary['seconds']
+
+    print(f"📊 Stage trace: {args.trace_file}")
+    print("=" * 80)
+    print(summary.round(3).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Nearest-neighbour classifier with a fast index for the Cleanup Type model
+
+FastKNNClassifier is a drop-in for the notebooks'
+KNeighborsClassifier(weights='distance', n_neighbors=4) with a choice of
+neighbour index:
+
+- 'ivf' (default, approximate): the training points are split into
+  n_lists k-means cells. A query is compared only against the points of its
+  n_probe nearest cells, with float32 BLAS products, and the chosen
+  neighbours' distances are recomputed exactly. KD and ball trees
+  degenerate to a near-full scan on the ~50 standardized count columns,
+  while the cell scan grows with n_probe / n_lists of the data.
+- 'brute', 'kd_tree', 'ball_tree' (exact): scikit-learn's NearestNeighbors.
+
+predict, predict_proba and kneighbors work through the query rows in
+batches of batch_size, on n_jobs threads (BLAS and the tree queries release
+the GIL).
+
+See benchmarks/knn_prediction.py for latency and accuracy against the
+brute-force KNeighborsClassifier.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.neighbors import NearestNeighbors
+
+INDEX_TYPES = ['ivf', 'brute', 'kd_tree', 'ball_tree']
+
+# Training points per k-means cell sampled to fit the IVF cells
+IVF_SAMPLE_PER_LIST = 64
+# Bytes of query x centroid distances computed at once when assigning cells
+CENTROID_BLOCK_BYTES = 64 * 1024 * 1024
+
+class FastKNNClassifier:
+    """
+    k-nearest-neighbour classifier over an IVF (inverted file) or scikit-learn index
+
+    n_lists defaults to sqrt(training rows) and n_probe to n_lists / 8;
+    n_probe = n_lists scans every cell and gives exact neighbours.
+    """
+
+    def __init__(self, n_neighbors=4, weights='distance', index='ivf', n_lists=None, n_probe=None,
+                 batch_size=1024, n_jobs=1, random_state=42):
+        if index not in INDEX_TYPES:
+            raise ValueError(f"Unknown index '{index}' (expected one of {', '.join(INDEX_TYPES)})")
+        if weights not in ('distance', 'uniform'):
+            raise ValueError(f"Unknown weights '{weights}' (expected 'distance' or 'uniform')")
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.index = index
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    @staticmethod
+    def _as_dense(X):
+        if scipy.sparse.issparse(X):
+            X = X.toarray()
+        return np.asarray(X, dtype=np.float64)
+
+    def fit(self, X, y):
+        """Index the training rows X (dense or sparse) with labels y"""
+        X = self._as_dense(X)
+        if len(X) < self.n_neighbors:
+            raise ValueError(f"Need at least n_neighbors={self.n_neighbors} training rows, got {len(X)}")
+        self.classes_, self._labels = np.unique(np.asarray(y), return_inverse=True)
+        self._fit_X = X
+
+        if self.index == 'ivf':
+            self._build_ivf(X)
+        else:
+            self._tree = NearestNeighbors(n_neighbors=self.n_neighbors, algorithm=self.index).fit(X)
+        return self
+
+    def _build_ivf(self, X):
+        """Fit the k-means cells and store the training points grouped by cell"""
+        n_lists = self.n_lists or max(1, int(round(np.sqrt(len(X)))))
+        self.n_lists_ = min(n_lists, len(X))
+        self.n_probe_ = min(self.n_probe or max(1, int(np.ceil(self.n_lists_ / 8))), self.n_lists_)
+
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        rng = np.random.default_rng(self.random_state)
+        sample_size = min(len(X), IVF_SAMPLE_PER_LIST * self.n_lists_)
+        sample = X32[np.sort(rng.choice(len(X), sample_size, replace=False))]
+        kmeans = MiniBatchKMeans(self.n_lists_, batch_size=4096, n_init=1, max_iter=20,
+                                 random_state=self.random_state).fit(sample)
+        self._centroids = kmeans.cluster_centers_.astype(np.float32)
+        self._centroid_norms = np.einsum('ij,ij->i', self._centroids, self._centroids)
+
+        cells = self._nearest_centroids(X32, 1)[:, 0]
+        self._list_ids = np.argsort(cells, kind='stable')
+        self._list_offsets = np.searchsorted(cells[self._list_ids], np.arange(self.n_lists_ + 1))
+        self._list_X = X32[self._list_ids]
+        self._list_norms = np.einsum('ij,ij->i', self._list_X, self._list_X)
+
+    def _nearest_centroids(self, X32, n):
+        """Indices of the n nearest k-means cells of each row (unordered)"""
+        block = max(1, CENTROID_BLOCK_BYTES // (4 * self.n_lists_))
+        nearest = []
+        for start in range(0, len(X32), block):
+            # ||x||^2 is the same for every cell of a row and does not change the ranking
+            distances = self._centroid_norms - 2 * X32[start:start + block] @ self._centroids.T
+            if n < self.n_lists_:
+                nearest.append(np.argpartition(distances, n - 1, axis=1)[:, :n].copy())
+            else:
+                nearest.append(np.broadcast_to(np.arange(self.n_lists_), distances.shape).copy())
+        return np.concatenate(nearest) if nearest else np.empty((0, n), dtype=np.intp)
+
+    def _ivf_candidates(self, Q32):
+        """Training positions of each query's k nearest points among its probed cells"""
+        k = self.n_neighbors
+        probes = self._nearest_centroids(Q32, self.n_probe_)
+
+        # Each (query, probe) pair fills its own k slots with that cell's best points
+        slot_d = np.full((len(Q32), self.n_probe_ * k), np.inf, dtype=np.float32)
+        slot_i = np.full((len(Q32), self.n_probe_ * k), -1, dtype=np.intp)
+        pair_query = np.repeat(np.arange(len(Q32)), self.n_probe_)
+        pair_slot = np.tile(np.arange(self.n_probe_) * k, len(Q32))
+        pair_cell = probes.ravel()
+        pair_order = np.argsort(pair_cell, kind='stable')
+        cell_bounds = np.searchsorted(pair_cell[pair_order], np.arange(self.n_lists_ + 1))
+
+        # One matrix product per probed cell covers every query probing it
+        for cell in np.flatnonzero(np.diff(cell_bounds)):
+            start, end = self._list_offsets[cell], self._list_offsets[cell + 1]
+            if start == end:
+                continue
+            pairs = pair_order[cell_bounds[cell]:cell_bounds[cell + 1]]
+            queries = pair_query[pairs]
+            distances = self._list_norms[start:end] - 2 * Q32[queries] @ self._list_X[start:end].T
+            kept = min(k, end - start)
+            if end - start > kept:
+                best = np.argpartition(distances, kept - 1, axis=1)[:, :kept]
+            else:
+                best = np.broadcast_to(np.arange(kept), (len(queries), kept))
+            columns = pair_slot[pairs][:, None] + np.arange(kept)
+            slot_d[queries[:, None], columns] = np.take_along_axis(distances, best, axis=1)
+            slot_i[queries[:, None], columns] = start + best
+
+        best = np.argpartition(slot_d, k - 1, axis=1)[:, :k] if slot_d.shape[1] > k else \
+            np.broadcast_to(np.arange(k), slot_d.shape)
+        return np.take_along_axis(slot_i, best, axis=1)
+
+    def _kneighbors_batch(self, Q):
+        """(distances, training positions) of the k nearest neighbours of each row of Q, nearest first"""
+        if self.index != 'ivf':
+            return self._tree.kneighbors(Q, n_neighbors=self.n_neighbors)
+
+        slots = self._ivf_candidates(np.ascontiguousarray(Q, dtype=np.float32))
+        found = slots >= 0
+        positions = np.where(found, self._list_ids[np.maximum(slots, 0)], 0)
+        # Exact float64 distances of the chosen neighbours; missing ones (fewer than k points probed) are inf
+        distances = np.sqrt(((self._fit_X[positions] - Q[:, None, :]) ** 2).sum(axis=2))
+        distances[~found] = np.inf
+        order = np.argsort(distances, axis=1, kind='stable')
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(positions, order, axis=1)
+
+    def _map_batches(self, func, Q):
+        """Apply func to batch_size row blocks of Q, on n_jobs threads, in order"""
+        starts = range(0, len(Q), self.batch_size)
+        n_jobs = (os.cpu_count() or 1) if self.n_jobs in (None, -1) else self.n_jobs
+        if n_jobs <= 1 or len(starts) <= 1:
+            return [func(Q[start:start + self.batch_size]) for start in starts]
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(lambda start: func(Q[start:start + self.batch_size]), starts))
+
+    def kneighbors(self, X):
+        """(distances, training row positions) of each row's n_neighbors nearest training rows"""
+        X = self._as_dense(X)
+        results = self._map_batches(self._kneighbors_batch, X)
+        if not results:
+            empty = np.empty((0, self.n_neighbors))
+            return empty, empty.astype(np.intp)
+        return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+    def _proba_batch(self, Q):
+        distances, positions = self._kneighbors_batch(Q)
+        return self._vote(distances, positions)
+
+    def _vote(self, distances, positions):
+        """Class probabilities from neighbour labels, weighted like KNeighborsClassifier"""
+        if self.weights == 'uniform':
+            weights = np.isfinite(distances).astype(np.float64)
+        else:
+            with np.errstate(divide='ignore'):
+                weights = 1.0 / distances
+            # A neighbour at distance 0 takes all the weight, as in scikit-learn
+            exact = distances == 0
+            exact_rows = exact.any(axis=1)
+            weights[exact_rows] = exact[exact_rows]
+
+        labels = self._labels[positions]
+        proba = np.zeros((len(distances), len(self.classes_)))
+        for i in range(len(self.classes_)):
+            proba[:, i] = np.where(labels == i, weights, 0).sum(axis=1)
+        totals = proba.sum(axis=1, keepdims=True)
+        np.divide(proba, totals, out=proba, where=totals > 0)
+        return proba
+
+    def predict_proba(self, X):
+        """Class probabilities of each row (columns follow classes_)"""
+        X = self._as_dense(X)
+        results = self._map_batches(self._proba_batch, X)
+        return np.concatenate(results) if results else np.empty((0, len(self.classes_)))
+
+    def predict(self, X):
+        """Most probable class of each row"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def score(self, X, y):
+        """Accuracy of predict(X) against y"""
+        return float(np.mean(self.predict(X) == np.asarray(y)))
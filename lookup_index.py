@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Persistent country/zone lookup index over a cleanup dataset
+
+build_lookup_index writes a copy of the dataset sorted by Country, Zone and
+Cleanup Date in small Parquet row groups, plus a JSON file with the
+[start, end) row offsets of every country and zone. A lookup then matches
+the query against the (few hundred) country/zone names, reads only the row
+groups covering the matching offsets and slices them, instead of loading
+and scanning the whole dataset. The index is rebuilt automatically when the
+source file changes.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from cleanup_schema import DATE_COLUMN, apply_cleanup_schema
+from data_storage import load_dataset, resolve_dataset_path, save_dataset
+
+LOOKUP_SORT_COLUMNS = ['Country', 'Zone', DATE_COLUMN]
+LOOKUP_ROW_GROUP_SIZE = 16384
+# Offsets file layout; files of another version are rebuilt (2: zones keyed by country and zone)
+LOOKUP_INDEX_VERSION = 2
+ZONE_KEY_SEPARATOR = '\t'
+
+def lookup_index_paths(source_file):
+    """(sorted data file, offsets file) of the lookup index for a resolved dataset path"""
+    stem = os.path.splitext(source_file)[0]
+    return f"{stem}.lookup.parquet", f"{stem}.lookup.json"
+
+def source_signature(source_file):
+    """Size and modification time identifying the source file version an index was built from"""
+    stat = os.stat(source_file)
+    return {'source': os.path.abspath(source_file), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def group_offsets(values):
+    """{value: [start, end)} for each run of equal values in a sorted column"""
+    values = np.asarray(values, dtype=object)
+    if len(values) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    return {str(values[start]): [int(start), int(end)] for start, end in zip(starts, ends)}
+
+def build_lookup_index(source_file):
+    """Sort the dataset for lookups and write the sorted copy and its offsets file"""
+    resolved = resolve_dataset_path(source_file)
+    if resolved is None:
+        raise FileNotFoundError(source_file)
+    data_file, offsets_file = lookup_index_paths(resolved)
+
+    df = load_dataset(resolved)
+    sort_columns = [col for col in LOOKUP_SORT_COLUMNS if col in df.columns]
+    # Sort on the labels so offsets follow name order, not category code order
+    keys = df[sort_columns].astype({col: str for col in sort_columns if col != DATE_COLUMN})
+    df = df.iloc[keys.sort_values(sort_columns, kind='stable').index.to_numpy()].reset_index(drop=True)
+    save_dataset(df, data_file, 'parquet', row_group_size=LOOKUP_ROW_GROUP_SIZE)
+
+    # Zone names repeat across countries, so zones are keyed by 'Country<TAB>Zone'
+    zone_keys = df['Country'].astype(str) + ZONE_KEY_SEPARATOR + df['Zone'].astype(str)
+    meta = {
+        **source_signature(resolved),
+        'version': LOOKUP_INDEX_VERSION,
+        'rows': len(df),
+        'countries': group_offsets(df['Country'].astype(str)),
+        'zones': group_offsets(zone_keys)
+    }
+    with open(offsets_file, 'w') as f:
+        json.dump(meta, f)
+    return LookupIndex(data_file, meta)
+
+def load_lookup_index(source_file, rebuild=True):
+    """
+    Open the lookup index of source_file, (re)building it if it is missing or stale
+
+    With rebuild=False a missing or stale index returns None.
+    """
+    resolved = resolve_dataset_path(source_file)
+    if resolved is None:
+        raise FileNotFoundError(source_file)
+    data_file, offsets_file = lookup_index_paths(resolved)
+
+    try:
+        with open(offsets_file) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        meta = None
+
+    signature = {**source_signature(resolved), 'version': LOOKUP_INDEX_VERSION}
+    fresh = (meta is not None and os.path.isfile(data_file) and
+             all(meta.get(key) == value for key, value in signature.items()))
+    if fresh:
+        return LookupIndex(data_file, meta)
+    return build_lookup_index(resolved) if rebuild else None
+
+def zone_name(key):
+    """Zone part of a 'Country<TAB>Zone' key of the offsets file"""
+    return key.split(ZONE_KEY_SEPARATOR, 1)[1]
+
+class RowGroupReader:
+    """
+    Reads rows of a Parquet file by position, touching only the row groups that hold them
+    """
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.parquet = pq.ParquetFile(data_file)
+        group_rows = [self.parquet.metadata.row_group(i).num_rows for i in range(self.parquet.num_row_groups)]
+        self.group_starts = np.concatenate([[0], np.cumsum(group_rows)])
+
+    def read_rows(self, positions, columns=None):
+        """Rows at file positions (ascending), reading only the row groups that hold them"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) == 0:
+            return apply_cleanup_schema(self.parquet.schema_arrow.empty_table().to_pandas())
+
+        groups = np.unique(np.searchsorted(self.group_starts, positions, side='right') - 1)
+        table = self.parquet.read_row_groups(groups.tolist(), columns=columns)
+        # File row numbers of the table we read
+        table_rows = np.concatenate([np.arange(self.group_starts[g], self.group_starts[g + 1]) for g in groups])
+        df = table.take(np.searchsorted(table_rows, positions)).to_pandas()
+        return apply_cleanup_schema(df)
+
+class LookupIndex(RowGroupReader):
+    """
+    Row offsets of each country and zone in a sorted Parquet copy of a dataset
+    """
+
+    def __init__(self, data_file, meta):
+        super().__init__(data_file)
+        self.meta = meta
+
+    @property
+    def countries(self):
+        return list(self.meta['countries'])
+
+    @property
+    def zones(self):
+        """Distinct zone names (a zone may appear under several countries)"""
+        return sorted({zone_name(key) for key in self.meta['zones']})
+
+    def match_countries(self, text):
+        """Country names containing text, case-insensitively"""
+        return [name for name in self.meta['countries'] if text.lower() in name.lower()]
+
+    def match_zones(self, text):
+        """'Country<TAB>Zone' keys of the zones whose name contains text, case-insensitively"""
+        return [key for key in self.meta['zones'] if text.lower() in zone_name(key).lower()]
+
+    def read_ranges(self, ranges, columns=None):
+        """Rows in the [start, end) offset ranges"""
+        positions = [np.arange(start, end) for start, end in sorted(ranges)]
+        return self.read_rows(np.concatenate(positions) if positions else [], columns)
+
+    def query(self, country=None, zone=None, start_date=None, end_date=None, columns=None):
+        """
+        Rows whose country and zone contain the given texts and whose date is in range
+
+        Dates are inclusive and may be anything pd.Timestamp accepts. A
+        date-only query has no offsets to use and reads the Cleanup Date
+        column of the whole file first.
+        """
+        if country is None and zone is None:
+            return self.read_rows(self._date_positions(start_date, end_date), columns)
+
+        if columns is not None and DATE_COLUMN not in columns and (start_date is not None or end_date is not None):
+            columns = list(columns) + [DATE_COLUMN]
+
+        ranges = None
+        if country is not None:
+            ranges = [tuple(self.meta['countries'][name]) for name in self.match_countries(country)]
+        if zone is not None:
+            zone_ranges = [tuple(self.meta['zones'][name]) for name in self.match_zones(zone)]
+            if ranges is not None:
+                # Zones are nested inside their country's range
+                zone_ranges = [(start, end) for start, end in zone_ranges
+                               if any(c_start <= start and end <= c_end for c_start, c_end in ranges)]
+            ranges = zone_ranges
+
+        df = self.read_ranges(ranges, columns)
+        if start_date is not None or end_date is not None:
+            df = df[date_range_mask(df[DATE_COLUMN], start_date, end_date)].reset_index(drop=True)
+        return df
+
+    def _date_positions(self, start_date, end_date):
+        """Sorted-file positions of every row in the date range"""
+        if start_date is None and end_date is None:
+            return np.arange(self.meta['rows'])
+        dates = self.parquet.read([DATE_COLUMN]).column(0).to_pandas()
+        return np.flatnonzero(date_range_mask(dates, start_date, end_date))
+
+def date_range_mask(dates, start_date=None, end_date=None):
+    """Boolean array of dates within [start_date, end_date] (either end may be None)"""
+    mask = np.ones(len(dates), dtype=bool)
+    if start_date is not None:
+        mask &= (dates >= pd.Timestamp(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (dates <= pd.Timestamp(end_date)).to_numpy()
+    return mask
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Shared, cached feature preparation for the ML notebooks
+
+ML.ipynb, demo.ipynb and ML_classify.ipynb all clean the cleanup data the
+same way (most frequent trash item label, Zone/State split, year/season
+from the date, lat/lon from GPS) and fit a ColumnTransformer of
+SimpleImputer/StandardScaler/OneHotEncoder pipelines. prepare_features does
+this once for a named feature set, and load_features keeps the result (the
+fitted transformer and LabelEncoder, the cleaned feature frame and the
+prepared matrix) in the artifact cache, so a notebook re-run with the same
+data and code loads it from disk instead of recomputing it.
+
+Train/test matrices are row slices of X_prepared: every row goes through
+the same fitted transformer, so only the whole matrix and the split
+positions are stored.
+"""
+
+import argparse
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+
+import cleanup_schema
+import data_storage
+import gps_codec
+from artifact_cache import ArtifactCache, default_cache, source_fingerprint
+from cleanup_schema import DATE_COLUMN, TRASH_ITEM_COLUMNS, parse_cleanup_dates
+from data_storage import load_dataset, resolve_dataset_path
+from gps_codec import GPS_COLUMN, LAT_COLUMN, LON_COLUMN, ensure_lat_lon
+from instrumentation import instrumented, note_frame
+
+# Data files the notebooks read, then the generated dataset (same columns)
+ML_DATA_FILES = [
+    'Data_Level5_BAH_OceanCleanup.csv',
+    os.path.join('data', 'Data_Level5_BAH_OceanCleanup.csv'),
+    os.path.join('data', 'global_ocean_cleanup_data')
+]
+FEATURES_DIR = os.path.join('data', 'features')
+
+LABEL_COLUMN = 'most_freq_trash'
+
+# Activity and item count columns the Cleanup Type KNN classifier is trained on
+COUNT_COLUMNS = ['Adults', 'Children', 'People', 'Pounds', 'Miles', '# of bags'] + TRASH_ITEM_COLUMNS + \
+    ['Total Items Collected']
+
+# Named feature sets: label column, categorical/numeric feature columns, the
+# optional cap on distinct labels, whether the transformer is fit on the
+# whole frame or the training split, and the columns whose missing values
+# drop a row (None: any feature or label column)
+FEATURE_SETS = {
+    # ML.ipynb: most frequent trash item from date and location
+    'most_freq_trash': {
+        'label': LABEL_COLUMN,
+        'cat_columns': [],
+        'num_columns': ['year', 'season', 'gps_lat', 'gps_long'],
+        'max_labels': None,
+        'fit_on': 'all',
+        'required': None
+    },
+    # demo.ipynb: the 5 most common labels from location only
+    'most_freq_trash_top5': {
+        'label': LABEL_COLUMN,
+        'cat_columns': [],
+        'num_columns': ['gps_lat', 'gps_long'],
+        'max_labels': 5,
+        'fit_on': 'all',
+        'required': None
+    },
+    # ML_classify.ipynb / demo.ipynb: Cleanup Type from the activity and item counts
+    'cleanup_type': {
+        'label': 'Cleanup Type',
+        'cat_columns': [],
+        'num_columns': COUNT_COLUMNS,
+        'max_labels': None,
+        'fit_on': 'train',
+        'required': ['Cleanup Type', 'Zone']
+    }
+}
+
+def find_ml_data_file(data_file=None):
+    """The dataset to prepare: data_file, else the first of ML_DATA_FILES that exists"""
+    candidates = [data_file] if data_file is not None else ML_DATA_FILES
+    for candidate in candidates:
+        resolved = resolve_dataset_path(candidate)
+        if resolved is not None:
+            return resolved
+    raise FileNotFoundError(data_file if data_file is not None else ML_DATA_FILES[0])
+
+def most_frequent_item(df, item_columns):
+    """
+    Name of the largest item count column of each row (first one on ties, like idxmax)
+
+    Rows with no counts at all get NaN.
+    """
+    counts = df[item_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(counts)
+    best = np.where(missing, -np.inf, counts).argmax(axis=1)
+    labels = pd.Series(np.asarray(item_columns, dtype=object)[best], index=df.index)
+    return labels.where(~missing.all(axis=1))
+
+def first_part(values):
+    """Text before the first comma ('Kerala, India' -> 'Kerala'), computed once per distinct value"""
+    categories = values.astype('category').cat.categories
+    return values.astype('category').map(dict(zip(categories, categories.astype(str).str.split(',', n=1).str[0])))
+
+def clean_frame(df, max_labels=None):
+    """
+    The notebooks' cleaned frame: item counts replaced by the most_freq_trash
+    label, Zone/State without the country, year/month/season and gps_lat/gps_long
+
+    max_labels keeps only the most common labels as candidates (demo.ipynb's
+    MAX_LABELS). Cleanups from 2010 or earlier are dropped.
+    """
+    item_columns = [col for col in TRASH_ITEM_COLUMNS if col in df.columns]
+    labels = most_frequent_item(df, item_columns)
+    if max_labels is not None:
+        kept = set(labels.value_counts(sort=True).index[:max_labels])
+        labels = most_frequent_item(df, [col for col in item_columns if col in kept])
+
+    cl_df = df.drop(columns=item_columns)
+    cl_df[LABEL_COLUMN] = labels
+
+    for col in ['Zone', 'State']:
+        if col in cl_df.columns:
+            cl_df[col] = first_part(cl_df[col])
+
+    add_date_location_features(cl_df)
+    return cl_df[cl_df['year'] > 2010]
+
+def add_date_location_features(df):
+    """
+    Add year/month/season from Cleanup Date and gps_lat/gps_long from lat/lon
+    (or GPS) to df in place, unless df already has them
+    """
+    if DATE_COLUMN in df.columns and 'year' not in df.columns:
+        dates = parse_cleanup_dates(df[DATE_COLUMN])
+        df['year'] = dates.dt.year.astype(np.float64)
+        df['month'] = dates.dt.month.astype(np.float64)
+        # From the month; the original ML.ipynb took the day field by mistake
+        df['season'] = (df['month'] % 12 + 3) // 3
+    if 'gps_lat' not in df.columns and (LAT_COLUMN in df.columns or GPS_COLUMN in df.columns):
+        ensure_lat_lon(df)
+        df['gps_lat'] = df[LAT_COLUMN]
+        df['gps_long'] = df[LON_COLUMN]
+    return df
+
+def record_features(records, name):
+    """
+    Feature columns of a feature set for new cleanup records
+
+    records is a DataFrame or a list of dicts in the generator's schema
+    (Cleanup Date, GPS or lat/lon, item counts), or already holding the
+    feature columns (e.g. {'gps_lat': ..., 'gps_long': ...}). Columns the
+    records lack are left missing for the transformer's imputers.
+    """
+    spec = FEATURE_SETS[name]
+    df = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(list(records))
+    add_date_location_features(df)
+    numbers = df.reindex(columns=spec['num_columns'])
+    try:
+        # One conversion for the whole block; per-column coercion only for unparseable values
+        values = numbers.to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        values = numbers.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    numbers = pd.DataFrame(values, index=df.index, columns=spec['num_columns'])
+    return pd.concat([df.reindex(columns=spec['cat_columns']), numbers], axis=1)
+
+def build_column_transformer(cat_columns, num_columns):
+    """The notebooks' ColumnTransformer: median-impute + scale numbers, mode-impute + one-hot categories"""
+    num_pipeline = Pipeline([
+        ('imputer', SimpleImputer(strategy='median')),
+        ('std_scaler', StandardScaler()),
+    ])
+    cat_pipeline = Pipeline([
+        ('imputer', SimpleImputer(strategy='most_frequent')),
+        ('one_hot', OneHotEncoder()),
+    ])
+    return ColumnTransformer([
+        ('cat', cat_pipeline, list(cat_columns)),
+        ('num', num_pipeline, list(num_columns)),
+    ])
+
+class PreparedFeatures:
+    """
+    A fitted feature set: cleaned frame, transformer, label encoder and prepared matrices
+
+    X_prepared (sparse or dense) and y_prepared cover every row of X;
+    train_positions/test_positions are the train_test_split row positions.
+    """
+
+    def __init__(self, name, X, y, cat_columns, num_columns, pipeline, label_encoder,
+                 X_prepared, y_prepared, train_positions, test_positions, source=None):
+        self.name = name
+        self.X = X
+        self.y = y
+        self.cat_columns = cat_columns
+        self.num_columns = num_columns
+        self.pipeline = pipeline
+        self.label_encoder = label_encoder
+        self.X_prepared = X_prepared
+        self.y_prepared = y_prepared
+        self.train_positions = train_positions
+        self.test_positions = test_positions
+        self.source = source
+
+    @property
+    def frame(self):
+        """Features plus label column, like the notebooks' cl_df"""
+        return self.X.assign(**{self.y.name: self.y})
+
+    @property
+    def X_train(self):
+        return self.X.iloc[self.train_positions]
+
+    @property
+    def X_test(self):
+        return self.X.iloc[self.test_positions]
+
+    @property
+    def y_train(self):
+        return self.y.iloc[self.train_positions]
+
+    @property
+    def y_test(self):
+        return self.y.iloc[self.test_positions]
+
+    @property
+    def X_train_prepared(self):
+        return self.X_prepared[self.train_positions]
+
+    @property
+    def X_test_prepared(self):
+        return self.X_prepared[self.test_positions]
+
+    @property
+    def y_train_prepared(self):
+        return self.y_prepared[self.train_positions]
+
+    @property
+    def y_test_prepared(self):
+        return self.y_prepared[self.test_positions]
+
+    def summary(self):
+        """Row, feature and class counts"""
+        return {
+            'feature_set': self.name,
+            'rows': len(self.X),
+            'train_rows': len(self.train_positions),
+            'test_rows': len(self.test_positions),
+            'features': self.X_prepared.shape[1],
+            'sparse': not isinstance(self.X_prepared, np.ndarray),
+            'classes': len(self.label_encoder.classes_)
+        }
+
+@instrumented('ml_features')
+def prepare_features(name='most_freq_trash', data_file=None, test_size=0.2, random_state=42):
+    """
+    Clean the data, split it and fit the transformer and label encoder of a feature set
+
+    Returns a PreparedFeatures; nothing is cached (see load_features).
+    """
+    spec = FEATURE_SETS[name]
+    source = find_ml_data_file(data_file)
+    df = load_dataset(source)
+    note_frame(df)
+
+    if spec['label'] == LABEL_COLUMN:
+        df = clean_frame(df, spec['max_labels'])
+    features = spec['cat_columns'] + spec['num_columns']
+    required = spec['required'] if spec['required'] is not None else features + [spec['label']]
+    df = df.dropna(subset=required)
+
+    X = df[features].reset_index(drop=True)
+    y = df[spec['label']].astype(str).reset_index(drop=True)
+    train_positions, test_positions = train_test_split(np.arange(len(X)), test_size=test_size,
+                                                       random_state=random_state)
+
+    pipeline = build_column_transformer(spec['cat_columns'], spec['num_columns'])
+    if spec['fit_on'] == 'train':
+        pipeline.fit(X.iloc[train_positions])
+        X_prepared = pipeline.transform(X)
+    else:
+        X_prepared = pipeline.fit_transform(X)
+
+    label_encoder = LabelEncoder()
+    y_prepared = label_encoder.fit_transform(y)
+
+    return PreparedFeatures(name, X, y, spec['cat_columns'], spec['num_columns'], pipeline, label_encoder,
+                            X_prepared, y_prepared, train_positions, test_positions, source)
+
+def features_path(name, features_dir=FEATURES_DIR):
+    """File holding a prepared feature set"""
+    return os.path.join(features_dir, f"{name}.joblib")
+
+def save_features(features, path):
+    """Write a PreparedFeatures with joblib (uncompressed, so arrays can be memory-mapped)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Stored as a plain dict so the file loads no matter which module ran the save
+    # (python ml_features.py would otherwise pickle __main__.PreparedFeatures)
+    joblib.dump(dict(vars(features)), path)
+    return path
+
+def load_features_file(path, mmap_mode=None):
+    """Read a PreparedFeatures written by save_features (mmap_mode='r' maps dense arrays read-only)"""
+    return PreparedFeatures(**joblib.load(path, mmap_mode=mmap_mode))
+
+def load_features(name='most_freq_trash', data_file=None, test_size=0.2, random_state=42,
+                  features_dir=FEATURES_DIR, use_cache=True):
+    """
+    Prepared features of a named set, from the artifact cache when the data and code are unchanged
+
+    The cache key covers the data file contents, the feature set definition,
+    the split parameters, the scikit-learn version and the source of the
+    modules involved.
+    """
+    source = find_ml_data_file(data_file)
+    output_file = features_path(name, features_dir)
+
+    def build():
+        features = prepare_features(name, source, test_size, random_state)
+        save_features(features, output_file)
+        print(f"✅ Prepared feature set '{name}' from {source}: {features.summary()}")
+        return features.summary()
+
+    cache = default_cache() if use_cache else ArtifactCache(enabled=False)
+    cache.run_stage(
+        f"ml_features:{name}", build, [output_file],
+        inputs=[source],
+        params={'feature_set': FEATURE_SETS[name], 'test_size': test_size, 'random_state': random_state,
+                'sklearn': sklearn.__version__},
+        code_version=source_fingerprint(sys.modules[__name__], cleanup_schema, data_storage, gps_codec),
+        capture_output=True
+    )
+    return load_features_file(output_file)
+
+def main():
+    """Prepare (or restore) feature sets from the command line"""
+    parser = argparse.ArgumentParser(description="Prepare and cache the ML notebooks' feature matrices")
+    parser.add_argument('feature_sets', nargs='*',
+                        help=f"Feature sets to prepare: {', '.join(FEATURE_SETS)} (default: all)")
+    parser.add_argument('--data', default=None, help=f"Dataset to prepare (default: first of {', '.join(ML_DATA_FILES)})")
+    parser.add_argument('--features-dir', default=FEATURES_DIR, help='Directory for the prepared feature files')
+    parser.add_argument('--no-cache', action='store_true', help='Always recompute instead of restoring cached features')
+    args = parser.parse_args()
+    unknown = [name for name in args.feature_sets if name not in FEATURE_SETS]
+    if unknown:
+        parser.error(f"unknown feature set(s): {', '.join(unknown)}")
+
+    try:
+        find_ml_data_file(args.data)
+    except FileNotFoundError as e:
+        print(f"❌ Data file not found: {e}")
+        sys.exit(1)
+
+    for name in args.feature_sets or list(FEATURE_SETS):
+        features = load_features(name, args.data, features_dir=args.features_dir, use_cache=not args.no_cache)
+        print(f"📦 {name}: {features_path(name, args.features_dir)} ({features.summary()['rows']} rows)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Registry of trained cleanup classifiers
+
+A registered model is a bundle of everything needed to predict from raw
+cleanup records: the feature set it was trained on (see ml_features.py),
+the fitted ColumnTransformer, the LabelEncoder and the model. Each save
+writes a new version under models/<name>/v<N>/ (bundle.joblib plus a
+meta.json description); load_model returns the latest version unless one
+is asked for. Keras models are stored in their own model.keras file and
+need TensorFlow only when such a model is loaded. load_current_model only
+returns a model trained on the same feature set, columns, classes and
+source data (by content hash) as the features at hand.
+
+Usage:
+    python model_registry.py train cleanup_type_knn [--data FILE]
+    python model_registry.py list
+"""
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import sklearn
+
+from artifact_cache import file_content_hash
+from knn_classifier import FastKNNClassifier
+from ml_features import load_features, record_features
+
+REGISTRY_DIR = 'models'
+BUNDLE_FILE = 'bundle.joblib'
+KERAS_FILE = 'model.keras'
+META_FILE = 'meta.json'
+
+# Models the train command can fit from a cached feature set: name -> (feature set, model factory)
+TRAINABLE_MODELS = {
+    # The notebooks' KNeighborsClassifier(weights='distance', n_neighbors=4) for Cleanup Type, with
+    # exact (brute force) neighbours; the default IVF index is approximate
+    'cleanup_type_knn': ('cleanup_type',
+                         lambda: FastKNNClassifier(n_neighbors=4, weights='distance', index='brute'))
+}
+
+def is_keras_model(model):
+    """True for TensorFlow/Keras models, which are saved with model.save instead of joblib"""
+    return type(model).__module__.split('.')[0] in ('keras', 'tensorflow', 'tf_keras')
+
+def model_params(model):
+    """JSON-safe parameters of a model for meta.json, with FastKNNClassifier's fitted IVF sizes"""
+    if is_keras_model(model):
+        return {}
+    if hasattr(model, 'get_params'):
+        params = model.get_params()
+    else:
+        params = {key: value for key, value in vars(model).items() if not key.startswith('_') and not key.endswith('_')}
+    params.update({key: getattr(model, key) for key in ('n_lists_', 'n_probe_') if hasattr(model, key)})
+    return {key: value.item() if isinstance(value, np.generic) else
+            value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+            for key, value in params.items()}
+
+class ModelBundle:
+    """
+    A fitted model with the transformer and label encoder of its feature set
+    """
+
+    def __init__(self, name, feature_set, pipeline, label_encoder, model, meta=None):
+        self.name = name
+        self.feature_set = feature_set
+        self.pipeline = pipeline
+        self.label_encoder = label_encoder
+        self.model = model
+        self.meta = meta or {}
+
+    @classmethod
+    def from_features(cls, name, model, features):
+        """Bundle a model trained on a PreparedFeatures with its transformer and label encoder"""
+        return cls(name, features.name, features.pipeline, features.label_encoder, model)
+
+    def transform(self, records):
+        """Prepared feature matrix of raw cleanup records (list of dicts or DataFrame)"""
+        return self.pipeline.transform(record_features(records, self.feature_set))
+
+    def decode(self, raw):
+        """Labels from model output: class probabilities (argmax), encoded classes or labels"""
+        raw = np.asarray(raw)
+        if raw.ndim == 2:
+            raw = raw.argmax(axis=1)
+        if not np.issubdtype(raw.dtype, np.number):
+            return raw
+        return self.label_encoder.inverse_transform(raw.astype(np.intp))
+
+    def predict(self, records):
+        """Predicted label of each record"""
+        if len(records) == 0:
+            return np.asarray(self.label_encoder.classes_[:0])
+        X = self.transform(records)
+        raw = self.model.predict(X, verbose=0) if is_keras_model(self.model) else self.model.predict(X)
+        return self.decode(raw)
+
+def model_dir(name, registry_dir=REGISTRY_DIR):
+    return os.path.join(registry_dir, name)
+
+def source_hash(features):
+    """Content hash of the dataset a PreparedFeatures was built from (None when it is not a file)"""
+    if features.source and os.path.isfile(features.source):
+        return file_content_hash(features.source)
+    return None
+
+def stale_reason(meta, features):
+    """Why a registered model's meta.json does not match features, or None when it does"""
+    expected = {
+        'feature_set': features.name,
+        'feature_columns': features.cat_columns + features.num_columns,
+        'classes': [str(label) for label in features.label_encoder.classes_],
+        'source_hash': source_hash(features)
+    }
+    for key, value in expected.items():
+        if meta.get(key) != value:
+            return f"{key} differs (registered: {meta.get(key)!r})"
+    return None
+
+def model_versions(name, registry_dir=REGISTRY_DIR):
+    """Saved version numbers of a model, oldest first"""
+    directory = model_dir(name, registry_dir)
+    if not os.path.isdir(directory):
+        return []
+    versions = [int(entry[1:]) for entry in os.listdir(directory) if entry[:1] == 'v' and entry[1:].isdigit()]
+    return sorted(versions)
+
+def save_model(name, model, features, registry_dir=REGISTRY_DIR, metrics=None):
+    """
+    Register a model trained on features (a PreparedFeatures) as the next version of name
+
+    metrics (e.g. test accuracy) are kept in meta.json. Returns the version
+    directory.
+    """
+    bundle = ModelBundle.from_features(name, model, features)
+    versions = model_versions(name, registry_dir)
+    version = versions[-1] + 1 if versions else 1
+    directory = model_dir(name, registry_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    meta = {
+        'name': name,
+        'version': version,
+        'feature_set': bundle.feature_set,
+        'feature_columns': features.cat_columns + features.num_columns,
+        'classes': [str(label) for label in bundle.label_encoder.classes_],
+        'model_class': f"{type(model).__module__}.{type(model).__name__}",
+        'model_params': model_params(model),
+        'training_rows': len(features.train_positions),
+        'source': features.source,
+        'source_hash': source_hash(features),
+        'metrics': metrics or {},
+        'sklearn': sklearn.__version__,
+        'created': datetime.datetime.now().isoformat(timespec='seconds')
+    }
+
+    # Stored as a plain dict so the file loads no matter which module ran the save
+    contents = {
+        'feature_set': bundle.feature_set,
+        'pipeline': bundle.pipeline,
+        'label_encoder': bundle.label_encoder,
+        'model': None if is_keras_model(model) else model
+    }
+
+    # Written to a staging directory and renamed, so a half-written version is never loaded
+    staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=directory)
+    try:
+        if is_keras_model(model):
+            model.save(os.path.join(staging_dir, KERAS_FILE))
+        joblib.dump(contents, os.path.join(staging_dir, BUNDLE_FILE))
+        with open(os.path.join(staging_dir, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+        version_dir = os.path.join(directory, f"v{version}")
+        os.replace(staging_dir, version_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    return version_dir
+
+def load_model(name, version=None, registry_dir=REGISTRY_DIR):
+    """
+    Load a registered ModelBundle (latest version unless version is given)
+
+    Raises FileNotFoundError when the model or version is not registered.
+    """
+    versions = model_versions(name, registry_dir)
+    if version is None and versions:
+        version = versions[-1]
+    if version not in versions:
+        raise FileNotFoundError(f"Model '{name}'" + (f" version {version}" if version else '') +
+                                f" is not registered in {registry_dir}")
+
+    version_dir = os.path.join(model_dir(name, registry_dir), f"v{version}")
+    contents = joblib.load(os.path.join(version_dir, BUNDLE_FILE))
+    keras_file = os.path.join(version_dir, KERAS_FILE)
+    if os.path.isfile(keras_file):
+        import tensorflow as tf
+        contents['model'] = tf.keras.models.load_model(keras_file)
+    with open(os.path.join(version_dir, META_FILE)) as f:
+        meta = json.load(f)
+    return ModelBundle(name, meta=meta, **contents)
+
+def load_current_model(name, features, registry_dir=REGISTRY_DIR):
+    """
+    Latest version of name if it was trained on features (see stale_reason), else None
+
+    Returns None when the model is not registered or is stale, so the
+    caller retrains and registers a new version.
+    """
+    versions = model_versions(name, registry_dir)
+    if not versions:
+        return None
+    # meta.json is checked first so a stale Keras model never imports TensorFlow
+    with open(os.path.join(model_dir(name, registry_dir), f"v{versions[-1]}", META_FILE)) as f:
+        meta = json.load(f)
+    reason = stale_reason(meta, features)
+    if reason:
+        print(f"⚠️  Registered {name} v{meta['version']} is stale: {reason}")
+        return None
+    return load_model(name, versions[-1], registry_dir)
+
+def list_models(registry_dir=REGISTRY_DIR):
+    """meta.json of the latest version of every registered model"""
+    if not os.path.isdir(registry_dir):
+        return []
+    found = []
+    for name in sorted(os.listdir(registry_dir)):
+        versions = model_versions(name, registry_dir)
+        if versions:
+            with open(os.path.join(model_dir(name, registry_dir), f"v{versions[-1]}", META_FILE)) as f:
+                found.append(json.load(f))
+    return found
+
+def train_model(name, data_file=None, registry_dir=REGISTRY_DIR):
+    """Fit one of TRAINABLE_MODELS on its cached feature set, score it on the test split and register it"""
+    feature_set, make_model = TRAINABLE_MODELS[name]
+    features = load_features(feature_set, data_file)
+
+    start = time.perf_counter()
+    model = make_model().fit(features.X_train_prepared, features.y_train_prepared)
+    fit_seconds = time.perf_counter() - start
+    accuracy = model.score(features.X_test_prepared, features.y_test_prepared)
+    print(f"🤖 Trained {name} on {len(features.train_positions):,} rows in {fit_seconds:.1f}s, "
+          f"test accuracy {accuracy:.4f}")
+
+    version_dir = save_model(name, model, features, registry_dir, metrics={'test_accuracy': accuracy})
+    print(f"💾 Registered {name} in {version_dir}")
+    return version_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and list registered cleanup classifiers")
+    parser.add_argument('--registry', default=REGISTRY_DIR, help='Registry directory')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='Fit a model on its cached feature set and register it')
+    train_parser.add_argument('model', choices=list(TRAINABLE_MODELS))
+    train_parser.add_argument('--data', default=None, help='Dataset for the feature set (default: ml_features default)')
+
+    subparsers.add_parser('list', help='Show the latest version of every registered model')
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        try:
+            train_model(args.model, args.data, args.registry)
+        except FileNotFoundError as e:
+            print(f"❌ Data file not found: {e}")
+            sys.exit(1)
+        return
+
+    models = list_models(args.registry)
+    if not models:
+        print(f"No models registered in {args.registry}")
+        return
+    print(f"{'model':<28} {'version':>7} {'feature set':<22} {'classes':>7}  {'created':<19}  metrics")
+    for meta in models:
+        metrics = ', '.join(f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}"
+                            for key, value in meta['metrics'].items())
+        print(f"{meta['name']:<28} {meta['version']:>7} {meta['feature_set']:<22} {len(meta['classes']):>7}  "
+              f"{meta['created']:<19}  {metrics}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Parallel cross-validated hyperparameter search for the notebook classifiers
+
+Each search space pairs a cached feature set (ml_features.py) with an
+estimator and a parameter grid. Every (configuration, fold) fit is a task
+on a process pool. The prepared matrix, the labels and the fold assignment
+are copied once into multiprocessing.shared_memory blocks, and each worker
+maps them as numpy arrays, so tasks only carry their parameters. Folds are
+stratified over the training split. After the search, the best
+configuration is refit on the whole training split and scored on the
+held-out test split. It can be registered with model_registry.py.
+
+Reports mean/std accuracy and the mean fit and score seconds of every
+configuration.
+
+Usage:
+    python model_search.py cleanup_type_knn [--data FILE] [--folds 5] [--jobs N]
+    python model_search.py most_freq_trash_mlp --param "alpha=[0.0001, 0.01]" --output search.csv
+    python model_search.py cleanup_type_knn --register cleanup_type_knn
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import scipy.sparse
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+
+from instrumentation import instrumented
+from ml_features import load_features
+
+SEARCH_SPACES = {
+    # ML_classify.ipynb / demo.ipynb: KNeighborsClassifier(weights='distance', n_neighbors=4)
+    'cleanup_type_knn': {
+        'feature_set': 'cleanup_type',
+        'estimator': KNeighborsClassifier,
+        # Brute force: KD/ball trees are slower on the ~50 count columns
+        'fixed': {'algorithm': 'brute'},
+        'param_grid': {'n_neighbors': [2, 4, 8, 16, 32], 'weights': ['uniform', 'distance']}
+    },
+    # ML.ipynb's most frequent trash item from date and location, with the KNN above
+    'most_freq_trash_knn': {
+        'feature_set': 'most_freq_trash',
+        'estimator': KNeighborsClassifier,
+        'fixed': {},
+        'param_grid': {'n_neighbors': [4, 8, 16, 32, 64], 'weights': ['uniform', 'distance']}
+    },
+    # scikit-learn counterpart of ML.ipynb's dense Keras network (relu layers; alpha is an L2 penalty)
+    'most_freq_trash_mlp': {
+        'feature_set': 'most_freq_trash',
+        'estimator': MLPClassifier,
+        'fixed': {'max_iter': 50, 'early_stopping': True, 'random_state': 42},
+        'param_grid': {'hidden_layer_sizes': [(128,), (256, 128), (512, 256, 128)], 'alpha': [0.0001, 0.001]}
+    }
+}
+
+def share_array(array, blocks):
+    """Copy array into a new shared memory block (appended to blocks); returns its descriptor"""
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    return block.name, array.shape, array.dtype.str
+
+def attach_array(descriptor, blocks):
+    """numpy view of a block shared by share_array (the block is appended to blocks)"""
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+def share_matrix(X, blocks):
+    """Descriptor of a dense or sparse (CSR) matrix copied into shared memory"""
+    if scipy.sparse.issparse(X):
+        X = scipy.sparse.csr_matrix(X)
+        return ('csr', X.shape, share_array(X.data, blocks), share_array(X.indices, blocks),
+                share_array(X.indptr, blocks))
+    return ('dense', share_array(X, blocks))
+
+def attach_matrix(descriptor, blocks):
+    if descriptor[0] == 'csr':
+        shape, data, indices, indptr = descriptor[1:]
+        return scipy.sparse.csr_matrix((attach_array(data, blocks), attach_array(indices, blocks),
+                                        attach_array(indptr, blocks)), shape=shape, copy=False)
+    return attach_array(descriptor[1], blocks)
+
+# Per-process state of the search tasks, set by _attach_worker
+_worker = {}
+
+def _single_thread():
+    """Limit BLAS/OpenMP to one thread (a threadpoolctl context manager; no-op without threadpoolctl)"""
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return contextlib.nullcontext()
+    return threadpool_limits(1)
+
+def _attach_worker(space_name, X_descriptor, y_descriptor, positions_descriptor, folds_descriptor):
+    """Map the shared matrix, labels and fold assignment into this process"""
+    blocks = []
+    _worker.update(space=SEARCH_SPACES[space_name], blocks=blocks,
+                   X=attach_matrix(X_descriptor, blocks), y=attach_array(y_descriptor, blocks),
+                   positions=attach_array(positions_descriptor, blocks),
+                   folds=attach_array(folds_descriptor, blocks))
+
+def _init_worker(*shared):
+    """Process pool initializer: attach the shared data, one BLAS thread and no warnings for the worker's life"""
+    _attach_worker(*shared)
+    # One BLAS/OpenMP thread per worker; the pool already uses every core
+    _worker['thread_limits'] = _single_thread()
+    warnings.filterwarnings('ignore')
+
+def _release_worker():
+    """Drop the shared views and close the blocks mapped by _init_worker in this process"""
+    blocks = _worker.get('blocks', [])
+    _worker.clear()
+    for block in blocks:
+        block.close()
+
+def _fit_fold(task):
+    """Fit one configuration on all training folds but one and score it on that fold"""
+    config, params, fold = task
+    space = _worker['space']
+    in_fold = _worker['folds'] == fold
+    train = _worker['positions'][~in_fold]
+    test = _worker['positions'][in_fold]
+    X, y = _worker['X'], _worker['y']
+
+    model = space['estimator'](**space['fixed'], **params)
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    score = model.score(X[test], y[test])
+    return config, fold, score, fit_seconds, time.perf_counter() - start
+
+def assign_folds(y, n_folds, random_state=42):
+    """Stratified fold number of every row of y"""
+    folds = np.empty(len(y), dtype=np.int8)
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    for fold, (_, test) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        folds[test] = fold
+    return folds
+
+def summarize(configs, fold_results):
+    """One row per configuration: parameters, fold accuracy and timings, best first"""
+    rows = []
+    for config, params in enumerate(configs):
+        scores, fit_seconds, score_seconds = zip(*[r[2:] for r in fold_results if r[0] == config])
+        rows.append({
+            'params': params,
+            'mean_accuracy': float(np.mean(scores)),
+            'std_accuracy': float(np.std(scores)),
+            'mean_fit_seconds': float(np.mean(fit_seconds)),
+            'mean_score_seconds': float(np.mean(score_seconds)),
+            'total_seconds': float(np.sum(fit_seconds) + np.sum(score_seconds))
+        })
+    results = pd.DataFrame(rows)
+    results['rank'] = results['mean_accuracy'].rank(ascending=False, method='min').astype(int)
+    return results.sort_values(['rank', 'mean_fit_seconds'], ignore_index=True)
+
+@instrumented('model_search')
+def search(space_name, data_file=None, param_grid=None, n_folds=5, jobs=None, random_state=42):
+    """
+    Cross-validate every configuration of a search space on its feature set's training split
+
+    param_grid overrides entries of the space's grid. Returns (results
+    DataFrame from summarize, features, wall seconds of the search).
+    """
+    space = SEARCH_SPACES[space_name]
+    configs = list(ParameterGrid({**space['param_grid'], **(param_grid or {})}))
+    jobs = jobs or os.cpu_count() or 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        features = load_features(space['feature_set'], data_file)
+    positions = features.train_positions
+    folds = assign_folds(features.y_prepared[positions], n_folds, random_state)
+    tasks = [(config, params, fold) for config, params in enumerate(configs) for fold in range(n_folds)]
+
+    print(f"🔍 {space_name}: {len(configs)} configurations x {n_folds} folds on {len(positions):,} rows, "
+          f"{min(jobs, len(tasks))} workers")
+
+    blocks = []
+    try:
+        shared = (space_name, share_matrix(features.X_prepared, blocks),
+                  share_array(features.y_prepared, blocks), share_array(positions, blocks),
+                  share_array(folds, blocks))
+        start = time.perf_counter()
+        if jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_init_worker,
+                                     initargs=shared) as executor:
+                fold_results = list(executor.map(_fit_fold, tasks))
+        else:
+            # In this process the thread limit and warning filter are undone after the search
+            with warnings.catch_warnings(), _single_thread():
+                warnings.simplefilter('ignore')
+                _attach_worker(*shared)
+                try:
+                    fold_results = [_fit_fold(task) for task in tasks]
+                finally:
+                    _release_worker()
+        wall_seconds = time.perf_counter() - start
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return summarize(configs, fold_results), features, wall_seconds
+
+def refit_best(space_name, params, features):
+    """Fit the best configuration on the whole training split; returns (model, test accuracy)"""
+    space = SEARCH_SPACES[space_name]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = space['estimator'](**space['fixed'], **params)
+        model.fit(features.X_train_prepared, features.y_train_prepared)
+        return model, model.score(features.X_test_prepared, features.y_test_prepared)
+
+def parse_param(text):
+    """NAME=VALUES (a Python literal or list of literals) -> (NAME, list of values)"""
+    name, _, values = text.partition('=')
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUES, got '{text}'")
+    try:
+        values = ast.literal_eval(values)
+    except (ValueError, SyntaxError):
+        values = values.split(',')
+    return name.strip(), values if isinstance(values, list) else [values]
+
+def print_results(results):
+    print(f"{'rank':>4} {'accuracy':>9} {'± std':>7} {'fit s':>8} {'score s':>8}  params")
+    for row in results.itertuples():
+        params = ', '.join(f"{key}={value}" for key, value in row.params.items())
+        print(f"{row.rank:>4} {row.mean_accuracy:>9.4f} {row.std_accuracy:>7.4f} {row.mean_fit_seconds:>8.2f} "
+              f"{row.mean_score_seconds:>8.2f}  {params}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel cross-validated hyperparameter search")
+    parser.add_argument('space', choices=list(SEARCH_SPACES), help='Search space (model and feature set)')
+    parser.add_argument('--data', default=None, help='Dataset for the feature set (default: ml_features default)')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help='Override a grid entry, e.g. "n_neighbors=[2, 4, 8]" (repeatable)')
+    parser.add_argument('--output', default=None, help='Also write the results table as CSV')
+    parser.add_argument('--register', metavar='NAME', default=None,
+                        help='Register the refit best model under NAME (model_registry.py)')
+    args = parser.parse_args()
+
+    try:
+        results, features, wall_seconds = search(args.space, args.data, dict(args.param), args.folds, args.jobs)
+    except FileNotFoundError as e:
+        print(f"❌ Data file not found: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print_results(results)
+    print("=" * 80)
+    task_seconds = results['total_seconds'].sum()
+    print(f"⏱️  {wall_seconds:.1f}s wall for {task_seconds:.1f}s of fitting and scoring "
+          f"({task_seconds / wall_seconds:.1f}x)")
+
+    best = results.iloc[0]['params']
+    model, accuracy = refit_best(args.space, best, features)
+    print(f"🏆 Best {best}: test accuracy {accuracy:.4f}")
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"💾 Results written to {args.output}")
+    if args.register:
+        from model_registry import save_model
+        version_dir = save_model(args.register, model, features,
+                                 metrics={'test_accuracy': accuracy, 'cv_accuracy': results.iloc[0]['mean_accuracy']})
+        print(f"💾 Registered {args.register} in {version_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Run the whole cleanup workflow as one dependency graph
+
+Stages pass DataFrames to each other in memory instead of writing a file
+for the next script to read back:
+
+    data (generate, or load --input and add costs)
+      -> fix_coordinates -> aggregate -> report, cost_plots, global_map
+                         -> india_map
+
+A stage starts as soon as the stages it depends on have finished, so the
+independent leaves (both maps, the cost plots and the report) run
+concurrently in a thread pool. Each stage's console output is buffered
+and printed in one block when it finishes. Intermediate datasets are only
+written with --save-intermediates.
+"""
+
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Plots are drawn from worker threads, which needs a non-interactive backend
+import matplotlib
+matplotlib.use('Agg')
+
+from add_costs_to_existing_data import fill_missing_required_columns
+from cost_aggregation import CostAggregator
+from cost_calculator import OceanCleanupCostCalculator, add_cost_columns_to_dataframe, has_cost_columns
+from create_corrected_global_map import create_corrected_global_map, create_india_focused_map
+from data_storage import DEFAULT_FORMAT, STORAGE_FORMATS, load_dataset, save_dataset
+from fix_coordinates import fix_coordinates_in_dataframe
+from generate_global_cleanup_data import generate_global_cleanup_data
+from instrumentation import stage
+from simple_cost_analysis import create_cost_analysis_report, create_cost_visualizations
+
+OUTPUT_DIRECTORIES = ['data', 'plots', 'maps']
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout replacement that sends each pipeline thread's prints to its own buffer"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self):
+        self.local.buffer = io.StringIO()
+
+    def release(self):
+        buffer = getattr(self.local, 'buffer', None)
+        self.local.buffer = None
+        return buffer.getvalue() if buffer is not None else ''
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+class Pipeline:
+    """
+    A set of named stages with dependencies, run in dependency order
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def add_stage(self, name, func, depends_on=()):
+        """
+        Register func as stage name
+
+        func is called with the results of depends_on as keyword arguments
+        (named after those stages) and its return value is passed on to the
+        stages that depend on it.
+        """
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {', '.join(missing)}")
+        self.stages[name] = (func, list(depends_on))
+
+    def required_stages(self, targets):
+        """targets plus everything they depend on, transitively"""
+        required = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in required:
+                required.add(name)
+                pending.extend(self.stages[name][1])
+        return required
+
+    def run(self, targets=None, workers=4):
+        """
+        Run the stages needed for targets (default: all), up to workers at a time
+
+        Returns ({stage: result}, {stage: seconds}). A failing stage stops
+        the run and its exception is raised once running stages finish.
+        """
+        required = self.required_stages(targets or list(self.stages))
+        results = {}
+        timings = {}
+        output = _ThreadOutput(sys.stdout)
+
+        def run_stage(name):
+            func, depends_on = self.stages[name]
+            output.capture()
+            start = time.perf_counter()
+            try:
+                with stage(f"pipeline:{name}"):
+                    return func(**{dep: results[dep] for dep in depends_on})
+            finally:
+                timings[name] = time.perf_counter() - start
+                captured = output.release()
+                output.stream.write(f"\n── {name} ({timings[name]:.2f}s) " + "─" * 40 + "\n" + captured)
+
+        original_stdout = sys.stdout
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                running = {}
+                remaining = set(required)
+                while remaining or running:
+                    ready = [name for name in remaining
+                             if all(dep in results for dep in self.stages[name][1])]
+                    for name in sorted(ready):
+                        remaining.discard(name)
+                        running[executor.submit(run_stage, name)] = name
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        results[name] = future.result()
+        finally:
+            sys.stdout = original_stdout
+
+        return results, timings
+
+def load_costed_data(input_file, cost_calculator, rates_file=None):
+    """
+    Load an existing dataset and add cost columns unless it already has them
+
+    A dataset that is already costed is re-priced with cost_calculator when
+    rates_file (the --rates file it was built from) is given.
+    """
+    df = load_dataset(input_file)
+    print(f"Loaded {len(df)} records from {input_file}")
+    if has_cost_columns(df):
+        if rates_file:
+            print(f"Re-pricing with rates from {rates_file}: {', '.join(cost_calculator.recompute_costs(df)) or 'unchanged'}")
+        return df
+
+    df = fill_missing_required_columns(df)
+    print("Calculating costs for each cleanup point...")
+    return add_cost_columns_to_dataframe(df, cost_calculator)
+
+def build_cleanup_pipeline(args):
+    """The generate -> costs -> coordinates -> reports/maps graph for the parsed CLI args"""
+    cost_calculator = OceanCleanupCostCalculator()
+    if args.rates:
+        cost_calculator = OceanCleanupCostCalculator.from_config(args.rates, args.scenario)
+
+    def save_intermediate(df, path):
+        if args.save_intermediates:
+            print(f"Intermediate data saved to: {save_dataset(df, path, args.format)}")
+
+    def data():
+        if args.input:
+            df = load_costed_data(args.input, cost_calculator, args.rates)
+        else:
+            df = generate_global_cleanup_data(
+                vectorized=True,
+                sites_multiplier=args.sites_multiplier,
+                seed=args.seed,
+                save=False,
+                workers=args.generate_workers
+            )
+            if args.rates:
+                print(f"Re-pricing with rates from {args.rates}: {', '.join(cost_calculator.recompute_costs(df)) or 'unchanged'}")
+        save_intermediate(df, 'data/global_ocean_cleanup_data_with_costs')
+        return df
+
+    def fix_coordinates(data):
+        df = fix_coordinates_in_dataframe(data)
+        save_intermediate(df, 'data/global_ocean_cleanup_data_fixed_coordinates')
+        return df
+
+    def aggregate(fix_coordinates):
+        return CostAggregator.from_dataframe(fix_coordinates)
+
+    def report(fix_coordinates, aggregate):
+        create_cost_analysis_report(df=fix_coordinates, aggregator=aggregate)
+
+    def cost_plots(fix_coordinates, aggregate):
+        create_cost_visualizations(fix_coordinates, aggregate)
+
+    def global_map(fix_coordinates, aggregate):
+        create_corrected_global_map(df=fix_coordinates, mode=args.map_mode, aggregator=aggregate)
+
+    def india_map(fix_coordinates):
+        create_india_focused_map(df=fix_coordinates)
+
+    pipeline = Pipeline()
+    pipeline.add_stage('data', data)
+    pipeline.add_stage('fix_coordinates', fix_coordinates, ['data'])
+    pipeline.add_stage('aggregate', aggregate, ['fix_coordinates'])
+    pipeline.add_stage('report', report, ['fix_coordinates', 'aggregate'])
+    pipeline.add_stage('cost_plots', cost_plots, ['fix_coordinates', 'aggregate'])
+    pipeline.add_stage('global_map', global_map, ['fix_coordinates', 'aggregate'])
+    pipeline.add_stage('india_map', india_map, ['fix_coordinates'])
+    return pipeline
+
+def main():
+    """Run the cleanup pipeline from the command line"""
+    parser = argparse.ArgumentParser(description="Run the ocean cleanup workflow as an in-memory stage graph")
+    parser.add_argument('--input', default=None,
+                        help="Start from an existing dataset instead of generating one")
+    parser.add_argument('--sites-multiplier', type=int, default=1,
+                        help="Generate this many times the default number of sites per country")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for generation")
+    parser.add_argument('--generate-workers', type=int, default=1,
+                        help="Processes used to generate countries")
+    parser.add_argument('--rates', default=None, help="JSON file with calculator rates and scenarios")
+    parser.add_argument('--scenario', default=None, help="Scenario from the --rates file")
+    parser.add_argument('--map-mode', choices=['markers', 'fast'], default='markers',
+                        help="'fast' pre-aggregates points for large datasets")
+    parser.add_argument('--stages', nargs='+', default=None,
+                        help="Only run these stages (and what they depend on)")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Stages run concurrently once their inputs are ready")
+    parser.add_argument('--save-intermediates', action='store_true',
+                        help="Also write the costed and fixed-coordinate datasets to data/")
+    parser.add_argument('--format', choices=list(STORAGE_FORMATS), default=DEFAULT_FORMAT,
+                        help="Storage format for intermediate datasets")
+    args = parser.parse_args()
+
+    for directory in OUTPUT_DIRECTORIES:
+        os.makedirs(directory, exist_ok=True)
+
+    print("🌊 Ocean Cleanup Pipeline")
+    print("=" * 60)
+
+    pipeline = build_cleanup_pipeline(args)
+    start = time.perf_counter()
+    results, timings = pipeline.run(args.stages, workers=args.workers)
+
+    print("\n" + "=" * 60)
+    print(f"✅ Pipeline finished in {time.perf_counter() - start:.2f}s")
+    for name in pipeline.stages:
+        if name in timings:
+            print(f"   {name:<16} {timings[name]:7.2f}s")
+
+if __name__ == "__main__":
+    main()
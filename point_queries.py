@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Vectorized point queries and batched rendering for show_point_costs.py
+
+- CostDistribution: count, mean, std, min, max and approximate quantiles of
+  a column in one pass per chunk. Quantiles come from a log-bucketed
+  histogram with a bounded relative error, so chunks can be folded in one
+  at a time like CostAggregator.
+- top_points: top-N rows by a column with np.argpartition instead of a full sort.
+- render_point_cards / render_point_lines: format N points at once with
+  column-wise string operations and return one string to write, instead of
+  printing row by row.
+- write_points: JSON or CSV output of points for scripting.
+"""
+
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+from cleanup_schema import DATE_COLUMN, DATE_FORMAT
+
+OUTPUT_FORMATS = ['text', 'json', 'csv']
+
+class CostDistribution:
+    """
+    One-pass summary statistics and approximate quantiles of a numeric column
+
+    Quantiles are exact to within relative_accuracy (0.1% by default) of the
+    true value: positive and negative values are counted in logarithmic
+    buckets whose width grows with the value.
+    """
+
+    def __init__(self, relative_accuracy=0.001):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.zero_count = 0
+        # bucket key -> count, for values > 0 and for -values of values < 0
+        self.positive = pd.Series(dtype=np.int64)
+        self.negative = pd.Series(dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, values, relative_accuracy=0.001):
+        """Build a distribution from a fully materialized column"""
+        distribution = cls(relative_accuracy)
+        distribution.update(values)
+        return distribution
+
+    def _bucket_counts(self, magnitudes):
+        keys = np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+        if len(keys) == 0:
+            return pd.Series(dtype=np.int64)
+        offset = keys.min()
+        counts = np.bincount(keys - offset)
+        present = np.flatnonzero(counts)
+        return pd.Series(counts[present], index=present + offset)
+
+    def update(self, values):
+        """Fold a chunk of values into the distribution (NaNs are ignored)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self.total += values.sum()
+        self.total_squares += np.square(values).sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        self.zero_count += int(np.count_nonzero(values == 0))
+        self.positive = self.positive.add(self._bucket_counts(values[values > 0]), fill_value=0).astype(np.int64)
+        self.negative = self.negative.add(self._bucket_counts(-values[values < 0]), fill_value=0).astype(np.int64)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1, like pandas)"""
+        if self.count < 2:
+            return math.nan
+        variance = (self.total_squares - self.total * self.mean) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+
+        # Values in ascending order: negative buckets (largest magnitude first), zeros, positive buckets
+        negative = self.negative.sort_index(ascending=False)
+        positive = self.positive.sort_index()
+        keys = np.concatenate([negative.index, [0], positive.index]).astype(np.float64)
+        signs = np.concatenate([-np.ones(len(negative)), [0], np.ones(len(positive))])
+        counts = np.concatenate([negative.to_numpy(), [self.zero_count], positive.to_numpy()])
+
+        bucket = int(np.searchsorted(np.cumsum(counts), rank, side='right'))
+        bucket = min(bucket, len(counts) - 1)
+        if signs[bucket] == 0:
+            return 0.0
+        # Bucket k holds (gamma^(k-1), gamma^k]; its midpoint in relative terms
+        value = signs[bucket] * 2 * self.gamma ** keys[bucket] / (self.gamma + 1)
+        return float(min(max(value, self.min), self.max))
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+    def summary(self, quantiles=(0.25, 0.5, 0.75, 0.9, 0.99)):
+        """Statistics as a dict, quantiles keyed p25, p50, ..."""
+        summary = {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.min if self.count else math.nan,
+            'max': self.max if self.count else math.nan
+        }
+        for q in quantiles:
+            summary[f"p{q * 100:g}"] = self.quantile(q)
+        return summary
+
+def top_points(df, column, n=10, largest=True, mask=None):
+    """
+    The n rows with the largest (or smallest) values of column, in order
+
+    Uses np.argpartition to find the n candidates and only sorts those.
+    Rows with NaN in column are skipped; mask (boolean array) restricts the
+    candidate rows.
+    """
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    keep = ~np.isnan(values)
+    if mask is not None:
+        keep &= np.asarray(mask, dtype=bool)
+    candidates = np.flatnonzero(keep)
+    n = min(n, len(candidates))
+    if n == 0:
+        return df.iloc[[]]
+
+    keys = -values[candidates] if largest else values[candidates]
+    if n < len(candidates):
+        part = np.argpartition(keys, n - 1)[:n]
+    else:
+        part = np.arange(len(candidates))
+    # Stable order among equal values, like nlargest/nsmallest keep='first'
+    order = part[np.lexsort((candidates[part], keys[part]))]
+    return df.iloc[candidates[order]]
+
+def format_column(values, spec):
+    """Format a whole column with a printf-style spec (e.g. '%.2f') in one call"""
+    return pd.Series(np.char.mod(spec, np.asarray(values)), index=values.index)
+
+def text_column(values):
+    """A column as strings, with Cleanup Date values in MM/DD/YYYY"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.strftime(DATE_FORMAT).fillna('NaT')
+    return values.astype(str)
+
+# Detail card of one point: (line template, columns, formats); '{}' is filled in column order
+POINT_CARD_LINES = [
+    ("   Location: {}, {}", ['Zone', 'Country'], [None, None]),
+    ("   GPS: {}", ['GPS'], [None]),
+    ("   Date: {}", [DATE_COLUMN], [None]),
+    ("   Type: {}", ['Cleanup Type'], [None]),
+    ("   Group: {}", ['Group Name'], [None]),
+    ("\n   📊 ACTIVITY METRICS:", [], []),
+    ("   People: {}", ['People'], [None]),
+    ("   Pounds Collected: {}", ['Pounds'], ['%.2f']),
+    ("   Miles Covered: {}", ['Miles'], ['%.2f']),
+    ("   Bags Used: {}", ['# of bags'], [None]),
+    ("\n   💰 COST BREAKDOWN:", [], []),
+    ("   Volunteer Hours: {}", ['volunteer_hours'], ['%.2f']),
+    ("   Volunteer Cost: ${}", ['volunteer_cost'], ['%.2f']),
+    ("   Equipment Cost: ${}", ['equipment_cost'], ['%.2f']),
+    ("   Transportation Cost: ${}", ['transportation_cost'], ['%.2f']),
+    ("   Disposal Cost: ${}", ['disposal_cost'], ['%.2f']),
+    ("   Administrative Cost: ${}", ['administrative_cost'], ['%.2f']),
+    ("   Carbon Cost: ${}", ['carbon_cost'], ['%.2f']),
+    ("   TOTAL COST: ${}", ['total_cost'], ['%.2f']),
+    ("\n   📈 EFFICIENCY METRICS:", [], []),
+    ("   Cost per Person: ${}", ['cost_per_person'], ['%.2f']),
+    ("   Cost per Pound: ${}", ['cost_per_pound'], ['%.2f']),
+    ("   Pounds per Person: {}", ['pounds_per_person'], ['%.2f']),
+    ("   Pounds per Hour: {}", ['pounds_per_hour'], ['%.2f']),
+    ("   Miles per Person: {}", ['miles_per_person'], ['%.2f'])
+]
+
+def render_template(df, template, columns, formats):
+    """One formatted line per row of df for a '{}' template"""
+    pieces = template.split('{}')
+    line = pd.Series(pieces[0], index=df.index)
+    for piece, column, spec in zip(pieces[1:], columns, formats):
+        values = format_column(df[column], spec) if spec else text_column(df[column])
+        line = line + values + piece
+    return line
+
+def render_point_cards(df, start_number=1):
+    """Detail cards of every point in df as one string"""
+    if len(df) == 0:
+        return ''
+    numbers = pd.Series(np.arange(start_number, start_number + len(df)).astype(str), index=df.index)
+    cards = "\n📍 CLEANUP POINT #" + numbers
+    for template, columns, formats in POINT_CARD_LINES:
+        cards = cards + "\n" + render_template(df, template, columns, formats)
+    cards = cards + "\n" + "-" * 100
+    return "\n".join(cards) + "\n"
+
+def render_point_lines(df, template, columns, formats, start_number=1):
+    """Numbered one-line summaries ('   1. ...') of every point in df as one string"""
+    if len(df) == 0:
+        return ''
+    numbers = pd.Series(np.char.mod('%2d', np.arange(start_number, start_number + len(df))), index=df.index)
+    lines = "   " + numbers + ". " + render_template(df, template, columns, formats)
+    return "\n".join(lines) + "\n"
+
+def write_points(df, fmt, output=None):
+    """
+    Write points as JSON records or CSV to output (path or file object, default stdout)
+    """
+    out = sys.stdout if output is None else output
+    if fmt == 'json':
+        # A JSON array with one record per line keeps large dumps greppable
+        records = df.to_json(orient='records', date_format='iso', lines=True).splitlines() if len(df) else []
+        text = "[\n" + ",\n".join(records) + "\n]\n" if records else "[]\n"
+    elif fmt == 'csv':
+        text = df.to_csv(index=False, date_format=DATE_FORMAT)
+    else:
+        raise ValueError(f"Unknown output format '{fmt}'")
+
+    if isinstance(out, str):
+        with open(out, 'w') as f:
+            f.write(text)
+    else:
+        out.write(text)
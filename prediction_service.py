@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Local prediction service for registered cleanup classifiers
+
+PredictionService starts a worker process that loads the requested models
+from the registry (model_registry.py) once, then answers prediction
+requests from a queue. The requests that queued up while the worker was
+busy (plus any arriving within max_wait_ms, up to max_batch_rows records)
+are micro-batched: the records for each model are transformed and
+predicted in one call, and each caller gets its own slice of the labels
+back. Callers can submit from any number of threads; submit returns a
+Future.
+
+Usage:
+    python prediction_service.py MODEL [RECORDS_FILE] [--request-rows N]
+
+With a records file (any dataset load_dataset reads) the predictions are
+printed as JSON lines. Without one, JSON records (one object, or a list of
+objects, per line) are read from stdin and answered line by line, so
+another process can use the service through a pipe.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from model_registry import REGISTRY_DIR, load_model
+
+DEFAULT_MAX_BATCH_ROWS = 1024
+# Waiting adds latency to every request; busy periods batch up on their own
+DEFAULT_MAX_WAIT_MS = 0
+# How often the dispatcher checks that the worker is still alive while waiting for responses
+WORKER_POLL_SECONDS = 0.5
+
+def _predict_batch(bundles, batch, responses):
+    """Answer a micro-batch: one predict call per model, results split back per request"""
+    by_model = {}
+    for request_id, model_name, records in batch:
+        by_model.setdefault(model_name, []).append((request_id, records))
+
+    for model_name, requests in by_model.items():
+        bundle = bundles.get(model_name)
+        if bundle is None:
+            for request_id, _ in requests:
+                responses.put((request_id, 'error', f"Model '{model_name}' is not loaded"))
+            continue
+        try:
+            labels = bundle.predict([record for _, records in requests for record in records]).tolist()
+        except Exception as e:
+            if len(requests) == 1:
+                responses.put((requests[0][0], 'error', f"{type(e).__name__}: {e}"))
+            else:
+                # Retry one by one so a bad request does not fail the others
+                for request_id, records in requests:
+                    _predict_batch(bundles, [(request_id, model_name, records)], responses)
+            continue
+
+        offset = 0
+        for request_id, records in requests:
+            responses.put((request_id, 'ok', labels[offset:offset + len(records)]))
+            offset += len(records)
+
+def serve(model_names, registry_dir, requests, responses, max_batch_rows, max_wait_ms):
+    """Worker process: load the models once, then answer micro-batches until a None request"""
+    try:
+        bundles = {name: load_model(name, registry_dir=registry_dir) for name in model_names}
+    except Exception as e:
+        responses.put((None, 'error', f"{type(e).__name__}: {e}"))
+        return
+    responses.put((None, 'ready', {name: bundle.meta for name, bundle in bundles.items()}))
+
+    stopping = False
+    while not stopping:
+        request = requests.get()
+        if request is None:
+            break
+        batch = [request]
+        rows = len(request[2])
+        deadline = time.monotonic() + max_wait_ms / 1000
+        while rows < max_batch_rows:
+            try:
+                request = requests.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if request is None:
+                stopping = True
+                break
+            batch.append(request)
+            rows += len(request[2])
+        _predict_batch(bundles, batch, responses)
+
+    responses.put((None, 'stopped', None))
+
+class PredictionService:
+    """
+    Client of a prediction worker process; use as a context manager or call start()/close()
+    """
+
+    def __init__(self, model_names, registry_dir=REGISTRY_DIR, max_batch_rows=DEFAULT_MAX_BATCH_ROWS,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, start_timeout=300):
+        self.model_names = [model_names] if isinstance(model_names, str) else list(model_names)
+        self.registry_dir = registry_dir
+        self.max_batch_rows = max_batch_rows
+        self.max_wait_ms = max_wait_ms
+        self.start_timeout = start_timeout
+        self.models = {}
+        self._ids = itertools.count()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stopped_reason = None
+        self._process = None
+
+    def start(self):
+        """Start the worker and wait until it has loaded every model"""
+        # spawn: a clean interpreter, safe to start from notebooks and threaded programs
+        context = multiprocessing.get_context('spawn')
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=serve, daemon=True,
+            args=(self.model_names, self.registry_dir, self._requests, self._responses,
+                  self.max_batch_rows, self.max_wait_ms))
+        self._process.start()
+
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            try:
+                _, status, payload = self._responses.get(timeout=WORKER_POLL_SECONDS)
+                break
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError(f"Prediction service worker exited during startup "
+                                       f"(exit code {self._process.exitcode})")
+                if time.monotonic() > deadline:
+                    self._process.kill()
+                    raise RuntimeError(f"Prediction service did not start within {self.start_timeout}s")
+        if status != 'ready':
+            self._process.join()
+            raise RuntimeError(f"Prediction service failed to load models: {payload}")
+        self.models = payload
+        self._stopped_reason = None
+
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def _dispatch(self):
+        """
+        Hand each response to the Future of its request
+
+        Stops at the worker's 'stopped' message, or when the worker has died
+        (crash, OOM kill) with its responses drained; the requests still
+        pending then fail instead of waiting forever.
+        """
+        process = self._process
+        reason = "Prediction service stopped"
+        worker_gone = False
+        while True:
+            try:
+                request_id, status, payload = self._responses.get(
+                    timeout=0 if worker_gone else WORKER_POLL_SECONDS)
+            except queue.Empty:
+                if worker_gone:
+                    break
+                # Drain what the worker sent before it died, then give up on the rest
+                worker_gone = not process.is_alive()
+                if worker_gone:
+                    reason = f"Prediction service worker exited (exit code {process.exitcode})"
+                continue
+            if request_id is None:
+                break
+            with self._pending_lock:
+                future = self._pending.pop(request_id)
+            if status == 'ok':
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+        # Anything still pending will not be answered
+        with self._pending_lock:
+            self._stopped_reason = reason
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(reason))
+
+    def submit(self, model_name, records):
+        """Queue records (list of dicts or DataFrame) for prediction; returns a Future of the label list"""
+        if self._process is None or not self._process.is_alive():
+            raise RuntimeError("Prediction service is not running")
+        if isinstance(records, pd.DataFrame):
+            records = records.to_dict('records')
+        future = Future()
+        with self._pending_lock:
+            if self._stopped_reason is not None:
+                raise RuntimeError(self._stopped_reason)
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        self._requests.put((request_id, model_name, list(records)))
+        return future
+
+    def predict(self, model_name, records, timeout=None):
+        """Predicted labels of records"""
+        return self.submit(model_name, records).result(timeout)
+
+    def predict_one(self, model_name, record, timeout=None):
+        """Predicted label of a single record (dict)"""
+        return self.predict(model_name, [record], timeout)[0]
+
+    def close(self):
+        """Finish the queued requests and stop the worker"""
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            self._requests.put(None)
+        self._process.join()
+        # Stops the dispatcher even if the worker died without saying so
+        self._responses.put((None, 'stopped', None))
+        self._dispatcher.join()
+        self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def json_default(value):
+    """JSON encoding of the numpy/pandas scalars in labels"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+def predict_file(service, model_name, records_file, request_rows):
+    """Print a JSON line with the prediction of every record of a dataset file"""
+    from data_storage import load_dataset
+    df = load_dataset(records_file)
+    futures = [service.submit(model_name, df.iloc[start:start + request_rows])
+               for start in range(0, len(df), request_rows)]
+    ids = df['Cleanup ID'] if 'Cleanup ID' in df.columns else pd.Series(range(len(df)))
+    labels = [label for future in futures for label in future.result()]
+    for cleanup_id, label in zip(ids, labels):
+        print(json.dumps({'Cleanup ID': cleanup_id, 'prediction': label}, default=json_default))
+
+def predict_stdin(service, model_name):
+    """Answer each stdin line (a JSON record or list of records) with a JSON line, in order"""
+    answers = queue.Queue()
+
+    def print_answers():
+        while True:
+            answer = answers.get()
+            if answer is None:
+                return
+            future, single = answer
+            try:
+                labels = future.result()
+                print(json.dumps({'prediction': labels[0] if single else labels}, default=json_default), flush=True)
+            except RuntimeError as e:
+                print(json.dumps({'error': str(e)}), flush=True)
+
+    printer = threading.Thread(target=print_answers)
+    printer.start()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            future = Future()
+            future.set_exception(RuntimeError(f"Invalid JSON: {e}"))
+            answers.put((future, True))
+            continue
+        single = not isinstance(payload, list)
+        answers.put((service.submit(model_name, [payload] if single else payload), single))
+    answers.put(None)
+    printer.join()
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict labels for cleanup records with a registered model")
+    parser.add_argument('model', help='Registered model name (see: python model_registry.py list)')
+    parser.add_argument('records', nargs='?', default=None,
+                        help='Dataset file of records (default: JSON records per line on stdin)')
+    parser.add_argument('--registry', default=REGISTRY_DIR, help='Registry directory')
+    parser.add_argument('--request-rows', type=int, default=256, help='Records per request when reading a file')
+    parser.add_argument('--max-batch-rows', type=int, default=DEFAULT_MAX_BATCH_ROWS)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    service = PredictionService(args.model, args.registry, args.max_batch_rows, args.max_wait_ms)
+    try:
+        service.start()
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.records is not None:
+            predict_file(service, args.model, args.records, args.request_rows)
+        else:
+            predict_stdin(service, args.model)
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,51 @@
 Script to display cost information for individual cleanup points
 """
 
+import argparse
 import pandas as pd
 import sys
+import time
 
-def show_point_costs(csv_file='data/global_ocean_cleanup_data_with_costs.csv', limit=10):
+from cleanup_schema import DATE_COLUMN
+from data_storage import load_dataset
+from lookup_index import load_lookup_index
+from point_queries import (OUTPUT_FORMATS, CostDistribution, render_point_cards, render_point_lines,
+                           render_template, top_points, write_points)
+from spatial_index import build_spatial_index, load_spatial_index
+
+DEFAULT_COST_DATA = 'data/global_ocean_cleanup_data_with_costs'
+
+# One-line point summaries: (template, columns, printf formats)
+EXPENSIVE_POINT_LINE = ("{} - ${} ({} people, {} lbs)", ['Country', 'total_cost', 'People', 'Pounds'],
+                        [None, '%.2f', None, '%.1f'])
+EFFICIENT_POINT_LINE = ("{} - ${}/lb ({} people, {} lbs)", ['Country', 'cost_per_pound', 'People', 'Pounds'],
+                        [None, '%.2f', None, '%.1f'])
+PAGE_POINT_LINES = ("\n   📍 {} - ${}\n      Date: {}, People: {}, Pounds: {}",
+                    ['Zone', 'total_cost', DATE_COLUMN, 'People', 'Pounds'], [None, '%.2f', None, None, '%.1f'])
+NEARBY_POINT_LINES = ("{} ({} km) - ${}\n       GPS: {}, Date: {}, People: {}, Pounds: {}",
+                      ['Zone', 'distance_km', 'total_cost', 'GPS', DATE_COLUMN, 'People', 'Pounds'],
+                      [None, '%.1f', '%.2f', None, None, None, '%.1f'])
+
+def show_point_costs(csv_file=DEFAULT_COST_DATA, limit=10, fmt='text', output=None):
     """
     Display cost information for individual cleanup points
+    
+    fmt='json' or 'csv' writes the first limit points to output (default
+    stdout) instead of the report.
     """
+    if fmt != 'text':
+        try:
+            df = load_dataset(csv_file)
+        except FileNotFoundError:
+            print(f"File {csv_file} not found. Please run add_costs_to_existing_data.py first.", file=sys.stderr)
+            return
+        write_points(df.head(limit), fmt, output)
+        return
+    
     print("Loading global cleanup data with costs...")
     
     try:
-        df = pd.read_csv(csv_file)
+        df = load_dataset(csv_file)
         print(f"Loaded {len(df)} cleanup records with cost data")
     except FileNotFoundError:
         print(f"File {csv_file} not found. Please run add_costs_to_existing_data.py first.")
@@ -23,113 +57,317 @@ def show_point_costs(csv_file='data/global_ocean_cleanup_data_with_costs.csv', l
     print("INDIVIDUAL CLEANUP POINT COST ANALYSIS")
     print(f"{'='*100}")
     
-    # Show sample of points with their costs
-    sample_df = df.head(limit)
-    
-    for idx, row in sample_df.iterrows():
-        print(f"\n📍 CLEANUP POINT #{idx+1}")
-        print(f"   Location: {row['Zone']}, {row['Country']}")
-        print(f"   GPS: {row['GPS']}")
-        print(f"   Date: {row['Cleanup Date']}")
-        print(f"   Type: {row['Cleanup Type']}")
-        print(f"   Group: {row['Group Name']}")
-        
-        print(f"\n   📊 ACTIVITY METRICS:")
-        print(f"   People: {row['People']}")
-        print(f"   Pounds Collected: {row['Pounds']:.2f}")
-        print(f"   Miles Covered: {row['Miles']:.2f}")
-        print(f"   Bags Used: {row['# of bags']}")
-        
-        print(f"\n   💰 COST BREAKDOWN:")
-        print(f"   Volunteer Hours: {row['volunteer_hours']:.2f}")
-        print(f"   Volunteer Cost: ${row['volunteer_cost']:.2f}")
-        print(f"   Equipment Cost: ${row['equipment_cost']:.2f}")
-        print(f"   Transportation Cost: ${row['transportation_cost']:.2f}")
-        print(f"   Disposal Cost: ${row['disposal_cost']:.2f}")
-        print(f"   Administrative Cost: ${row['administrative_cost']:.2f}")
-        print(f"   Carbon Cost: ${row['carbon_cost']:.2f}")
-        print(f"   TOTAL COST: ${row['total_cost']:.2f}")
-        
-        print(f"\n   📈 EFFICIENCY METRICS:")
-        print(f"   Cost per Person: ${row['cost_per_person']:.2f}")
-        print(f"   Cost per Pound: ${row['cost_per_pound']:.2f}")
-        print(f"   Pounds per Person: {row['pounds_per_person']:.2f}")
-        print(f"   Pounds per Hour: {row['pounds_per_hour']:.2f}")
-        print(f"   Miles per Person: {row['miles_per_person']:.2f}")
-        
-        print("-" * 100)
-    
-    # Show cost statistics
+    # Show sample of points with their costs, formatted in one batch
+    sys.stdout.write(render_point_cards(df.head(limit)))
+    
+    # Show cost statistics (one pass; the median is approximate to within 0.1%)
+    stats = CostDistribution.from_values(df['total_cost']).summary()
     print(f"\n📊 COST STATISTICS SUMMARY:")
-    print(f"   Average Cost per Point: ${df['total_cost'].mean():.2f}")
-    print(f"   Median Cost per Point: ${df['total_cost'].median():.2f}")
-    print(f"   Min Cost per Point: ${df['total_cost'].min():.2f}")
-    print(f"   Max Cost per Point: ${df['total_cost'].max():.2f}")
-    print(f"   Standard Deviation: ${df['total_cost'].std():.2f}")
+    print(f"   Average Cost per Point: ${stats['mean']:.2f}")
+    print(f"   Median Cost per Point: ${stats['p50']:.2f}")
+    print(f"   Min Cost per Point: ${stats['min']:.2f}")
+    print(f"   Max Cost per Point: ${stats['max']:.2f}")
+    print(f"   Standard Deviation: ${stats['std']:.2f}")
     
     # Show most expensive points
     print(f"\n💸 TOP 10 MOST EXPENSIVE CLEANUP POINTS:")
-    expensive_points = df.nlargest(10, 'total_cost')
-    for i, (idx, row) in enumerate(expensive_points.iterrows(), 1):
-        print(f"   {i:2d}. {row['Country']} - ${row['total_cost']:.2f} ({row['People']} people, {row['Pounds']:.1f} lbs)")
+    expensive_points = top_points(df, 'total_cost', 10)
+    sys.stdout.write(render_point_lines(expensive_points, *EXPENSIVE_POINT_LINE))
     
     # Show most efficient points (lowest cost per pound)
     print(f"\n🏆 TOP 10 MOST EFFICIENT CLEANUP POINTS (lowest cost per pound):")
-    efficient_points = df[df['Pounds'] > 0].nsmallest(10, 'cost_per_pound')
-    for i, (idx, row) in enumerate(efficient_points.iterrows(), 1):
-        print(f"   {i:2d}. {row['Country']} - ${row['cost_per_pound']:.2f}/lb ({row['People']} people, {row['Pounds']:.1f} lbs)")
+    efficient_points = top_points(df, 'cost_per_pound', 10, largest=False, mask=(df['Pounds'] > 0).to_numpy())
+    sys.stdout.write(render_point_lines(efficient_points, *EFFICIENT_POINT_LINE))
 
-def search_points_by_country(country, csv_file='data/global_ocean_cleanup_data_with_costs.csv'):
+def show_top_points(n=10, column='total_cost', largest=True, csv_file=DEFAULT_COST_DATA, fmt='text', output=None):
     """
-    Search and display points for a specific country
+    Display (or write as JSON/CSV) the n points with the largest or smallest column values
     """
     try:
-        df = pd.read_csv(csv_file)
-        country_data = df[df['Country'].str.contains(country, case=False, na=False)]
-        
-        if len(country_data) == 0:
-            print(f"No cleanup points found for country: {country}")
-            return
-        
-        print(f"\n🌍 CLEANUP POINTS IN {country.upper()}")
-        print(f"Found {len(country_data)} cleanup points")
-        
-        total_cost = country_data['total_cost'].sum()
-        total_people = country_data['People'].sum()
-        total_pounds = country_data['Pounds'].sum()
-        
-        print(f"\nCountry Summary:")
-        print(f"   Total Cost: ${total_cost:,.2f}")
-        print(f"   Total People: {total_people:,}")
-        print(f"   Total Pounds: {total_pounds:,.2f}")
-        print(f"   Average Cost per Point: ${total_cost/len(country_data):,.2f}")
-        
-        # Show individual points
-        for idx, row in country_data.iterrows():
-            print(f"\n   📍 {row['Zone']} - ${row['total_cost']:.2f}")
-            print(f"      Date: {row['Cleanup Date']}, People: {row['People']}, Pounds: {row['Pounds']:.1f}")
+        df = load_dataset(csv_file)
+    except FileNotFoundError:
+        print(f"File {csv_file} not found. Please run add_costs_to_existing_data.py first.", file=sys.stderr)
+        return None
+    if column not in df.columns:
+        print(f"Unknown column: {column}", file=sys.stderr)
+        return None
+    
+    points = top_points(df, column, n, largest)
+    if fmt != 'text':
+        write_points(points, fmt, output)
+        return points
+    
+    print(f"\n{'💸' if largest else '🏆'} TOP {len(points)} CLEANUP POINTS BY {'HIGHEST' if largest else 'LOWEST'} {column}:")
+    sys.stdout.write(render_point_lines(points, f"{{}} ({{}}) - {column}: {{}} (${{}} total, {{}} people, {{}} lbs)",
+                                        ['Zone', DATE_COLUMN, column, 'total_cost', 'People', 'Pounds'],
+                                        [None, None, '%.2f', '%.2f', None, '%.1f']))
+    return points
+
+def show_cost_distribution(column='total_cost', csv_file=DEFAULT_COST_DATA, fmt='text', output=None):
+    """
+    Display one-pass summary statistics and approximate quantiles of a column
+    """
+    try:
+        values = load_dataset(csv_file, columns=[column])[column]
+    except FileNotFoundError:
+        print(f"File {csv_file} not found. Please run add_costs_to_existing_data.py first.", file=sys.stderr)
+        return None
+    
+    stats = CostDistribution.from_values(values).summary()
+    if fmt != 'text':
+        write_points(pd.DataFrame([{'column': column, **stats}]), fmt, output)
+        return stats
+    
+    print(f"\n📊 DISTRIBUTION OF {column} (quantiles approximate to within 0.1%):")
+    for name, value in stats.items():
+        print(f"   {name:>6}: {value:,}" if name == 'count' else f"   {name:>6}: {value:,.2f}")
+    return stats
+
+def print_point_page(points, limit=20, page=1):
+    """
+    Print one page of limit points (pages start at 1)
+    """
+    num_pages = max(1, -(-len(points) // limit))
+    page_points = points.iloc[(page - 1) * limit:page * limit]
+    
+    if len(page_points) > 0:
+        sys.stdout.write("\n".join(render_template(page_points, *PAGE_POINT_LINES)) + "\n")
+    
+    print(f"\n   Page {page} of {num_pages} ({len(page_points)} of {len(points)} points)")
+    if page < num_pages:
+        print(f"   Use --page {page + 1} for more")
+
+def search_points(title, csv_file=DEFAULT_COST_DATA, limit=20, page=1, fmt='text', output=None, **query):
+    """
+    Look up points through the dataset's lookup index and display a summary and one page of them
+    
+    query holds the country, zone, start_date and end_date arguments of
+    LookupIndex.query. fmt='json' or 'csv' writes the page of points to
+    output (default stdout) instead.
+    """
+    try:
+        index = load_lookup_index(csv_file)
+    except FileNotFoundError:
+        print(f"File {csv_file} not found.", file=sys.stderr if fmt != 'text' else sys.stdout)
+        return None
     
+    points = index.query(**query)
+    if fmt != 'text':
+        write_points(points.iloc[(page - 1) * limit:page * limit], fmt, output)
+        return points
+    if len(points) == 0:
+        print(f"No cleanup points found for {title}")
+        return points
+    
+    print(f"\n🌍 CLEANUP POINTS IN {title.upper()}")
+    print(f"Found {len(points)} cleanup points")
+    
+    total_cost = points['total_cost'].sum()
+    total_people = points['People'].sum()
+    total_pounds = points['Pounds'].sum()
+    
+    print(f"\nSummary:")
+    print(f"   Total Cost: ${total_cost:,.2f}")
+    print(f"   Total People: {total_people:,}")
+    print(f"   Total Pounds: {total_pounds:,.2f}")
+    print(f"   Average Cost per Point: ${total_cost/len(points):,.2f}")
+    
+    print_point_page(points, limit, page)
+    return points
+
+def date_range_title(start_date=None, end_date=None):
+    """' from <start> to <end>' suffix for search titles"""
+    title = ""
+    if start_date:
+        title += f" from {start_date}"
+    if end_date:
+        title += f" to {end_date}"
+    return title
+
+def search_points_by_country(country, csv_file=DEFAULT_COST_DATA, limit=20, page=1, start_date=None, end_date=None,
+                             fmt='text', output=None):
+    """
+    Search and display points for countries whose name contains country
+    """
+    return search_points(country + date_range_title(start_date, end_date), csv_file, limit, page, fmt, output,
+                         country=country, start_date=start_date, end_date=end_date)
+
+def search_points_by_zone(zone, csv_file=DEFAULT_COST_DATA, limit=20, page=1, start_date=None, end_date=None,
+                          fmt='text', output=None):
+    """
+    Search and display points for zones (e.g. "Kerala") whose name contains zone
+    """
+    return search_points(zone + date_range_title(start_date, end_date), csv_file, limit, page, fmt, output,
+                         zone=zone, start_date=start_date, end_date=end_date)
+
+def search_points_by_date(start_date=None, end_date=None, csv_file=DEFAULT_COST_DATA, limit=20, page=1, fmt='text',
+                          output=None):
+    """
+    Search and display points with a cleanup date in [start_date, end_date]
+    """
+    return search_points("all countries" + date_range_title(start_date, end_date), csv_file, limit, page, fmt, output,
+                         start_date=start_date, end_date=end_date)
+
+def open_spatial_index(csv_file=DEFAULT_COST_DATA):
+    """
+    Open the saved spatial index of the costed data, building it on first use (None if the file is missing)
+    """
+    start = time.perf_counter()
+    try:
+        index = load_spatial_index(csv_file, rebuild=False)
+        action = "Loaded spatial index of"
+        if index is None:
+            index = build_spatial_index(csv_file)
+            action = "Built and saved spatial index of"
     except FileNotFoundError:
-        print(f"File {csv_file} not found.")
+        print(f"File {csv_file} not found. Please run add_costs_to_existing_data.py first.")
+        return None
+    
+    print(f"{action} {len(index):,} cleanup points in {time.perf_counter() - start:.2f}s")
+    return index
+
+def print_nearby_points(points):
+    """One numbered entry per point of a nearest/radius query result"""
+    sys.stdout.write(render_point_lines(points, *NEARBY_POINT_LINES))
+
+def show_nearest_points(lat, lon, k=5, csv_file=DEFAULT_COST_DATA):
+    """
+    Display the k cleanup points closest to a location
+    """
+    index = open_spatial_index(csv_file)
+    if index is None:
+        return
+    
+    start = time.perf_counter()
+    points = index.nearest(lat, lon, k)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    print(f"\n📍 {len(points)} NEAREST CLEANUP POINTS TO ({lat}, {lon}) [{elapsed_ms:.1f} ms]")
+    print_nearby_points(points)
+
+def show_points_within_radius(lat, lon, radius_km, limit=20, csv_file=DEFAULT_COST_DATA):
+    """
+    Display cleanup points within radius_km of a location, nearest first
+    """
+    index = open_spatial_index(csv_file)
+    if index is None:
+        return
+    
+    start = time.perf_counter()
+    points = index.within_radius(lat, lon, radius_km)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    print(f"\n🎯 CLEANUP POINTS WITHIN {radius_km:g} KM OF ({lat}, {lon}) [{elapsed_ms:.1f} ms]")
+    print(f"Found {len(points)} cleanup points, total cost ${points['total_cost'].sum():,.2f}")
+    print_nearby_points(points.head(limit))
+    if len(points) > limit:
+        print(f"   ... and {len(points) - limit} more")
+
+def show_bbox_totals(south, west, north, east, csv_file=DEFAULT_COST_DATA):
+    """
+    Display cost totals for the cleanup points inside a bounding box
+    """
+    index = open_spatial_index(csv_file)
+    if index is None:
+        return
+    
+    start = time.perf_counter()
+    totals = index.bbox_totals(south, west, north, east)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    print(f"\n🗺️  COST TOTALS FOR LAT {south} TO {north}, LON {west} TO {east} [{elapsed_ms:.1f} ms]")
+    events = int(totals['events'])
+    print(f"   Cleanup Events: {events:,}")
+    if events == 0:
+        return
+    print(f"   Total People: {int(totals['People']):,}")
+    print(f"   Total Pounds: {totals['Pounds']:,.2f}")
+    print(f"   Volunteer Cost: ${totals['volunteer_cost']:,.2f}")
+    print(f"   Direct Costs: ${totals['total_direct_costs']:,.2f}")
+    print(f"   Carbon Cost: ${totals['carbon_cost']:,.2f}")
+    print(f"   TOTAL COST: ${totals['total_cost']:,.2f}")
+    print(f"   Average Cost per Point: ${totals['total_cost']/events:,.2f}")
 
 def main():
     """
     Main function
     """
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "search":
-            if len(sys.argv) > 2:
-                search_points_by_country(sys.argv[2])
-            else:
-                print("Usage: python show_point_costs.py search <country_name>")
-        else:
-            try:
-                limit = int(sys.argv[1])
-                show_point_costs(limit=limit)
-            except ValueError:
-                print("Usage: python show_point_costs.py [number_of_points] or python show_point_costs.py search <country>")
+    parser = argparse.ArgumentParser(description="Display costs of individual cleanup points")
+    parser.add_argument('--data', default=DEFAULT_COST_DATA, help="Costed dataset to read")
+    commands = parser.add_subparsers(dest='command')
+    
+    list_parser = commands.add_parser('list', help="Show the first N points and overall statistics")
+    list_parser.add_argument('limit', type=int, nargs='?', default=10)
+    
+    top_parser = commands.add_parser('top', help="The N points with the highest (or --smallest) values of a column")
+    top_parser.add_argument('n', type=int, nargs='?', default=10)
+    top_parser.add_argument('--by', default='total_cost', help="Column to rank by")
+    top_parser.add_argument('--smallest', action='store_true', help="Rank lowest values first")
+    
+    stats_parser = commands.add_parser('stats', help="Summary statistics and approximate quantiles of a column")
+    stats_parser.add_argument('--column', default='total_cost')
+    
+    search_parsers = {
+        'search': commands.add_parser('search', help="Points in countries whose name contains COUNTRY"),
+        'zone': commands.add_parser('zone', help="Points in zones whose name contains ZONE"),
+        'dates': commands.add_parser('dates', help="Points with a cleanup date in a range")
+    }
+    search_parsers['search'].add_argument('country')
+    search_parsers['zone'].add_argument('zone')
+    for search_parser in search_parsers.values():
+        search_parser.add_argument('--from', dest='start_date', default=None, help="First cleanup date (e.g. 2025-01-31)")
+        search_parser.add_argument('--to', dest='end_date', default=None, help="Last cleanup date")
+        search_parser.add_argument('--limit', type=int, default=20, help="Points per page")
+        search_parser.add_argument('--page', type=int, default=1)
+    
+    # Machine-readable output for scripting
+    for output_parser in [list_parser, top_parser, stats_parser, *search_parsers.values()]:
+        output_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text')
+        output_parser.add_argument('--output', default=None, help="Write json/csv output to this file instead of stdout")
+    
+    nearest_parser = commands.add_parser('nearest', help="The K cleanup points closest to a location")
+    nearest_parser.add_argument('lat', type=float)
+    nearest_parser.add_argument('lon', type=float)
+    nearest_parser.add_argument('k', type=int, nargs='?', default=5)
+    
+    radius_parser = commands.add_parser('radius', help="Cleanup points within RADIUS_KM of a location")
+    radius_parser.add_argument('lat', type=float)
+    radius_parser.add_argument('lon', type=float)
+    radius_parser.add_argument('radius_km', type=float)
+    radius_parser.add_argument('--limit', type=int, default=20)
+    
+    bbox_parser = commands.add_parser('bbox', help="Cost totals of the cleanup points inside a bounding box")
+    for edge in ('south', 'west', 'north', 'east'):
+        bbox_parser.add_argument(edge, type=float)
+    
+    # "show_point_costs.py 25" is shorthand for "list 25"
+    argv = sys.argv[1:]
+    if argv and argv[0].isdigit():
+        argv = ['list'] + argv
+    args = parser.parse_args(argv)
+    
+    if args.command == 'search':
+        search_points_by_country(args.country, args.data, args.limit, args.page, args.start_date, args.end_date,
+                                 args.format, args.output)
+    elif args.command == 'zone':
+        search_points_by_zone(args.zone, args.data, args.limit, args.page, args.start_date, args.end_date,
+                              args.format, args.output)
+    elif args.command == 'dates':
+        search_points_by_date(args.start_date, args.end_date, args.data, args.limit, args.page, args.format, args.output)
+    elif args.command == 'top':
+        show_top_points(args.n, args.by, not args.smallest, args.data, args.format, args.output)
+    elif args.command == 'stats':
+        show_cost_distribution(args.column, args.data, args.format, args.output)
+    elif args.command == 'nearest':
+        show_nearest_points(args.lat, args.lon, args.k, args.data)
+    elif args.command == 'radius':
+        show_points_within_radius(args.lat, args.lon, args.radius_km, args.limit, args.data)
+    elif args.command == 'bbox':
+        show_bbox_totals(args.south, args.west, args.north, args.east, args.data)
+    elif args.command == 'list':
+        show_point_costs(args.data, args.limit, args.format, args.output)
     else:
-        show_point_costs()
+        show_point_costs(args.data)
 
 if __name__ == "__main__":
     main()
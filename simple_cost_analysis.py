@@ -4,42 +4,66 @@ Simple cost analysis script that creates cost summaries and basic visualizations
 without requiring additional mapping libraries
 """
 
-import pandas as pd
+import argparse
+import sys
+
 import matplotlib.pyplot as plt
-import numpy as np
-from cost_calculator import OceanCleanupCostCalculator
+import cleanup_schema
+import cost_aggregation
+import cost_calculator
+import data_storage
+from artifact_cache import ArtifactCache, default_cache, source_fingerprint
+from cost_aggregation import COST_RANGES, COUNTRY_ANALYSIS_FILE, CostAggregator, country_cost_table
+from cost_calculator import OceanCleanupCostCalculator, SWEEP_PARAMETERS, load_sweep_grid
+from data_storage import load_dataset, resolve_dataset_path
+from instrumentation import instrumented
+
+DEFAULT_COST_DATA = 'data/global_ocean_cleanup_data_with_costs'
+REPORT_PLOTS = ['plots/global_cost_analysis.png', 'plots/country_efficiency_analysis.png']
+SCENARIO_PLOT = 'plots/scenario_sweep.png'
 
-def create_cost_analysis_report(csv_file='data/global_ocean_cleanup_data_with_costs.csv'):
+@instrumented('cost_report')
+def create_cost_analysis_report(csv_file=DEFAULT_COST_DATA, df=None, aggregator=None):
     """
     Create a comprehensive cost analysis report
-    """
-    print("Loading global cleanup data with costs...")
     
-    # Load the data
-    try:
-        df = pd.read_csv(csv_file)
-        print(f"Loaded {len(df)} cleanup records with cost data")
-    except FileNotFoundError:
-        print(f"File {csv_file} not found. Please run add_costs_to_existing_data.py first.")
-        return None
+    df and aggregator may be passed in (e.g. by pipeline.py) to skip
+    loading csv_file and the aggregation pass. Returns (df, aggregator) so
+    the plots and the scenario sweep can reuse the aggregation, or
+    (None, None) when csv_file is missing.
+    """
+    if df is None:
+        print("Loading global cleanup data with costs...")
+        
+        # Load the data
+        try:
+            df = load_dataset(csv_file)
+            print(f"Loaded {len(df)} cleanup records with cost data")
+        except FileNotFoundError:
+            print(f"File {csv_file} not found. Please run add_costs_to_existing_data.py first.")
+            return None, None
     
     # Create comprehensive analysis
     print("\n" + "="*80)
     print("GLOBAL OCEAN CLEANUP COST ANALYSIS REPORT")
     print("="*80)
     
+    # One pass over the data feeds every statistic below
+    if aggregator is None:
+        aggregator = CostAggregator.from_dataframe(df)
+    
     # Basic statistics
-    total_events = len(df)
-    total_people = df['People'].sum()
-    total_pounds = df['Pounds'].sum()
-    total_miles = df['Miles'].sum()
-    total_countries = df['Country'].nunique()
+    total_events = aggregator.total_events
+    total_people = aggregator.total('People')
+    total_pounds = aggregator.total('Pounds')
+    total_miles = aggregator.total('Miles')
+    total_countries = aggregator.total_countries
     
     # Cost statistics
-    total_volunteer_cost = df['volunteer_cost'].sum()
-    total_direct_costs = df['total_direct_costs'].sum()
-    total_carbon_cost = df['carbon_cost'].sum()
-    total_cost = df['total_cost'].sum()
+    total_volunteer_cost = aggregator.total('volunteer_cost')
+    total_direct_costs = aggregator.total('total_direct_costs')
+    total_carbon_cost = aggregator.total('carbon_cost')
+    total_cost = aggregator.total('total_cost')
     
     print(f"OVERVIEW:")
     print(f"   Total Cleanup Events: {total_events:,}")
@@ -59,21 +83,12 @@ def create_cost_analysis_report(csv_file='data/global_ocean_cleanup_data_with_co
     print(f"   Average Cost per Person: ${total_cost/total_people:,.2f}")
     print(f"   Average Cost per Pound: ${total_cost/total_pounds:,.2f}")
     print(f"   Average Pounds per Person: {total_pounds/total_people:.2f}")
-    print(f"   Average Pounds per Hour: {total_pounds/(df['volunteer_hours'].sum()):.2f}")
+    print(f"   Average Pounds per Hour: {total_pounds/aggregator.total('volunteer_hours'):.2f}")
     
     # Country analysis
     print(f"\nTOP 15 COUNTRIES BY TOTAL COST:")
-    country_costs = df.groupby('Country').agg({
-        'total_cost': 'sum',
-        'volunteer_cost': 'sum',
-        'total_direct_costs': 'sum',
-        'carbon_cost': 'sum',
-        'People': 'sum',
-        'Pounds': 'sum',
-        'Cleanup ID': 'count'
-    }).round(2)
-    
-    country_costs = country_costs.sort_values('total_cost', ascending=False).head(15)
+    country_stats = aggregator.country_stats()
+    country_costs = country_cost_table(aggregator)
     
     for i, (country, data) in enumerate(country_costs.iterrows(), 1):
         print(f"   {i:2d}. {country}:")
@@ -86,31 +101,16 @@ def create_cost_analysis_report(csv_file='data/global_ocean_cleanup_data_with_co
     
     # Cost distribution analysis
     print(f"\n COST DISTRIBUTION ANALYSIS:")
-    cost_ranges = [
-        (0, 100, "Very Low"),
-        (100, 500, "Low"),
-        (500, 1000, "Medium"),
-        (1000, 2000, "High"),
-        (2000, float('inf'), "Very High")
-    ]
-    
-    for min_cost, max_cost, label in cost_ranges:
-        if max_cost == float('inf'):
-            count = len(df[df['total_cost'] >= min_cost])
-        else:
-            count = len(df[(df['total_cost'] >= min_cost) & (df['total_cost'] < max_cost)])
+    range_counts = aggregator.cost_range_counts()
+    
+    for min_cost, max_cost, label in COST_RANGES:
+        count = range_counts[label]
         percentage = count / total_events * 100
         print(f"   {label} Cost (${min_cost}-{max_cost if max_cost != float('inf') else '∞'}): {count} events ({percentage:.1f}%)")
     
     # Most efficient countries
     print(f"\n MOST EFFICIENT COUNTRIES (by cost per pound):")
-    efficiency = df.groupby('Country').agg({
-        'total_cost': 'sum',
-        'Pounds': 'sum',
-        'People': 'sum'
-    })
-    efficiency['cost_per_pound'] = efficiency['total_cost'] / efficiency['Pounds']
-    efficiency['pounds_per_person'] = efficiency['Pounds'] / efficiency['People']
+    efficiency = country_stats[['total_cost', 'Pounds', 'People', 'cost_per_pound', 'pounds_per_person']]
     efficiency = efficiency[efficiency['Pounds'] > 100]  # Only countries with significant cleanup
     efficiency = efficiency.sort_values('cost_per_pound').head(10)
     
@@ -118,18 +118,27 @@ def create_cost_analysis_report(csv_file='data/global_ocean_cleanup_data_with_co
         print(f"   {i:2d}. {country}: ${data['cost_per_pound']:.2f}/pound, {data['pounds_per_person']:.2f} lbs/person")
     
     # Save detailed country analysis
-    country_analysis_file = 'data/country_cost_analysis.csv'
+    country_analysis_file = COUNTRY_ANALYSIS_FILE
     country_costs.to_csv(country_analysis_file)
     print(f"\nDetailed country analysis saved to: {country_analysis_file}")
     
-    return df
+    return df, aggregator
 
-def create_cost_visualizations(df):
+@instrumented('cost_plots')
+def create_cost_visualizations(df, aggregator=None):
     """
     Create basic cost visualizations using matplotlib
+    
+    Country and total figures come from the CostAggregator built by
+    create_cost_analysis_report (or a fresh one); only the per-event
+    histogram and scatter plots read df directly.
     """
     print("\n📊 Creating cost visualizations...")
     
+    if aggregator is None:
+        aggregator = CostAggregator.from_dataframe(df)
+    country_stats = aggregator.country_stats()
+    
     # Set up the plotting style
     plt.style.use('default')
     
@@ -138,16 +147,16 @@ def create_cost_visualizations(df):
     
     # Cost breakdown
     cost_breakdown = {
-        'Volunteer Time': df['volunteer_cost'].sum(),
-        'Direct Costs': df['total_direct_costs'].sum(),
-        'Carbon Cost': df['carbon_cost'].sum()
+        'Volunteer Time': aggregator.total('volunteer_cost'),
+        'Direct Costs': aggregator.total('total_direct_costs'),
+        'Carbon Cost': aggregator.total('carbon_cost')
     }
     
     ax1.pie(cost_breakdown.values(), labels=cost_breakdown.keys(), autopct='%1.1f%%', startangle=90)
     ax1.set_title('Total Cost Breakdown')
     
     # Top 10 countries by cost
-    top_countries = df.groupby('Country')['total_cost'].sum().sort_values(ascending=False).head(10)
+    top_countries = country_stats['total_cost'].sort_values(ascending=False).head(10)
     ax2.barh(range(len(top_countries)), top_countries.values)
     ax2.set_yticks(range(len(top_countries)))
     ax2.set_yticklabels(top_countries.index, fontsize=8)
@@ -168,30 +177,21 @@ def create_cost_visualizations(df):
     ax4.set_title('Cost vs Pounds Collected')
     
     plt.tight_layout()
-    plt.savefig('plots/global_cost_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig(REPORT_PLOTS[0], dpi=300, bbox_inches='tight')
     print("   Cost analysis plots saved to: plots/global_cost_analysis.png")
     
     # 2. Country efficiency analysis
     plt.figure(figsize=(12, 8))
     
-    country_stats = df.groupby('Country').agg({
-        'total_cost': 'sum',
-        'Pounds': 'sum',
-        'People': 'sum',
-        'Cleanup ID': 'count'
-    })
-    
     # Filter countries with significant activity
     country_stats = country_stats[country_stats['Pounds'] > 100]
-    country_stats['cost_per_pound'] = country_stats['total_cost'] / country_stats['Pounds']
-    country_stats['pounds_per_person'] = country_stats['Pounds'] / country_stats['People']
     
     # Create scatter plot
     plt.scatter(country_stats['pounds_per_person'], country_stats['cost_per_pound'], 
-               s=country_stats['Cleanup ID']*10, alpha=0.6)
+               s=country_stats['events']*10, alpha=0.6)
     
     # Add country labels for top countries
-    top_countries_by_events = country_stats.nlargest(10, 'Cleanup ID')
+    top_countries_by_events = country_stats.nlargest(10, 'events')
     for country, data in top_countries_by_events.iterrows():
         plt.annotate(country, (data['pounds_per_person'], data['cost_per_pound']), 
                     xytext=(5, 5), textcoords='offset points', fontsize=8)
@@ -202,27 +202,117 @@ def create_cost_visualizations(df):
     plt.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('plots/country_efficiency_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig(REPORT_PLOTS[1], dpi=300, bbox_inches='tight')
     print("   Country efficiency analysis saved to: plots/country_efficiency_analysis.png")
     
     plt.close('all')
 
+@instrumented('scenario_sweep')
+def run_scenario_sweep(df, grid, output_file='data/scenario_sweep.csv', cost_calculator=None, aggregator=None):
+    """
+    Price every combination in grid and save the long-format scenario table
+    
+    Pass the CostAggregator of create_cost_analysis_report as aggregator so
+    the sweep adds no pass over the data.
+    """
+    if cost_calculator is None:
+        cost_calculator = OceanCleanupCostCalculator()
+    
+    table = cost_calculator.sweep_scenarios(df, grid, aggregator=aggregator)
+    table.to_csv(output_file, index=False)
+    
+    num_scenarios = table['scenario'].nunique()
+    print(f"\n SCENARIO SWEEP: {num_scenarios} scenarios x {table['Country'].nunique()} countries")
+    print(f"   Scenario table saved to: {output_file}")
+    return table
+
+def create_scenario_visualizations(table, output_file=SCENARIO_PLOT):
+    """
+    Plot a long-format scenario table (from run_scenario_sweep or its CSV)
+    """
+    print("\n📊 Creating scenario sweep visualizations...")
+    
+    parameters = [col for col in SWEEP_PARAMETERS if col in table.columns]
+    scenarios = table.groupby('scenario').agg({
+        **{col: 'first' for col in parameters},
+        'total_cost': 'sum'
+    })
+    labels = [', '.join(f"{col}={row[col]:g}" for col in parameters) for _, row in scenarios.iterrows()]
+    
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, max(6, 0.3 * len(scenarios))))
+    
+    # Global total cost per scenario
+    ax1.barh(range(len(scenarios)), scenarios['total_cost'].values)
+    ax1.set_yticks(range(len(scenarios)))
+    ax1.set_yticklabels(labels, fontsize=7)
+    ax1.set_xlabel('Total Cost ($)')
+    ax1.set_title('Global Total Cost by Scenario')
+    
+    # Cost per pound of the 10 most expensive countries across scenarios
+    top_countries = table[table['scenario'] == scenarios.index[0]].nlargest(10, 'total_cost')['Country']
+    cost_per_pound = table[table['Country'].isin(top_countries)].pivot(index='scenario', columns='Country', values='cost_per_pound')
+    for country in top_countries:
+        ax2.plot(cost_per_pound.index, cost_per_pound[country], marker='o', markersize=3, label=country)
+    ax2.set_xlabel('Scenario')
+    ax2.set_ylabel('Cost per Pound ($)')
+    ax2.set_title('Cost per Pound Across Scenarios\n(Top 10 countries by total cost)')
+    ax2.legend(fontsize=7)
+    ax2.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    print(f"   Scenario sweep plots saved to: {output_file}")
+    
+    plt.close('all')
+
 def main():
     """
     Main function to run the cost analysis
     """
+    parser = argparse.ArgumentParser(description="Global ocean cleanup cost analysis report and plots")
+    parser.add_argument('--sweep', default=None,
+                        help="JSON config with a 'sweep' grid of calculator parameters to price as what-if scenarios")
+    parser.add_argument('--sweep-output', default='data/scenario_sweep.csv',
+                        help="Where to write the long-format scenario table")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always recompute instead of restoring an unchanged report from the artifact cache")
+    args = parser.parse_args()
+    
     print(" Global Ocean Cleanup Cost Analysis")
     print("=" * 50)
     
-    # Create the analysis report
-    df = create_cost_analysis_report()
-    
-    if df is not None:
+    def build():
+        # Create the analysis report
+        df, aggregator = create_cost_analysis_report()
+        if df is None:
+            return None
+        
         # Create visualizations
-        create_cost_visualizations(df)
+        create_cost_visualizations(df, aggregator)
         
+        if args.sweep:
+            table = run_scenario_sweep(df, load_sweep_grid(args.sweep), args.sweep_output, aggregator=aggregator)
+            create_scenario_visualizations(table)
+        return True
+    
+    outputs = [COUNTRY_ANALYSIS_FILE] + REPORT_PLOTS
+    inputs = [resolve_dataset_path(DEFAULT_COST_DATA)]
+    if args.sweep:
+        outputs += [args.sweep_output, SCENARIO_PLOT]
+        inputs.append(args.sweep)
+    
+    cache = ArtifactCache(enabled=False) if args.no_cache or inputs[0] is None else default_cache()
+    hit, completed = cache.run_stage(
+        'cost_report', build, outputs,
+        inputs=inputs,
+        code_version=source_fingerprint(sys.modules[__name__], cost_calculator, cost_aggregation,
+                                        cleanup_schema, data_storage),
+        capture_output=True
+    )
+    
+    if hit or completed:
         print("\n Cost analysis completed successfully!")
-        print(f"    Data file: data/global_ocean_cleanup_data_with_costs.csv")
+        print(f"    Data file: data/global_ocean_cleanup_data_with_costs (.parquet/.feather/.csv)")
         print(f"    Country analysis: data/country_cost_analysis.csv")
         print(f"    Plots: plots/global_cost_analysis.png, plots/country_efficiency_analysis.png")
     else:
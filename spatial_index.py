@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Spatial index over cleanup points for nearest-site, radius and bounding-box queries
+
+The index is built once over the numeric lat/lon columns:
+
+- a scikit-learn BallTree on haversine distance answers "k nearest sites"
+  and "all sites within R km" in logarithmic time
+- a grid of cell_degrees cells with 2D prefix sums of the cost columns
+  answers "cost totals within a bounding box" by adding whole interior
+  cells in O(1) and scanning only the points in the cells on the box edge
+
+load_spatial_index keeps the index next to the dataset, like
+lookup_index.py: <dataset>.spatial.pkl holds the tree, grid and prefix sums
+and <dataset>.spatial.parquet the indexed rows in grid cell order, in small
+row groups. A query then unpickles the index and reads only the row groups
+of the points it returns, instead of loading the dataset and rebuilding the
+tree. The index is rebuilt when the dataset's size or mtime changes.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+from data_storage import load_dataset, resolve_dataset_path, save_dataset
+from gps_codec import LAT_COLUMN, LON_COLUMN, valid_coordinates_mask
+from lookup_index import RowGroupReader, source_signature
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Columns summed by bbox_totals (plus an event count)
+BBOX_SUM_COLUMNS = ['total_cost', 'volunteer_cost', 'total_direct_costs', 'carbon_cost', 'People', 'Pounds']
+
+SPATIAL_ROW_GROUP_SIZE = 16384
+
+class SpatialIndex:
+    """
+    Nearest-neighbour, radius and bounding-box lookups over a dataframe's points
+    """
+
+    def __init__(self, df, cell_degrees=1.0, leaf_size=40):
+        self.df = df
+        self.rows_reader = None
+        self.cell_degrees = cell_degrees
+        self.num_rows = int(np.ceil(180 / self.cell_degrees))
+        self.num_cols = int(np.ceil(360 / self.cell_degrees))
+
+        # Only rows with usable coordinates are indexed; positions map back to
+        # df. Points are kept in grid cell order so a saved copy of their rows
+        # stores neighbouring points together.
+        positions = np.flatnonzero(valid_coordinates_mask(df))
+        lat = df[LAT_COLUMN].to_numpy(dtype=np.float64)[positions]
+        lon = df[LON_COLUMN].to_numpy(dtype=np.float64)[positions]
+        order = np.argsort(self._cell_rows(lat) * self.num_cols + self._cell_cols(lon), kind='stable')
+        self.positions, self.lat, self.lon = positions[order], lat[order], lon[order]
+        self.tree = BallTree(np.radians(np.column_stack([self.lat, self.lon])), leaf_size=leaf_size,
+                             metric='haversine')
+
+        self.sum_columns = [col for col in BBOX_SUM_COLUMNS if col in df.columns]
+        self._build_grid()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def save(self, index_file, meta):
+        """Pickle the index without its dataframe; meta identifies the data it was built from"""
+        state = {key: value for key, value in self.__dict__.items() if key not in ('df', 'rows_reader')}
+        with open(index_file, 'wb') as f:
+            pickle.dump({'meta': meta, 'state': state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, state, rows_file):
+        """Index from a saved state whose point rows are read from rows_file on demand"""
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        index.df = None
+        index.rows_reader = RowGroupReader(rows_file)
+        return index
+
+    def point_rows(self, point_indices):
+        """Rows of the indexed points, in the given order, labelled with their df positions"""
+        point_indices = np.asarray(point_indices, dtype=np.intp)
+        if self.df is not None:
+            return self.df.iloc[self.positions[point_indices]].copy()
+        # The rows file holds the points in index order
+        sorted_indices = np.sort(point_indices)
+        rows = self.rows_reader.read_rows(sorted_indices)
+        rows = rows.iloc[np.searchsorted(sorted_indices, point_indices)]
+        rows.index = self.positions[point_indices]
+        return rows
+
+    def _cell_rows(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_degrees).astype(np.intp), 0, self.num_rows - 1)
+
+    def _cell_cols(self, lon):
+        return np.clip(np.floor((np.asarray(lon) + 180) / self.cell_degrees).astype(np.intp), 0, self.num_cols - 1)
+
+    def _build_grid(self):
+        """Points sorted by grid cell (with per-cell offsets) and prefix sums of the cost columns"""
+        num_cells = self.num_rows * self.num_cols
+
+        cells = self._cell_rows(self.lat) * self.num_cols + self._cell_cols(self.lon)
+        self.cell_order = np.argsort(cells, kind='stable')
+        self.cell_offsets = np.searchsorted(cells[self.cell_order], np.arange(num_cells + 1))
+
+        # One value layer per summed column plus a layer of ones for the event count
+        values = np.ones((len(self.sum_columns) + 1, len(self.positions)))
+        for i, col in enumerate(self.sum_columns):
+            values[i] = np.nan_to_num(self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)[self.positions])
+        self.values = values
+
+        # prefix[c, i, j] = sum of layer c over cells with row < i and col < j
+        cell_sums = np.zeros((len(values), num_cells))
+        for i, layer in enumerate(values):
+            cell_sums[i] = np.bincount(cells, weights=layer, minlength=num_cells)
+        prefix = np.zeros((len(values), self.num_rows + 1, self.num_cols + 1))
+        prefix[:, 1:, 1:] = cell_sums.reshape(len(values), self.num_rows, self.num_cols).cumsum(axis=1).cumsum(axis=2)
+        self.prefix = prefix
+
+    def _result_frame(self, point_indices, distances_rad):
+        """Rows of df for indexed points, with their distance in km, nearest first"""
+        order = np.argsort(distances_rad, kind='stable')
+        rows = self.point_rows(point_indices[order])
+        rows['distance_km'] = distances_rad[order] * EARTH_RADIUS_KM
+        return rows
+
+    def nearest(self, lat, lon, k=5):
+        """The k cleanup sites closest to (lat, lon)"""
+        k = min(k, len(self))
+        if k == 0:
+            return self.point_rows([]).assign(distance_km=[])
+        distances, indices = self.tree.query(np.radians([[lat, lon]]), k=k)
+        return self._result_frame(indices[0], distances[0])
+
+    def within_radius(self, lat, lon, radius_km, limit=None):
+        """All cleanup sites within radius_km of (lat, lon), nearest first (at most limit)"""
+        indices, distances = self.tree.query_radius(np.radians([[lat, lon]]), r=radius_km / EARTH_RADIUS_KM,
+                                                    return_distance=True)
+        result = self._result_frame(indices[0], distances[0])
+        return result if limit is None else result.head(limit)
+
+    def _points_in_cells(self, row_start, row_end, col_start, col_end):
+        """Sorted-order slots of points in grid rows [row_start, row_end) and cols [col_start, col_end)"""
+        if row_start >= row_end or col_start >= col_end:
+            return np.empty(0, dtype=np.intp)
+        first = np.arange(row_start, row_end) * self.num_cols
+        starts = self.cell_offsets[first + col_start]
+        ends = self.cell_offsets[first + col_end]
+        lengths = ends - starts
+        if lengths.sum() == 0:
+            return np.empty(0, dtype=np.intp)
+        # Concatenated ranges [starts[i], ends[i]) without a Python loop
+        slots = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        return slots
+
+    def _box_sums(self, south, west, north, east):
+        """Layer sums over points with south <= lat <= north and west <= lon <= east"""
+        size = self.cell_degrees
+        row_start, row_end = self._cell_rows(south), self._cell_rows(north) + 1
+        col_start, col_end = self._cell_cols(west), self._cell_cols(east) + 1
+
+        # Cells wholly inside the box come from the prefix sums
+        inner_row_start = max(row_start, int(np.ceil((south + 90) / size)))
+        inner_row_end = min(row_end, int(np.floor((north + 90) / size)))
+        inner_col_start = max(col_start, int(np.ceil((west + 180) / size)))
+        inner_col_end = min(col_end, int(np.floor((east + 180) / size)))
+        if inner_row_start >= inner_row_end or inner_col_start >= inner_col_end:
+            inner_row_start = inner_row_end = row_start
+            inner_col_start = inner_col_end = col_start
+
+        p = self.prefix
+        totals = (p[:, inner_row_end, inner_col_end] - p[:, inner_row_start, inner_col_end]
+                  - p[:, inner_row_end, inner_col_start] + p[:, inner_row_start, inner_col_start])
+
+        # Points in the partially covered edge cells are checked one by one
+        edge_slots = np.concatenate([
+            self._points_in_cells(row_start, inner_row_start, col_start, col_end),
+            self._points_in_cells(inner_row_end, row_end, col_start, col_end),
+            self._points_in_cells(inner_row_start, inner_row_end, col_start, inner_col_start),
+            self._points_in_cells(inner_row_start, inner_row_end, inner_col_end, col_end)
+        ])
+        points = self.cell_order[edge_slots]
+        inside = ((self.lat[points] >= south) & (self.lat[points] <= north) &
+                  (self.lon[points] >= west) & (self.lon[points] <= east))
+        return totals + self.values[:, points[inside]].sum(axis=1)
+
+    def bbox_totals(self, south, west, north, east):
+        """
+        Cost totals and event count of the sites inside a bounding box
+
+        A box with west > east wraps across the antimeridian.
+        """
+        if west > east:
+            sums = self._box_sums(south, west, north, 180) + self._box_sums(south, -180, north, east)
+        else:
+            sums = self._box_sums(south, west, north, east)
+        return pd.Series(sums, index=self.sum_columns + ['events'])
+
+def spatial_index_paths(source_file):
+    """(indexed rows file, pickled index file) of the spatial index for a resolved dataset path"""
+    stem = os.path.splitext(source_file)[0]
+    return f"{stem}.spatial.parquet", f"{stem}.spatial.pkl"
+
+def build_spatial_index(source_file, cell_degrees=1.0):
+    """Build the spatial index of a dataset and save it (rows file first, index file last)"""
+    resolved = resolve_dataset_path(source_file)
+    if resolved is None:
+        raise FileNotFoundError(source_file)
+    rows_file, index_file = spatial_index_paths(resolved)
+
+    index = SpatialIndex(load_dataset(resolved), cell_degrees)
+    save_dataset(index.df.iloc[index.positions], rows_file, 'parquet', row_group_size=SPATIAL_ROW_GROUP_SIZE)
+    rows_stat = os.stat(rows_file)
+    meta = {**source_signature(resolved), 'rows_size': rows_stat.st_size, 'rows_mtime_ns': rows_stat.st_mtime_ns}
+    index.save(index_file, meta)
+    return index
+
+def load_spatial_index(source_file, rebuild=True):
+    """
+    Open the saved spatial index of source_file, (re)building it if it is missing or stale
+
+    With rebuild=False a missing or stale index returns None.
+    """
+    resolved = resolve_dataset_path(source_file)
+    if resolved is None:
+        raise FileNotFoundError(source_file)
+    rows_file, index_file = spatial_index_paths(resolved)
+
+    try:
+        with open(index_file, 'rb') as f:
+            saved = pickle.load(f)
+        rows_stat = os.stat(rows_file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        saved = None
+
+    if saved is not None:
+        meta = saved['meta']
+        signature = {**source_signature(resolved), 'rows_size': rows_stat.st_size,
+                     'rows_mtime_ns': rows_stat.st_mtime_ns}
+        if all(meta.get(key) == value for key, value in signature.items()):
+            return SpatialIndex.load(saved['state'], rows_file)
+    return build_spatial_index(resolved) if rebuild else None
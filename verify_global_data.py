@@ -1,96 +1,162 @@
 import pandas as pd
 import numpy as np
 
-def verify_global_data():
-    """Verify the global dataset and show distribution"""
-    
+from data_storage import load_dataset
+from gps_codec import parse_gps_column
+from cleanup_schema import TRASH_ITEM_COLUMNS
+from instrumentation import instrumented
+
+REGION_COUNTRIES = {
+    'North America': ['United States', 'Canada', 'Mexico'],
+    'South America': ['Brazil', 'Argentina', 'Chile', 'Colombia', 'Peru', 'Ecuador', 'Venezuela', 'Uruguay'],
+    'Europe': ['United Kingdom', 'France', 'Spain', 'Italy', 'Germany', 'Netherlands', 'Norway', 'Sweden', 'Denmark', 'Portugal', 'Greece', 'Turkey', 'Russia'],
+    'Asia': ['China', 'Japan', 'South Korea', 'India', 'Indonesia', 'Philippines', 'Thailand', 'Vietnam', 'Malaysia', 'Singapore', 'Bangladesh', 'Sri Lanka', 'Myanmar'],
+    'Africa': ['South Africa', 'Egypt', 'Morocco', 'Algeria', 'Tunisia', 'Libya', 'Nigeria', 'Ghana', 'Senegal', 'Kenya', 'Tanzania', 'Mozambique', 'Madagascar'],
+    'Oceania': ['Australia', 'New Zealand', 'Papua New Guinea', 'Fiji', 'Solomon Islands', 'Vanuatu', 'Samoa', 'Tonga', 'Kiribati', 'Marshall Islands', 'Micronesia', 'Palau', 'Tuvalu', 'Nauru']
+}
+
+# Country -> region lookup built once from the table above
+COUNTRY_REGIONS = {country: region for region, countries in REGION_COUNTRIES.items() for country in countries}
+REGIONS = list(REGION_COUNTRIES) + ['Other']
+
+# Expected (min, max) of every numeric column; None means unbounded
+NUMERIC_COLUMN_RANGES = {
+    'Adults': (0, None),
+    'Children': (0, None),
+    'People': (0, None),
+    'Pounds': (0, None),
+    'Miles': (0, None),
+    '# of bags': (0, None),
+    **{item: (0, None) for item in TRASH_ITEM_COLUMNS},
+    'Total Items Collected': (0, None),
+    'lat': (-90, 90),
+    'lon': (-180, 180)
+}
+
+def get_regions(countries):
+    """Map a Series of countries to a categorical Series of regions"""
+    regions = countries.astype(object).map(COUNTRY_REGIONS).fillna('Other')
+    return pd.Categorical(regions, categories=REGIONS)
+
+def build_data_quality_report(df, gps=None):
+    """
+    Per-column null, type and range violations for the cleanup dataset
+
+    Numeric columns are coerced with to_numeric once; values that fail to
+    parse count as type violations and parsed values outside
+    NUMERIC_COLUMN_RANGES count as range violations. Non-null GPS strings
+    that are not a valid pair count as GPS type violations (gps may be a
+    parse_gps_column result to reuse).
+    """
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'nulls': df.isna().sum(),
+        'type_violations': 0,
+        'range_violations': 0
+    })
+
+    numeric_columns = [col for col in NUMERIC_COLUMN_RANGES if col in df.columns]
+    if numeric_columns:
+        raw = df[numeric_columns]
+        coerced = raw.apply(pd.to_numeric, errors='coerce')
+        report.loc[numeric_columns, 'type_violations'] = (coerced.isna() & raw.notna()).sum()
+
+        lower = pd.Series({col: NUMERIC_COLUMN_RANGES[col][0] for col in numeric_columns}, dtype=float).fillna(-np.inf)
+        upper = pd.Series({col: NUMERIC_COLUMN_RANGES[col][1] for col in numeric_columns}, dtype=float).fillna(np.inf)
+        out_of_range = coerced.lt(lower, axis=1) | coerced.gt(upper, axis=1)
+        report.loc[numeric_columns, 'range_violations'] = out_of_range.sum()
+
+    if 'GPS' in df.columns:
+        if gps is None:
+            gps = parse_gps_column(df['GPS'])
+        report.loc['GPS', 'type_violations'] = int((~gps['valid'] & df['GPS'].notna()).sum())
+
+    report['total_violations'] = report['nulls'] + report['type_violations'] + report['range_violations']
+    return report
+
+@instrumented('verify')
+def verify_global_data(csv_file='data/global_ocean_cleanup_data'):
+    """
+    Verify the global dataset and show distribution
+
+    Returns (the dataset with a Region column, its build_data_quality_report).
+    """
+
     print("Loading and verifying global ocean cleanup data...")
-    
+
     # Load the global dataset
-    global_data = pd.read_csv('data/global_ocean_cleanup_data.csv', low_memory=False)
-    
+    global_data = load_dataset(csv_file)
+
     print(f"\n=== GLOBAL DATASET VERIFICATION ===")
     print(f"Total records: {len(global_data):,}")
     print(f"Countries: {global_data['Country'].nunique()}")
-    
+
     # Check GPS coordinates
-    valid_gps = 0
-    invalid_gps = 0
-    
-    for i, row in global_data.iterrows():
-        try:
-            gps_str = str(row['GPS']).strip()
-            if gps_str and gps_str != 'nan':
-                gps = gps_str.split(',')
-                if len(gps) == 2:
-                    lat = float(gps[0].strip())
-                    lon = float(gps[1].strip())
-                    if -90 <= lat <= 90 and -180 <= lon <= 180:
-                        valid_gps += 1
-                    else:
-                        invalid_gps += 1
-                else:
-                    invalid_gps += 1
-            else:
-                invalid_gps += 1
-        except:
-            invalid_gps += 1
-    
+    gps = parse_gps_column(global_data['GPS'])
+    valid_gps = int(gps['valid'].sum())
+    invalid_gps = len(gps) - valid_gps
+
     print(f"Valid GPS coordinates: {valid_gps:,}")
     print(f"Invalid GPS coordinates: {invalid_gps:,}")
-    
+
     # Show country distribution
     print(f"\n=== COUNTRY DISTRIBUTION ===")
     country_counts = global_data['Country'].value_counts()
     print(f"Top 20 countries by cleanup events:")
     print(country_counts.head(20))
-    
+
     # Show regional distribution
-    def get_region(country):
-        if country in ['United States', 'Canada', 'Mexico']:
-            return 'North America'
-        elif country in ['Brazil', 'Argentina', 'Chile', 'Colombia', 'Peru', 'Ecuador', 'Venezuela', 'Uruguay']:
-            return 'South America'
-        elif country in ['United Kingdom', 'France', 'Spain', 'Italy', 'Germany', 'Netherlands', 'Norway', 'Sweden', 'Denmark', 'Portugal', 'Greece', 'Turkey', 'Russia']:
-            return 'Europe'
-        elif country in ['China', 'Japan', 'South Korea', 'India', 'Indonesia', 'Philippines', 'Thailand', 'Vietnam', 'Malaysia', 'Singapore', 'Bangladesh', 'Sri Lanka', 'Myanmar']:
-            return 'Asia'
-        elif country in ['South Africa', 'Egypt', 'Morocco', 'Algeria', 'Tunisia', 'Libya', 'Nigeria', 'Ghana', 'Senegal', 'Kenya', 'Tanzania', 'Mozambique', 'Madagascar']:
-            return 'Africa'
-        elif country in ['Australia', 'New Zealand', 'Papua New Guinea', 'Fiji', 'Solomon Islands', 'Vanuatu', 'Samoa', 'Tonga', 'Kiribati', 'Marshall Islands', 'Micronesia', 'Palau', 'Tuvalu', 'Nauru']:
-            return 'Oceania'
-        else:
-            return 'Other'
-    
-    global_data['Region'] = global_data['Country'].apply(get_region)
-    
+    global_data['Region'] = get_regions(global_data['Country'])
+
     print(f"\n=== REGIONAL DISTRIBUTION ===")
     region_counts = global_data['Region'].value_counts()
+    region_counts = region_counts[region_counts > 0]
     print(region_counts)
-    
+
     # Show some sample coordinates by region
     print(f"\n=== SAMPLE COORDINATES BY REGION ===")
+    region_groups = global_data.groupby('Region', observed=True)
     for region in region_counts.index:
-        region_data = global_data[global_data['Region'] == region]
+        region_data = region_groups.get_group(region)
         print(f"\n{region} ({len(region_data)} records):")
         sample_coords = region_data[['Country', 'GPS']].head(3)
         for _, row in sample_coords.iterrows():
             print(f"  {row['Country']}: {row['GPS']}")
-    
+
     # Check data quality
     print(f"\n=== DATA QUALITY CHECK ===")
     print(f"Records with valid people count: {global_data['People'].notna().sum():,}")
     print(f"Records with valid pounds: {global_data['Pounds'].notna().sum():,}")
     print(f"Records with valid total items: {global_data['Total Items Collected'].notna().sum():,}")
-    
+
     print(f"\nTotal people involved: {global_data['People'].sum():,}")
     print(f"Total pounds collected: {global_data['Pounds'].sum():,.2f}")
     print(f"Total items collected: {global_data['Total Items Collected'].sum():,}")
-    
-    return global_data
+
+    quality_report = build_data_quality_report(global_data, gps)
+    problem_columns = quality_report[quality_report['total_violations'] > 0]
+
+    print(f"\n=== COLUMN QUALITY REPORT ===")
+    print(f"Columns checked: {len(quality_report)}")
+    print(f"Null values: {quality_report['nulls'].sum():,}")
+    print(f"Type violations: {quality_report['type_violations'].sum():,}")
+    print(f"Range violations: {quality_report['range_violations'].sum():,}")
+    if len(problem_columns) > 0:
+        print(f"\nColumns with violations:")
+        print(problem_columns.to_string())
+
+    return global_data, quality_report
+
+def count_valid_gps(data, quality_report):
+    """Rows whose GPS parsed to a valid pair, from the quality report's GPS nulls and type violations"""
+    return len(data) - int(quality_report.loc['GPS', 'nulls'] + quality_report.loc['GPS', 'type_violations'])
 
 if __name__ == "__main__":
-    data = verify_global_data()
+    data, quality_report = verify_global_data()
     print(f"\n✅ Global dataset verification complete!")
-    print(f"✅ All {len(data)} records have valid GPS coordinates!")
-    print(f"✅ Data spans {data['Country'].nunique()} countries across 6 regions!")
+    valid_gps = count_valid_gps(data, quality_report)
+    if valid_gps == len(data):
+        print(f"✅ All {len(data)} records have valid GPS coordinates!")
+    else:
+        print(f"⚠️  {valid_gps} of {len(data)} records have valid GPS coordinates")
+    print(f"✅ Data spans {data['Country'].nunique()} countries across {data['Region'].nunique()} regions!")